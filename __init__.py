@@ -2,26 +2,92 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timedelta
 import logging
+import time
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
+from .anomaly import AnomalyDetector
 from .api import JullixApiClient, JullixApiError, JullixConnectionError
-from .const import CONF_HOST, DEFAULT_SCAN_INTERVAL, DOMAIN
+from .batch import EntityBatch
+from .battery_forecast import BatteryForecast
+from .const import (
+    API_DSMR_STATUS,
+    API_INVERTER_STATUS,
+    CONF_BATTERY_RESERVE,
+    CONF_CONNECT_TIMEOUT,
+    CONF_DSMR_SCAN_INTERVAL,
+    CONF_HOST,
+    CONF_INVERTER_SCAN_INTERVAL,
+    CONF_LONG_TERM_STATISTICS,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_P1_HOST,
+    CONF_P1_PORT,
+    CONF_PUSH,
+    CONF_READ_TIMEOUT,
+    CONF_SLO_LATENCY,
+    CONF_SLO_TIMEOUT_RATIO,
+    CONF_THRESHOLDS,
+    DEFAULT_BATTERY_RESERVE,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_P1_PORT,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SLO_LATENCY,
+    DEFAULT_SLO_TIMEOUT_RATIO,
+    DEVICE_INVERTER,
+    DEVICE_METER,
+    DOMAIN,
+    LIVE_OPTIONS,
+    P1_MAX_AGE,
+    PUSH_WATCHDOG_INTERVAL,
+    SIGNAL_NEW_FIELDS,
+    SIGNAL_NEW_OPTIONAL_KEYS,
+)
+from .devices import JullixDevices
+from .energy_balance import EnergyBalance
+from .external_statistics import HourlyStatisticsAggregator
+from .openmetrics import JullixOpenMetricsView, OpenMetricsBuffer
+from .fields import SENSOR_FIELDS, compact_payload
+from .p1 import P1StreamReader
+from .power_flow import PowerFlows, compute_power_flows
+from .profiler import CycleProfiler, listener_name
+from .push import async_setup_push
+from .schema import InferredField, PayloadSchema
+from .services import async_setup_services
+from .slo import SloMonitor
+from .thresholds import ThresholdEngine
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.BINARY_SENSOR]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
 type JullixConfigEntry = ConfigEntry[JullixCoordinator]
 
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Jullix integration."""
+    async_setup_services(hass)
+    hass.http.register_view(JullixOpenMetricsView())
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: JullixConfigEntry) -> bool:
     """Set up Jullix from a config entry."""
     host = entry.data[CONF_HOST]
@@ -38,22 +104,59 @@ async def async_setup_entry(hass: HomeAssistant, entry: JullixConfigEntry) -> bo
         raise ConfigEntryNotReady(f"Error communicating with Jullix device: {err}") from err
 
     coordinator = JullixCoordinator(hass, client, entry)
+    await coordinator.energy_balance.async_load()
+    if coordinator.statistics is not None:
+        await coordinator.statistics.async_load()
 
     # Fetch initial data
     await coordinator.async_config_entry_first_refresh()
 
     entry.runtime_data = coordinator
+    entry.async_on_unload(coordinator.slo.async_clear)
+    if coordinator.statistics is not None:
+        entry.async_on_unload(coordinator.statistics.async_save)
+
+    if entry.options.get(CONF_PUSH, False):
+        async_setup_push(hass, entry, coordinator)
+
+    if p1_host := entry.options.get(CONF_P1_HOST):
+        reader = P1StreamReader(
+            p1_host,
+            entry.options.get(CONF_P1_PORT, DEFAULT_P1_PORT),
+            coordinator.async_set_p1_data,
+        )
+        entry.async_create_background_task(
+            hass, reader.run(), f"{DOMAIN}_p1_stream_{entry.entry_id}"
+        )
+
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     return True
 
 
+async def async_update_options(hass: HomeAssistant, entry: JullixConfigEntry) -> None:
+    """Apply changed options, reloading the entry only when needed.
+
+    Polling and request options are applied to the running coordinator,
+    other options set up the entry differently and reload it.
+    """
+    if entry.runtime_data.async_apply_options(entry.options):
+        await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: JullixConfigEntry) -> bool:
     """Unload a config entry."""
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: JullixConfigEntry) -> None:
+    """Remove the stored energy balance and statistics of a removed config entry."""
+    await EnergyBalance(hass, entry.entry_id).async_remove()
+    await HourlyStatisticsAggregator(hass, entry.entry_id, entry.title).async_remove()
+
+
 class JullixCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     """Class to manage fetching Jullix data from the device."""
 
@@ -72,10 +175,271 @@ class JullixCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             config_entry=config_entry,
         )
         self.client = client
+        self._scan_interval = DEFAULT_SCAN_INTERVAL
+        self._options: dict[str, Any] = {}
+        self.replaying = False
+        # Time the replayed sample was recorded
+        self.replay_time: datetime | None = None
+        self.slo = SloMonitor(hass, config_entry.entry_id, config_entry.title)
+        self._configure(config_entry.options)
+        self._p1_data: dict[str, Any] = {}
+        self._p1_time = 0.0
+        self.profiler: CycleProfiler | None = None
+        self._cycle_complete = False
+        self.openmetrics = OpenMetricsBuffer(
+            config_entry.entry_id, config_entry.data[CONF_HOST]
+        )
+        self._processed_data: dict[str, Any] | None = None
+        # Devices that delivered a new sample, by the last raw response of each
+        self._responses: dict[str, Any] = {}
+        self._updated: set[str] = set()
+        self.updated_devices: frozenset[str] = frozenset()
+        self.values: list[Any] = SENSOR_FIELDS.extract({})
+        self.devices = JullixDevices(config_entry.entry_id)
+        self.entity_batch = EntityBatch(self)
+        self.statistics: HourlyStatisticsAggregator | None = None
+        if config_entry.options.get(CONF_LONG_TERM_STATISTICS, False):
+            self.statistics = HourlyStatisticsAggregator(
+                hass, config_entry.entry_id, config_entry.title
+            )
+        self.anomalies = AnomalyDetector()
+        self.energy_balance = EnergyBalance(hass, config_entry.entry_id)
+        self.power_flows: PowerFlows | None = None
+        self.schema = PayloadSchema()
+        self._new_fields: list[InferredField] = []
+        self._new_optional_keys = False
+        self.battery_forecast = BatteryForecast(
+            config_entry.options.get(CONF_BATTERY_RESERVE, DEFAULT_BATTERY_RESERVE)
+        )
+        self.thresholds = ThresholdEngine(
+            hass, config_entry.entry_id, config_entry.options.get(CONF_THRESHOLDS, [])
+        )
+
+    def _configure(self, options: Mapping[str, Any]) -> None:
+        """Apply the polling, request and latency objective options."""
+        self._options = dict(options)
+        default_interval = DEFAULT_SCAN_INTERVAL.total_seconds()
+        intervals = {
+            API_DSMR_STATUS: options.get(CONF_DSMR_SCAN_INTERVAL, default_interval),
+            API_INVERTER_STATUS: options.get(CONF_INVERTER_SCAN_INTERVAL, default_interval),
+        }
+        # Poll at the fastest cadence, the client reuses responses that are not due
+        self._scan_interval = timedelta(seconds=min(intervals.values()))
+        if not self.replaying and self.update_interval != PUSH_WATCHDOG_INTERVAL:
+            self.update_interval = self._scan_interval
+        self.client.configure(
+            intervals,
+            connect_timeout=options.get(CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT),
+            read_timeout=options.get(CONF_READ_TIMEOUT, DEFAULT_READ_TIMEOUT),
+            max_concurrent=options.get(
+                CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+            ),
+        )
+        self.slo.latency = options.get(CONF_SLO_LATENCY, DEFAULT_SLO_LATENCY)
+        self.slo.timeout_ratio = (
+            options.get(CONF_SLO_TIMEOUT_RATIO, DEFAULT_SLO_TIMEOUT_RATIO) / 100
+        )
+
+    @callback
+    def async_apply_options(self, options: Mapping[str, Any]) -> bool:
+        """Apply changed options without reloading when possible.
+
+        A new scan interval is used from the next scheduled poll on.
+
+        Returns:
+            True if options changed that need the entry to be reloaded
+
+        """
+        changed = {
+            key
+            for key in options.keys() | self._options.keys()
+            if options.get(key) != self._options.get(key)
+        }
+        if not changed <= LIVE_OPTIONS:
+            return True
+        if changed:
+            _LOGGER.debug("Applying options %s", ", ".join(sorted(changed)))
+            self._configure(options)
+        return False
+
+    @callback
+    def _async_process_data(self, data: dict[str, Any]) -> None:
+        """Update derived state once per new data, before entities are notified."""
+        self.values = SENSOR_FIELDS.extract(data)
+        self.updated_devices = frozenset(self._updated)
+        self._updated.clear()
+        self.power_flows = compute_power_flows(data)
+        if self.replaying:
+            # Replayed data, possibly recorded at another site, must not
+            # change the registries, discovered fields, stored totals,
+            # statistics or values seen outside Home Assistant
+            return
+        if self.devices.update(data) and self.devices.async_update_registries(self.hass):
+            # Recreate the meter entities with the unique IDs of the new meter
+            self.hass.config_entries.async_schedule_reload(self.config_entry.entry_id)
+        if new_fields := self._new_fields:
+            self._new_fields = []
+            _LOGGER.debug(
+                "Discovered fields without a sensor description: %s",
+                ", ".join(f"{field.device}.{field.key}" for field in new_fields),
+            )
+            async_dispatcher_send(
+                self.hass, SIGNAL_NEW_FIELDS.format(self.config_entry.entry_id), new_fields
+            )
+        if self._new_optional_keys:
+            self._new_optional_keys = False
+            async_dispatcher_send(
+                self.hass, SIGNAL_NEW_OPTIONAL_KEYS.format(self.config_entry.entry_id)
+            )
+        timestamp = dt_util.utcnow()
+        now = timestamp.timestamp()
+        self.anomalies.process(now, data, self.updated_devices)
+        self.battery_forecast.update(now, data)
+        self.energy_balance.async_process(dt_util.as_local(timestamp), data)
+        self.openmetrics.update(data)
+        if self.statistics is not None:
+            self.statistics.async_add(timestamp, data)
+        self.thresholds.async_process(data)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners, timing each one while profiling."""
+        profiler = self.profiler
+        # P1 ticks and failed refreshes are profiled without completing a cycle
+        cycle_complete, self._cycle_complete = self._cycle_complete, False
+
+        # Listeners are also notified of failed refreshes, only process new data
+        if self.data is not None and self.data is not self._processed_data:
+            self._processed_data = self.data
+            with profiler.phase("process_data") if profiler else nullcontext():
+                self._async_process_data(self.data)
+
+        if profiler is None:
+            super().async_update_listeners()
+            return
+
+        with profiler.phase("listeners"):
+            for update_callback, _ in list(self._listeners.values()):
+                start = time.perf_counter()
+                update_callback()
+                profiler.record_listener(
+                    listener_name(update_callback), time.perf_counter() - start
+                )
+
+        if cycle_complete and profiler.finish_cycle():
+            self.profiler = None
+            self.config_entry.async_create_task(
+                self.hass, self._async_write_profile(profiler)
+            )
+
+    @contextmanager
+    def replay(self, client: JullixApiClient) -> Iterator[None]:
+        """Read from a replay client instead of the device.
+
+        Polling is paused and pushed payloads and P1 telegrams are ignored,
+        so live data is not mixed with the replay. Polling resumes with the
+        next refresh afterwards.
+        """
+        live_client, self.client = self.client, client
+        self.replaying = True
+        self.update_interval = None
+        self._async_unsub_refresh()
+        try:
+            yield
+        finally:
+            self.client = live_client
+            self.replaying = False
+            self.replay_time = None
+            self.update_interval = self._scan_interval
+
+    async def _async_write_profile(self, profiler: CycleProfiler) -> None:
+        """Write a finished profiling report to disk."""
+        await self.hass.async_add_executor_job(profiler.write_report)
+        _LOGGER.info("Jullix profile report written to %s", profiler.path)
+
+    @callback
+    def async_set_p1_data(self, values: dict[str, Any]) -> None:
+        """Handle meter values from the raw P1 telegram stream.
+
+        Listeners are notified directly so the polling schedule for the
+        inverter keeps running at its own interval.
+        """
+        if self.replaying:
+            return
+        self._p1_data = values
+        self._p1_time = time.monotonic()
+        if self.data is None:
+            return
+        self._updated.add(DEVICE_METER)
+        # The data is compact already and was checked against the schema
+        self.data = compact_payload(self._merge_p1_data(self.data))
+        self.async_update_listeners()
+
+    def _track_responses(self, data: dict[str, Any]) -> None:
+        """Note the devices whose response is new, not one reused by the client."""
+        for device, key in ((DEVICE_METER, "dsmr"), (DEVICE_INVERTER, "inverter")):
+            response = data.get(key)
+            if response is not None and response is not self._responses.get(key):
+                self._responses[key] = response
+                self._updated.add(device)
+
+    def _merge_p1_data(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Overlay recent P1 meter values on polled or pushed data."""
+        if (
+            not self._p1_data
+            or time.monotonic() - self._p1_time > P1_MAX_AGE.total_seconds()
+        ):
+            return data
+        return {**data, "dsmr": {**data.get("dsmr", {}), **self._p1_data}}
+
+    def _compact_data(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Overlay P1 values and reduce a payload to the fields that are read.
+
+        The schema is checked against the full polled or pushed payload
+        first, as inferring discovered fields needs the titles and units that
+        are dropped, and P1 values must not change the key set it compares.
+        """
+        if not self.replaying:
+            optional_keys = len(self.schema.optional_keys)
+            self._new_fields.extend(self.schema.update(data))
+            if len(self.schema.optional_keys) != optional_keys:
+                self._new_optional_keys = True
+        return compact_payload(self._merge_p1_data(data))
+
+    @callback
+    def async_push_data(self, data: dict[str, Any]) -> None:
+        """Handle a payload pushed to the webhook.
+
+        While pushes keep arriving, polling only runs as a slow watchdog.
+        """
+        if self.replaying:
+            return
+        if self.update_interval != PUSH_WATCHDOG_INTERVAL:
+            _LOGGER.debug("Receiving pushed data, slowing polling to watchdog interval")
+            self.update_interval = PUSH_WATCHDOG_INTERVAL
+        self._cycle_complete = True
+        self._track_responses(data)
+        self.async_set_updated_data(self._compact_data(data))
 
     async def _async_update_data(self) -> dict[str, Any]:
         """Fetch data from Jullix device."""
+        if not self.replaying and self.update_interval != self._scan_interval:
+            # Pushes stopped for a full watchdog interval, resume normal polling
+            _LOGGER.debug("No pushed data received, resuming normal polling")
+            self.update_interval = self._scan_interval
+
+        start = time.perf_counter()
+        profiler = self.profiler
         try:
-            return await self.client.get_all_data()
+            with profiler.phase("fetch_data", profile=False) if profiler else nullcontext():
+                data = await self.client.get_all_data()
+            self._track_responses(data)
+            with profiler.phase("compact_data") if profiler else nullcontext():
+                data = self._compact_data(data)
         except JullixApiError as err:
             raise UpdateFailed(f"Error communicating with Jullix device: {err}") from err
+        finally:
+            self.client.metrics.update_duration.observe(time.perf_counter() - start)
+            self.slo.async_check(self.client.metrics.window)
+        self._cycle_complete = True
+        return data
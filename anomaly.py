@@ -0,0 +1,165 @@
+"""Streaming anomaly detection for Jullix readings."""
+
+from __future__ import annotations
+
+from collections.abc import Collection
+from dataclasses import dataclass
+import math
+from typing import Any
+
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+
+from .const import (
+    ANOMALY_EWMA_ALPHA,
+    ANOMALY_MIN_SAMPLES,
+    ANOMALY_SPIKE_Z,
+    ANOMALY_STUCK_DURATION,
+    DEVICE_INVERTER,
+    DEVICE_METER,
+    DSMR_SENSORS,
+    INVERTER_SENSORS,
+)
+from .fields import iter_numeric_values
+
+# Measurement keys checked for spikes, power keys are also checked for stuck values
+MONITORED_KEYS: dict[tuple[str, str], bool] = {
+    **{
+        (DEVICE_METER, desc.key): desc.device_class == SensorDeviceClass.POWER
+        for desc in DSMR_SENSORS
+        if desc.state_class == SensorStateClass.MEASUREMENT
+    },
+    **{
+        (DEVICE_INVERTER, desc.key): desc.device_class == SensorDeviceClass.POWER
+        for desc in INVERTER_SENSORS
+        if desc.state_class == SensorStateClass.MEASUREMENT
+    },
+}
+
+
+@dataclass(slots=True)
+class _KeyState:
+    """Running statistics of a single key."""
+
+    count: int = 0
+    mean: float = 0.0
+    variance: float = 0.0
+    last: float | None = None
+    last_change: float = 0.0
+    stuck: bool = False
+    spike: bool = False
+    pending: float | None = None
+
+
+class AnomalyDetector:
+    """Detect stuck values and single-sample spikes with O(1) work per sample.
+
+    Each key keeps an exponentially weighted Welford mean and variance. A
+    sample whose z-score exceeds ANOMALY_SPIKE_Z against both the running
+    mean and the previous sample is held back, and only confirmed as a spike
+    when the next sample returns to the running mean. Otherwise it was a step
+    change and both samples are added to the statistics, so normal load
+    changes are never flagged. Spikes are reported one sample late and kept
+    out of the running statistics. Non-zero power readings that do not change
+    for ANOMALY_STUCK_DURATION are stuck.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the detector."""
+        self._states: dict[tuple[str, str], _KeyState] = {}
+
+    def process(self, now: float, data: dict[str, Any], devices: Collection[str]) -> None:
+        """Process the samples of one update.
+
+        Args:
+            now: Timestamp of the update in seconds
+            data: Coordinator data
+            devices: Devices that delivered a new sample in this update, the
+                values of other devices repeat samples already processed
+
+        """
+        states = self._states
+        for device, key, value in iter_numeric_values(data):
+            if device not in devices:
+                continue
+            if (check_stuck := MONITORED_KEYS.get((device, key))) is None:
+                continue
+            if (state := states.get((device, key))) is None:
+                state = states[(device, key)] = _KeyState(last_change=now)
+            self._update(state, now, value, check_stuck)
+
+    @classmethod
+    def _update(
+        cls, state: _KeyState, now: float, value: float, check_stuck: bool
+    ) -> None:
+        """Update the statistics of a key with a new sample."""
+        if value != state.last:
+            state.last_change = now
+        state.stuck = (
+            check_stuck
+            and value != 0
+            and now - state.last_change >= ANOMALY_STUCK_DURATION.total_seconds()
+        )
+
+        limit = ANOMALY_SPIKE_Z * math.sqrt(state.variance)
+        state.spike = False
+        if (pending := state.pending) is not None:
+            state.pending = None
+            if abs(value - state.mean) <= limit:
+                # Back at the earlier level, the held sample was a spike
+                state.spike = True
+            else:
+                cls._add(state, pending)
+                limit = ANOMALY_SPIKE_Z * math.sqrt(state.variance)
+
+        deviates = (
+            state.count >= ANOMALY_MIN_SAMPLES
+            and limit > 0
+            and abs(value - state.mean) > limit
+            and state.last is not None
+            and abs(value - state.last) > limit
+        )
+        state.last = value
+        if deviates:
+            state.pending = value
+        else:
+            cls._add(state, value)
+
+    @staticmethod
+    def _add(state: _KeyState, value: float) -> None:
+        """Add a sample to the exponentially weighted Welford statistics."""
+        state.count += 1
+        if state.count == 1:
+            state.mean = value
+            return
+        diff = value - state.mean
+        increment = ANOMALY_EWMA_ALPHA * diff
+        state.mean += increment
+        state.variance = (1 - ANOMALY_EWMA_ALPHA) * (state.variance + diff * increment)
+
+    def is_flagged(self, device: str, key: str) -> bool:
+        """Return True if a key is stuck or its previous sample was a spike."""
+        if (state := self._states.get((device, key))) is None:
+            return False
+        return state.stuck or state.spike
+
+    def is_stuck(self, device: str, key: str) -> bool:
+        """Return True if the value of a key is stuck."""
+        if (state := self._states.get((device, key))) is None:
+            return False
+        return state.stuck
+
+    def stuck_keys(self, device: str) -> list[str]:
+        """Return the keys of a device whose value is stuck."""
+        return [
+            key
+            for (state_device, key), state in self._states.items()
+            if state_device == device and state.stuck
+        ]
+
+    def spike_keys(self, device: str) -> list[str]:
+        """Return the keys of a device whose previous sample was a spike."""
+        return [
+            key
+            for (state_device, key), state in self._states.items()
+            if state_device == device and state.spike
+        ]
@@ -3,15 +3,37 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Mapping
+import json
 import logging
-from typing import Any
+import re
+import time
+from typing import TYPE_CHECKING, Any
 
 import aiohttp
 
-from .const import API_DSMR_STATUS, API_INVERTER_STATUS, API_TIMEOUT
+from .const import (
+    API_DSMR_STATUS,
+    API_INVERTER_STATUS,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_READ_TIMEOUT,
+    PROBE_MAX_BYTES,
+    PROBE_READ_SIZE,
+    PROBE_TIMEOUT,
+    REQUEST_MAX_AGE,
+)
+from .metrics import JullixMetrics
+
+if TYPE_CHECKING:
+    from .replay import ResponseRecorder
 
 _LOGGER = logging.getLogger(__name__)
 
+# Items of the meter status read by a probe, the meter ID is an item or a bare value
+_PROBE_ID = re.compile(rb'"id"\s*:\s*(\{[^{}]*\}|"[^"]*"|null)')
+_PROBE_CONNECTED = re.compile(rb'"connected"\s*:\s*(?:true|false)')
+
 
 class JullixApiError(Exception):
     """Base exception for Jullix API errors."""
@@ -39,10 +61,61 @@ class JullixApiClient:
         self.host = host
         self.session = session
         self._base_url = f"http://{host}"
+        self.metrics = JullixMetrics()
+        self.recorder: ResponseRecorder | None = None
+        self._inflight: dict[str, asyncio.Task[dict[str, Any]]] = {}
+        self._responses: dict[str, tuple[float, dict[str, Any]]] = {}
+        self._max_age: dict[str, float] = {}
+        self._timeout = aiohttp.ClientTimeout()
+        self._max_concurrent = 0
+        self._semaphore = asyncio.Semaphore()
+        self.configure()
+
+    def configure(
+        self,
+        intervals: Mapping[str, float] | None = None,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+    ) -> None:
+        """Apply request settings, used from the next request on.
+
+        Args:
+            intervals: Seconds between requests per endpoint. Responses are
+                reused until they are half the shortest interval short of the
+                interval of their endpoint, so a slightly early poll still
+                fetches new data. REQUEST_MAX_AGE only applies up to that
+                tolerance, so short intervals are never slowed down
+            connect_timeout: Seconds to wait for a connection to the device
+            read_timeout: Seconds to wait for each read from the device
+            max_concurrent: Requests to the device in flight at once
+
+        """
+        intervals = intervals or {}
+        tolerance = min(intervals.values(), default=0) / 2
+        min_age = min(REQUEST_MAX_AGE, tolerance)
+        self._max_age = {
+            endpoint: max(interval - tolerance, min_age)
+            for endpoint, interval in intervals.items()
+        }
+        self._timeout = aiohttp.ClientTimeout(
+            total=connect_timeout + read_timeout,
+            connect=connect_timeout,
+            sock_read=read_timeout,
+        )
+        if max_concurrent != self._max_concurrent:
+            # Requests already waiting finish under the previous limit
+            self._max_concurrent = max_concurrent
+            self._semaphore = asyncio.Semaphore(max_concurrent)
 
     async def _request(self, endpoint: str) -> dict[str, Any]:
         """Make an API request to the Jullix device.
 
+        Concurrent callers for the same URL share a single in-flight
+        request, and responses younger than the configured interval of the
+        endpoint, or REQUEST_MAX_AGE seconds, are returned to late callers
+        without contacting the device.
+
         Args:
             endpoint: API endpoint path
 
@@ -55,15 +128,61 @@ class JullixApiClient:
 
         """
         url = f"{self._base_url}{endpoint}"
-        try:
-            async with asyncio.timeout(API_TIMEOUT):
-                async with self.session.get(url) as response:
+
+        if (response := self._responses.get(url)) is not None:
+            received, data = response
+            if time.monotonic() - received <= self._max_age.get(endpoint, REQUEST_MAX_AGE):
+                return data
+
+        if (task := self._inflight.get(url)) is None:
+            task = asyncio.get_running_loop().create_task(self._fetch(endpoint, url))
+            self._inflight[url] = task
+            task.add_done_callback(lambda task: self._fetch_done(url, task))
+
+        # Shield so one cancelled caller does not cancel the shared request
+        return await asyncio.shield(task)
+
+    def _fetch_done(self, url: str, task: asyncio.Task[dict[str, Any]]) -> None:
+        """Clean up a finished shared request."""
+        self._inflight.pop(url, None)
+        if task.cancelled():
+            return
+        # Retrieve the exception so it is not logged if every caller went away
+        if task.exception() is None:
+            self._responses[url] = (time.monotonic(), task.result())
+
+    async def _fetch(self, endpoint: str, url: str) -> dict[str, Any]:
+        """Fetch and decode a single URL from the Jullix device."""
+        metrics = self.metrics.endpoint(endpoint)
+        async with self._semaphore:
+            metrics.requests += 1
+            start = time.perf_counter()
+            try:
+                async with self.session.get(url, timeout=self._timeout) as response:
                     response.raise_for_status()
-                    return await response.json()
-        except TimeoutError as err:
-            raise JullixTimeoutError(f"Timeout connecting to {url}") from err
-        except aiohttp.ClientError as err:
-            raise JullixConnectionError(f"Failed to connect to {url}: {err}") from err
+                    body = await response.read()
+            except TimeoutError as err:
+                metrics.timeouts += 1
+                self.metrics.window.observe_timeout()
+                raise JullixTimeoutError(f"Timeout connecting to {url}") from err
+            except aiohttp.ClientResponseError as err:
+                metrics.http_errors += 1
+                raise JullixConnectionError(f"Failed to connect to {url}: {err}") from err
+            except aiohttp.ClientError as err:
+                metrics.connection_errors += 1
+                raise JullixConnectionError(f"Failed to connect to {url}: {err}") from err
+
+        latency = time.perf_counter() - start
+        metrics.latency.observe(latency)
+        self.metrics.window.observe(latency)
+        metrics.response_bytes += len(body)
+        metrics.last_response_bytes = len(body)
+        if self.recorder is not None:
+            self.recorder.record(endpoint, body)
+        try:
+            return json.loads(body)
+        except ValueError as err:
+            raise JullixApiError(f"Invalid JSON received from {url}") from err
 
     async def get_dsmr_data(self) -> dict[str, Any]:
         """Fetch DSMR meter data.
@@ -101,6 +220,54 @@ class JullixApiClient:
             "inverter": inverter_data,
         }
 
+    async def probe(self, timeout: float = PROBE_TIMEOUT) -> str | None:
+        """Identify the device from the start of its meter status.
+
+        The response is only read until the meter ID and the connection
+        state are found, so a check answers quickly over a poor link. Probes
+        are not shared with other callers and not counted in the metrics.
+
+        Args:
+            timeout: Seconds to wait for the whole probe
+
+        Returns:
+            The meter ID, None if the device reports no meter ID
+
+        Raises:
+            JullixConnectionError: If connection fails
+            JullixTimeoutError: If the probe times out
+            JullixApiError: If the host is not a Jullix device
+
+        """
+        url = f"{self._base_url}{API_DSMR_STATUS}"
+        head = b""
+        try:
+            async with asyncio.timeout(timeout):
+                async with self.session.get(url) as response:
+                    response.raise_for_status()
+                    async for chunk in response.content.iter_chunked(PROBE_READ_SIZE):
+                        head += chunk
+                        if len(head) >= PROBE_MAX_BYTES or (
+                            _PROBE_CONNECTED.search(head) and _PROBE_ID.search(head)
+                        ):
+                            break
+        except TimeoutError as err:
+            raise JullixTimeoutError(f"Timeout connecting to {url}") from err
+        except aiohttp.ClientError as err:
+            raise JullixConnectionError(f"Failed to connect to {url}: {err}") from err
+
+        # The meter status always reports whether the meter is connected
+        if not _PROBE_CONNECTED.search(head):
+            raise JullixApiError(f"No Jullix meter status at {url}")
+        if (match := _PROBE_ID.search(head)) is None:
+            return None
+        try:
+            item = json.loads(match[1])
+        except ValueError:
+            return None
+        meter_id = item.get("value") if isinstance(item, dict) else item
+        return str(meter_id) if meter_id else None
+
     async def test_connection(self) -> bool:
         """Test connection to the Jullix device.
 
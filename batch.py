@@ -0,0 +1,97 @@
+"""Batched state writes of the entities of a coordinator."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, callback
+
+from .const import DEVICE_INVERTER, DEVICE_METER
+from .profiler import listener_name
+
+if TYPE_CHECKING:
+    from . import JullixCoordinator
+    from .entity import JullixBatchedEntity
+
+
+def device_available(coordinator: JullixCoordinator, device_type: str) -> bool:
+    """Return if the last update succeeded and a device reported data."""
+    if not coordinator.last_update_success:
+        return False
+    if device_type == DEVICE_METER:
+        return coordinator.data.get("dsmr", {}).get("connected", False)
+    # For inverter, check if it's running
+    return coordinator.data.get("inverter", {}).get("running", False)
+
+
+class EntityBatch:
+    """Update the entities of a coordinator in one pass per refresh.
+
+    A single coordinator listener replaces one listener per entity. Every
+    entity handles the new data first, then only the entities whose state
+    inputs differ from what they last wrote write a new state.
+    """
+
+    def __init__(self, coordinator: JullixCoordinator) -> None:
+        """Initialize an empty batch."""
+        self._coordinator = coordinator
+        # Entities and the state inputs they last wrote
+        self._entities: dict[JullixBatchedEntity, tuple[Any, ...]] = {}
+        self._remove_listener: CALLBACK_TYPE | None = None
+        self.writes = 0
+        self.skipped = 0
+
+    def _availability(self) -> dict[str, bool]:
+        """Return the availability of both devices, shared by all entities."""
+        return {
+            device_type: device_available(self._coordinator, device_type)
+            for device_type in (DEVICE_METER, DEVICE_INVERTER)
+        }
+
+    def __len__(self) -> int:
+        """Return the number of entities in the batch."""
+        return len(self._entities)
+
+    @callback
+    def async_add(self, entity: JullixBatchedEntity) -> CALLBACK_TYPE:
+        """Add an entity about to write its initial state.
+
+        Returns:
+            Callback removing the entity from the batch
+
+        """
+        self._entities[entity] = entity.batch_state(self._availability())
+        if self._remove_listener is None:
+            self._remove_listener = self._coordinator.async_add_listener(
+                self.async_update
+            )
+
+        @callback
+        def _async_remove() -> None:
+            self._entities.pop(entity, None)
+            if not self._entities and self._remove_listener is not None:
+                self._remove_listener()
+                self._remove_listener = None
+
+        return _async_remove
+
+    @callback
+    def async_update(self) -> None:
+        """Handle a coordinator update for all entities of the batch."""
+        profiler = self._coordinator.profiler
+        available = self._availability()
+        # Entities may leave the batch while states are written
+        for entity, written in list(self._entities.items()):
+            start = time.perf_counter() if profiler else 0.0
+            entity._handle_coordinator_update()  # noqa: SLF001
+            if (state := entity.batch_state(available)) == written:
+                self.skipped += 1
+            else:
+                self._entities[entity] = state
+                self.writes += 1
+                entity.async_write_ha_state()
+            if profiler:
+                profiler.record_listener(
+                    listener_name(entity.async_write_ha_state), time.perf_counter() - start
+                )
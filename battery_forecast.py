@@ -0,0 +1,107 @@
+"""Battery time to full and time to reserve estimates for Jullix."""
+
+from __future__ import annotations
+
+import math
+from typing import Any
+
+from .const import BATTERY_FORECAST_MIN_RATE, BATTERY_FORECAST_TAU
+
+
+class BatteryForecast:
+    """Estimate battery charge and discharge times from the state of charge.
+
+    An exponentially weighted linear regression of the state of charge over
+    time is updated in constant time per sample. The weight of a sample decays
+    with its age rather than its index, so irregular poll, push and stream
+    intervals are handled alike. The slope smooths out the 1 % resolution of
+    the reported state of charge.
+    """
+
+    def __init__(
+        self, reserve: float, tau: float = BATTERY_FORECAST_TAU.total_seconds()
+    ) -> None:
+        """Initialize the forecast.
+
+        Args:
+            reserve: State of charge (%) at which the battery is considered empty
+            tau: Time constant of the regression weights in seconds
+
+        """
+        self.reserve = reserve
+        self._tau = tau
+        self._origin: float | None = None
+        self._last_time = 0.0
+        self._mean_time = 0.0
+        self._mean_soc = 0.0
+        self._var_time = 0.0
+        self._cov = 0.0
+
+    def update(self, now: float, data: dict[str, Any]) -> None:
+        """Add the state of charge of one update.
+
+        Args:
+            now: Timestamp of the update in seconds
+            data: Coordinator data
+
+        """
+        inverter_data = data.get("inverter", {})
+        if not inverter_data.get("running", False):
+            return
+        soc = inverter_data.get("data", {}).get("battery_SOC")
+        if not isinstance(soc, (int, float)):
+            return
+
+        if self._origin is None:
+            # Timestamps are kept relative to the first sample for precision
+            self._origin = now
+            self._mean_soc = soc
+            return
+
+        elapsed = now - self._origin
+        if elapsed <= self._last_time:
+            return
+        alpha = 1 - math.exp((self._last_time - elapsed) / self._tau)
+        self._last_time = elapsed
+
+        diff_time = elapsed - self._mean_time
+        diff_soc = soc - self._mean_soc
+        self._mean_time += alpha * diff_time
+        self._mean_soc += alpha * diff_soc
+        self._var_time = (1 - alpha) * (self._var_time + alpha * diff_time * diff_time)
+        self._cov = (1 - alpha) * (self._cov + alpha * diff_time * diff_soc)
+
+    @property
+    def rate(self) -> float | None:
+        """Return the state of charge change in % per hour."""
+        if self._var_time <= 0:
+            return None
+        return self._cov / self._var_time * 3600
+
+    @property
+    def level(self) -> float | None:
+        """Return the regression estimate of the current state of charge."""
+        if self._origin is None:
+            return None
+        level = self._mean_soc
+        if self._var_time > 0:
+            level += self._cov / self._var_time * (self._last_time - self._mean_time)
+        return min(max(level, 0.0), 100.0)
+
+    @property
+    def minutes_to_full(self) -> float | None:
+        """Return the estimated minutes until the battery is full."""
+        if (rate := self.rate) is None or (level := self.level) is None:
+            return None
+        if rate < BATTERY_FORECAST_MIN_RATE:
+            return None
+        return (100 - level) / rate * 60
+
+    @property
+    def minutes_to_empty(self) -> float | None:
+        """Return the estimated minutes until the battery reaches the reserve."""
+        if (rate := self.rate) is None or (level := self.level) is None:
+            return None
+        if rate > -BATTERY_FORECAST_MIN_RATE:
+            return None
+        return max(level - self.reserve, 0.0) / -rate * 60
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass
 from typing import Any
 
@@ -11,18 +11,18 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntityDescription,
 )
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import JullixConfigEntry, JullixCoordinator
+from .anomaly import AnomalyDetector
 from .const import (
+    ANOMALY_BINARY_SENSORS,
     DEVICE_INVERTER,
     DEVICE_METER,
-    DOMAIN,
     DSMR_BINARY_SENSORS,
     INVERTER_BINARY_SENSORS,
 )
+from .entity import JullixBatchedEntity
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -32,6 +32,64 @@ class JullixBinarySensorEntityDescription(BinarySensorEntityDescription):
     value_fn: Callable[[dict[str, Any]], bool | None]
 
 
+@dataclass(frozen=True, kw_only=True)
+class JullixAnomalyBinarySensorEntityDescription(BinarySensorEntityDescription):
+    """Describes Jullix anomaly binary sensor entity."""
+
+    keys_fn: Callable[[AnomalyDetector, str], list[str]]
+
+
+# Functions returning the flagged keys of a device per anomaly sensor
+ANOMALY_KEYS_FNS: dict[str, Callable[[AnomalyDetector, str], list[str]]] = {
+    "stuck_reading": AnomalyDetector.stuck_keys,
+    "reading_spike": AnomalyDetector.spike_keys,
+}
+
+# DSMR binary sensor descriptions with value functions
+DSMR_BINARY_SENSOR_DESCRIPTIONS: tuple[JullixBinarySensorEntityDescription, ...] = tuple(
+    JullixBinarySensorEntityDescription(
+        key=desc.key,
+        translation_key=desc.translation_key,
+        name=desc.name,
+        device_class=desc.device_class,
+        entity_registry_enabled_default=desc.entity_registry_enabled_default,
+        value_fn=lambda data, key=desc.key: data.get("dsmr", {}).get(key),
+    )
+    for desc in DSMR_BINARY_SENSORS
+)
+
+# Inverter binary sensor descriptions with value functions
+INVERTER_BINARY_SENSOR_DESCRIPTIONS: tuple[JullixBinarySensorEntityDescription, ...] = tuple(
+    JullixBinarySensorEntityDescription(
+        key=desc.key,
+        translation_key=desc.translation_key,
+        name=desc.name,
+        device_class=desc.device_class,
+        entity_registry_enabled_default=desc.entity_registry_enabled_default,
+        value_fn=lambda data, key=desc.key: (
+            data.get("inverter", {}).get("data", {}).get(key)
+        ),
+    )
+    for desc in INVERTER_BINARY_SENSORS
+)
+
+# Anomaly binary sensor descriptions with key functions
+ANOMALY_BINARY_SENSOR_DESCRIPTIONS: tuple[
+    JullixAnomalyBinarySensorEntityDescription, ...
+] = tuple(
+    JullixAnomalyBinarySensorEntityDescription(
+        key=desc.key,
+        translation_key=desc.translation_key,
+        name=desc.name,
+        device_class=desc.device_class,
+        entity_category=desc.entity_category,
+        entity_registry_enabled_default=desc.entity_registry_enabled_default,
+        keys_fn=ANOMALY_KEYS_FNS[desc.key],
+    )
+    for desc in ANOMALY_BINARY_SENSORS
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: JullixConfigEntry,
@@ -40,50 +98,29 @@ async def async_setup_entry(
     """Set up Jullix binary sensor entities."""
     coordinator = entry.runtime_data
 
-    # Create DSMR binary sensor descriptions with value functions
-    dsmr_binary_sensor_descriptions = [
-        JullixBinarySensorEntityDescription(
-            key=desc.key,
-            translation_key=desc.translation_key,
-            name=desc.name,
-            device_class=desc.device_class,
-            entity_registry_enabled_default=desc.entity_registry_enabled_default,
-            value_fn=lambda data, key=desc.key: data.get("dsmr", {}).get(key),
-        )
-        for desc in DSMR_BINARY_SENSORS
-    ]
-
-    # Create inverter binary sensor descriptions with value functions
-    inverter_binary_sensor_descriptions = [
-        JullixBinarySensorEntityDescription(
-            key=desc.key,
-            translation_key=desc.translation_key,
-            name=desc.name,
-            device_class=desc.device_class,
-            entity_registry_enabled_default=desc.entity_registry_enabled_default,
-            value_fn=lambda data, key=desc.key: (
-                data.get("inverter", {}).get("data", {}).get(key)
-            ),
-        )
-        for desc in INVERTER_BINARY_SENSORS
-    ]
-
     # Create DSMR binary sensor entities
     entities: list[JullixBinarySensor] = [
         JullixBinarySensor(coordinator, description, DEVICE_METER)
-        for description in dsmr_binary_sensor_descriptions
+        for description in DSMR_BINARY_SENSOR_DESCRIPTIONS
     ]
 
     # Create inverter binary sensor entities
     entities.extend(
         JullixBinarySensor(coordinator, description, DEVICE_INVERTER)
-        for description in inverter_binary_sensor_descriptions
+        for description in INVERTER_BINARY_SENSOR_DESCRIPTIONS
+    )
+
+    # Create anomaly binary sensor entities for both devices
+    entities.extend(
+        JullixAnomalyBinarySensor(coordinator, description, device_type)
+        for device_type in (DEVICE_METER, DEVICE_INVERTER)
+        for description in ANOMALY_BINARY_SENSOR_DESCRIPTIONS
     )
 
     async_add_entities(entities)
 
 
-class JullixBinarySensor(CoordinatorEntity[JullixCoordinator], BinarySensorEntity):
+class JullixBinarySensor(JullixBatchedEntity, BinarySensorEntity):
     """Representation of a Jullix binary sensor."""
 
     entity_description: JullixBinarySensorEntityDescription
@@ -100,59 +137,41 @@ class JullixBinarySensor(CoordinatorEntity[JullixCoordinator], BinarySensorEntit
         self.entity_description = description
         self._device_type = device_type
 
-        # Set unique ID based on device type and sensor key
-        if device_type == DEVICE_METER:
-            meter_id = coordinator.data.get("dsmr", {}).get("id", {}).get("value", "unknown")
-            self._attr_unique_id = f"{meter_id}_{description.key}"
-        else:
-            # Use config entry ID for inverter as it may not have a unique serial
-            self._attr_unique_id = (
-                f"{coordinator.config_entry.entry_id}_{description.key}"
-            )
-
-        # Set device info
-        self._attr_device_info = self._get_device_info()
-
-    def _get_device_info(self) -> DeviceInfo:
-        """Return device info for this binary sensor."""
-        if self._device_type == DEVICE_METER:
-            meter_id = self.coordinator.data.get("dsmr", {}).get("id", {}).get("value", "unknown")
-            return DeviceInfo(
-                identifiers={(DOMAIN, f"{DEVICE_METER}_{meter_id}")},
-                name="Smart Meter",
-                manufacturer="Jullix",
-                model="DSMR P1 Meter",
-            )
-
-        # Inverter device
-        inverter_data = self.coordinator.data.get("inverter", {})
-        model = inverter_data.get("model", "Unknown")
-        desc = inverter_data.get("desc", "Solar Inverter")
-
-        # Use model as-is but capitalize for manufacturer
-        manufacturer = model.capitalize() if model else "Unknown"
-
-        return DeviceInfo(
-            identifiers={(DOMAIN, f"{DEVICE_INVERTER}_{self.coordinator.config_entry.entry_id}")},
-            name=desc,
-            manufacturer=manufacturer,
-            model=model,
-        )
+        # Unique ID and device info are shared by the coordinator's entities
+        self._attr_unique_id = coordinator.devices.unique_id(device_type, description.key)
+        self._attr_device_info = coordinator.devices.device_info(device_type)
+
+    def batch_state(self, available: Mapping[str, bool]) -> tuple[Any, ...]:
+        """Return the inputs of the state, compared with the last written ones."""
+        return (available[self._device_type], self.is_on)
 
     @property
     def is_on(self) -> bool | None:
         """Return true if the binary sensor is on."""
         return self.entity_description.value_fn(self.coordinator.data)
 
-    @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        if not super().available:
-            return False
 
-        # Check device-specific availability
-        if self._device_type == DEVICE_METER:
-            return self.coordinator.data.get("dsmr", {}).get("connected", False)
+class JullixAnomalyBinarySensor(JullixBinarySensor):
+    """Problem sensor for stuck or spiking readings of a device."""
 
-        # For inverter, check if it's running
-        return self.coordinator.data.get("inverter", {}).get("running", False)
+    entity_description: JullixAnomalyBinarySensorEntityDescription  # type: ignore[assignment]
+
+    def _flagged_keys(self) -> list[str]:
+        """Return the flagged keys of this device."""
+        return self.entity_description.keys_fn(
+            self.coordinator.anomalies, self._device_type
+        )
+
+    def batch_state(self, available: Mapping[str, bool]) -> tuple[Any, ...]:
+        """Return the inputs of the state, compared with the last written ones."""
+        return (available[self._device_type], tuple(self._flagged_keys()))
+
+    @property
+    def is_on(self) -> bool:
+        """Return true if any reading of the device is flagged."""
+        return bool(self._flagged_keys())
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the flagged keys."""
+        return {"keys": self._flagged_keys()}
@@ -7,9 +7,20 @@ from typing import Any
 
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.components import webhook
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.core import callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.selector import ObjectSelector
+from homeassistant.helpers.service_info.dhcp import DhcpServiceInfo
+from homeassistant.helpers.service_info.zeroconf import ZeroconfServiceInfo
 
 from .api import (
     JullixApiClient,
@@ -17,13 +28,81 @@ from .api import (
     JullixConnectionError,
     JullixTimeoutError,
 )
-from .const import CONF_HOST, DOMAIN
+from .const import (
+    CONF_BATTERY_RESERVE,
+    CONF_CONNECT_TIMEOUT,
+    CONF_DSMR_SCAN_INTERVAL,
+    CONF_HOST,
+    CONF_INVERTER_SCAN_INTERVAL,
+    CONF_LONG_TERM_STATISTICS,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_P1_HOST,
+    CONF_P1_PORT,
+    CONF_PUSH,
+    CONF_READ_TIMEOUT,
+    CONF_SLO_LATENCY,
+    CONF_SLO_TIMEOUT_RATIO,
+    CONF_THRESHOLDS,
+    DEFAULT_BATTERY_RESERVE,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_P1_PORT,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SLO_LATENCY,
+    DEFAULT_SLO_TIMEOUT_RATIO,
+    DOMAIN,
+)
+from .discovery import (
+    DiscoveredDevice,
+    async_get_scan_networks,
+    async_probe,
+    async_scan,
+)
+from .thresholds import THRESHOLDS_SCHEMA
 
 _LOGGER = logging.getLogger(__name__)
 
 STEP_USER_DATA_SCHEMA = vol.Schema(
     {
-        vol.Required(CONF_HOST): cv.string,
+        # Leave the host empty to search the local network
+        vol.Optional(CONF_HOST): cv.string,
+    }
+)
+
+# Scan intervals stay below the push watchdog interval
+SCAN_INTERVAL_SCHEMA = vol.All(vol.Coerce(int), vol.Range(min=2, max=240))
+REQUEST_TIMEOUT_SCHEMA = vol.All(vol.Coerce(float), vol.Range(min=0.5, max=60))
+
+OPTIONS_SCHEMA = vol.Schema(
+    {
+        vol.Required(
+            CONF_DSMR_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL.seconds
+        ): SCAN_INTERVAL_SCHEMA,
+        vol.Required(
+            CONF_INVERTER_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL.seconds
+        ): SCAN_INTERVAL_SCHEMA,
+        vol.Required(
+            CONF_CONNECT_TIMEOUT, default=DEFAULT_CONNECT_TIMEOUT
+        ): REQUEST_TIMEOUT_SCHEMA,
+        vol.Required(CONF_READ_TIMEOUT, default=DEFAULT_READ_TIMEOUT): REQUEST_TIMEOUT_SCHEMA,
+        vol.Required(
+            CONF_MAX_CONCURRENT_REQUESTS, default=DEFAULT_MAX_CONCURRENT_REQUESTS
+        ): vol.All(vol.Coerce(int), vol.Range(min=1, max=8)),
+        vol.Required(CONF_SLO_LATENCY, default=DEFAULT_SLO_LATENCY): vol.All(
+            vol.Coerce(float), vol.Range(min=0.05, max=60)
+        ),
+        vol.Required(CONF_SLO_TIMEOUT_RATIO, default=DEFAULT_SLO_TIMEOUT_RATIO): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=100)
+        ),
+        vol.Required(CONF_PUSH, default=False): cv.boolean,
+        vol.Optional(CONF_P1_HOST): cv.string,
+        vol.Required(CONF_P1_PORT, default=DEFAULT_P1_PORT): cv.port,
+        vol.Required(CONF_LONG_TERM_STATISTICS, default=False): cv.boolean,
+        vol.Optional(CONF_THRESHOLDS): ObjectSelector(),
+        vol.Required(CONF_BATTERY_RESERVE, default=DEFAULT_BATTERY_RESERVE): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=100)
+        ),
     }
 )
 
@@ -34,6 +113,17 @@ class JullixConfigFlow(ConfigFlow, domain=DOMAIN):
     VERSION = 1
     MINOR_VERSION = 1
 
+    def __init__(self) -> None:
+        """Initialize the config flow."""
+        self._discovered: dict[str, DiscoveredDevice] = {}
+        self._discovered_device: DiscoveredDevice | None = None
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> JullixOptionsFlow:
+        """Get the options flow for this handler."""
+        return JullixOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -41,17 +131,16 @@ class JullixConfigFlow(ConfigFlow, domain=DOMAIN):
         errors: dict[str, str] = {}
 
         if user_input is not None:
-            host = user_input[CONF_HOST]
+            if not (host := user_input.get(CONF_HOST)):
+                return await self.async_step_scan()
 
             # Test connection to the device
             session = async_get_clientsession(self.hass)
             client = JullixApiClient(host, session)
 
             try:
-                data = await client.get_all_data()
-
-                # Extract meter ID for unique ID
-                meter_id = data.get("dsmr", {}).get("id", {}).get("value")
+                # Only the start of the meter status is read to get the meter ID
+                meter_id = await client.probe()
                 if meter_id:
                     await self.async_set_unique_id(meter_id)
                     self._abort_if_unique_id_configured()
@@ -77,3 +166,142 @@ class JullixConfigFlow(ConfigFlow, domain=DOMAIN):
             data_schema=STEP_USER_DATA_SCHEMA,
             errors=errors,
         )
+
+    async def async_step_scan(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Search the local network and let the user pick a device."""
+        if user_input is not None:
+            device = self._discovered[user_input[CONF_HOST]]
+            if device.meter_id is not None:
+                await self.async_set_unique_id(device.meter_id)
+                self._abort_if_unique_id_configured()
+            return self.async_create_entry(
+                title=f"Jullix ({device.host})",
+                data={CONF_HOST: device.host},
+            )
+
+        devices = await async_scan(
+            async_get_clientsession(self.hass), await async_get_scan_networks(self.hass)
+        )
+        configured_ids = self._async_current_ids(include_ignore=False)
+        configured_hosts = {
+            entry.data[CONF_HOST] for entry in self._async_current_entries(include_ignore=False)
+        }
+        self._discovered = {
+            device.host: device
+            for device in devices
+            if device.meter_id not in configured_ids and device.host not in configured_hosts
+        }
+        if not self._discovered:
+            return self.async_show_form(
+                step_id="user",
+                data_schema=STEP_USER_DATA_SCHEMA,
+                errors={"base": "no_devices_found"},
+            )
+
+        return self.async_show_form(
+            step_id="scan",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_HOST): vol.In(
+                        {
+                            host: f"{host} ({device.meter_id or 'no meter'})"
+                            for host, device in self._discovered.items()
+                        }
+                    )
+                }
+            ),
+        )
+
+    async def async_step_dhcp(
+        self, discovery_info: DhcpServiceInfo
+    ) -> ConfigFlowResult:
+        """Handle a device found by DHCP."""
+        return await self._async_step_discovered(discovery_info.ip)
+
+    async def async_step_zeroconf(
+        self, discovery_info: ZeroconfServiceInfo
+    ) -> ConfigFlowResult:
+        """Handle a device found by zeroconf."""
+        return await self._async_step_discovered(discovery_info.host)
+
+    async def _async_step_discovered(self, host: str) -> ConfigFlowResult:
+        """Identify a discovered host and update the entry of a moved device."""
+        device = await async_probe(async_get_clientsession(self.hass), host)
+        if device is None:
+            return self.async_abort(reason="not_jullix_device")
+        if device.meter_id is None:
+            return self.async_abort(reason="no_meter_id")
+
+        # A configured device that moved to a new address gets its host updated
+        await self.async_set_unique_id(device.meter_id)
+        self._abort_if_unique_id_configured(updates={CONF_HOST: host})
+
+        self._discovered_device = device
+        self.context["title_placeholders"] = {"host": host}
+        return await self.async_step_discovery_confirm()
+
+    async def async_step_discovery_confirm(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Confirm adding a discovered device."""
+        device = self._discovered_device
+        assert device is not None
+        if user_input is not None:
+            return self.async_create_entry(
+                title=f"Jullix ({device.host})",
+                data={CONF_HOST: device.host},
+            )
+
+        self._set_confirm_only()
+        return self.async_show_form(
+            step_id="discovery_confirm",
+            description_placeholders={
+                "host": device.host,
+                "meter_id": device.meter_id or "",
+            },
+        )
+
+
+class JullixOptionsFlow(OptionsFlow):
+    """Handle Jullix options."""
+
+    _webhook_id: str | None = None
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+        errors: dict[str, str] = {}
+        options = self.config_entry.options
+        if self._webhook_id is None:
+            # Keep the webhook ID stable so a configured bridge keeps working
+            self._webhook_id = (
+                options.get(CONF_WEBHOOK_ID) or webhook.async_generate_id()
+            )
+
+        if user_input is not None:
+            try:
+                thresholds = THRESHOLDS_SCHEMA(user_input.get(CONF_THRESHOLDS, []))
+            except vol.Invalid:
+                errors[CONF_THRESHOLDS] = "invalid_thresholds"
+            else:
+                return self.async_create_entry(
+                    data={
+                        **user_input,
+                        CONF_THRESHOLDS: thresholds,
+                        CONF_WEBHOOK_ID: self._webhook_id,
+                    },
+                )
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(
+                OPTIONS_SCHEMA, user_input or options
+            ),
+            errors=errors,
+            description_placeholders={
+                "webhook_path": webhook.async_generate_path(self._webhook_id),
+            },
+        )
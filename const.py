@@ -14,10 +14,13 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.const import (
     PERCENTAGE,
+    EntityCategory,
     UnitOfElectricCurrent,
     UnitOfElectricPotential,
     UnitOfEnergy,
+    UnitOfInformation,
     UnitOfPower,
+    UnitOfTime,
     UnitOfVolume,
 )
 
@@ -25,14 +28,124 @@ DOMAIN: Final = "jullix"
 
 # Configuration
 CONF_HOST: Final = "host"
+CONF_PUSH: Final = "push"
+CONF_P1_HOST: Final = "p1_host"
+CONF_P1_PORT: Final = "p1_port"
+DEFAULT_P1_PORT: Final = 2001
+CONF_LONG_TERM_STATISTICS: Final = "long_term_statistics"
+CONF_THRESHOLDS: Final = "thresholds"
+CONF_BATTERY_RESERVE: Final = "battery_reserve"
+DEFAULT_BATTERY_RESERVE: Final = 10
+CONF_DSMR_SCAN_INTERVAL: Final = "dsmr_scan_interval"
+CONF_INVERTER_SCAN_INTERVAL: Final = "inverter_scan_interval"
 DEFAULT_SCAN_INTERVAL: Final = timedelta(seconds=10)
+CONF_CONNECT_TIMEOUT: Final = "connect_timeout"
+DEFAULT_CONNECT_TIMEOUT: Final = 5
+CONF_READ_TIMEOUT: Final = "read_timeout"
+DEFAULT_READ_TIMEOUT: Final = 10
+CONF_MAX_CONCURRENT_REQUESTS: Final = "max_concurrent_requests"
+DEFAULT_MAX_CONCURRENT_REQUESTS: Final = 2
+# Latency objectives, p95 of request latency (seconds) and timeouts (% of requests)
+CONF_SLO_LATENCY: Final = "slo_latency"
+DEFAULT_SLO_LATENCY: Final = 2.0
+CONF_SLO_TIMEOUT_RATIO: Final = "slo_timeout_ratio"
+DEFAULT_SLO_TIMEOUT_RATIO: Final = 5
+# Requests in the rolling window before the latency objectives are checked
+SLO_MIN_REQUESTS: Final = 20
+
+# Options applied to the running coordinator and client, others reload the entry
+LIVE_OPTIONS: Final = frozenset(
+    {
+        CONF_DSMR_SCAN_INTERVAL,
+        CONF_INVERTER_SCAN_INTERVAL,
+        CONF_CONNECT_TIMEOUT,
+        CONF_READ_TIMEOUT,
+        CONF_MAX_CONCURRENT_REQUESTS,
+        CONF_SLO_LATENCY,
+        CONF_SLO_TIMEOUT_RATIO,
+    }
+)
+
+# Polling interval used as a watchdog while pushed payloads keep arriving
+PUSH_WATCHDOG_INTERVAL: Final = timedelta(minutes=5)
+
+# Raw P1 telegram stream
+P1_RECONNECT_INTERVAL: Final = 10
+# Streamed meter values take precedence over polled ones for this long
+P1_MAX_AGE: Final = timedelta(seconds=30)
 
 # API Endpoints
 API_DSMR_STATUS: Final = "/api/dsmr/status"
 API_INVERTER_STATUS: Final = "/api/inverter/status/A"
 
-# Timeout
-API_TIMEOUT: Final = 10
+# Responses younger than this (seconds) are shared with later callers
+REQUEST_MAX_AGE: Final = 2
+
+# Probe of the meter status identifying a device, timeout (seconds) and bytes read
+PROBE_TIMEOUT: Final = 2
+PROBE_READ_SIZE: Final = 256
+PROBE_MAX_BYTES: Final = 16384
+
+# Network discovery, probe timeout (seconds) and concurrent probes
+DISCOVERY_TIMEOUT: Final = 1.5
+DISCOVERY_CONCURRENCY: Final = 128
+# Networks larger than this prefix are only scanned around Home Assistant's address
+DISCOVERY_MIN_PREFIX: Final = 24
+
+# Longest time between samples the battery power is integrated over
+BATTERY_ENERGY_MAX_GAP: Final = timedelta(hours=1)
+# Largest correction of integrated battery energy, relative to the counter change
+RECONCILE_MAX_CORRECTION: Final = 0.1
+# Counter changes larger than this multiple of the integrated energy are not
+# trusted, for example counters reported in Wh instead of kWh
+RECONCILE_MAX_RATIO: Final = 10.0
+# Device counters battery energy is reconciled with, the first one reported is used
+BATTERY_COUNTER_KEYS: Final[dict[str, tuple[str, ...]]] = {
+    "battery_energy_charged": (
+        "battery_energy_charged",
+        "battery_charged",
+        "energy_battery_charged",
+        "energy_charged",
+    ),
+    "battery_energy_discharged": (
+        "battery_energy_discharged",
+        "battery_discharged",
+        "energy_battery_discharged",
+        "energy_discharged",
+    ),
+}
+
+# Recording and replay of raw responses
+RECORD_FLUSH_INTERVAL: Final = timedelta(minutes=1)
+# Bytes of recorded lines read from disk at a time during replay
+REPLAY_READ_SIZE: Final = 1 << 20
+
+# Anomaly detection
+ANOMALY_EWMA_ALPHA: Final = 0.05
+ANOMALY_MIN_SAMPLES: Final = 30
+ANOMALY_SPIKE_Z: Final = 6.0
+ANOMALY_STUCK_DURATION: Final = timedelta(minutes=15)
+
+# Battery forecast, time constant of the weighted state of charge regression
+BATTERY_FORECAST_TAU: Final = timedelta(minutes=15)
+# Slower state of charge changes (% per hour) are treated as idle
+BATTERY_FORECAST_MIN_RATE: Final = 0.5
+
+# Seconds between writes of the energy balance totals
+ENERGY_BALANCE_SAVE_DELAY: Final = 60
+
+# Seconds between writes of the hour in progress of the long-term statistics
+STATISTICS_SAVE_DELAY: Final = 60
+# Longest time a value is held in the hourly mean without a new sample
+STATISTICS_MAX_HOLD: Final = timedelta(minutes=10)
+
+# Events
+EVENT_THRESHOLD: Final = "jullix_threshold"
+
+# Dispatcher signal for fields discovered in the payload, formatted with the entry ID
+SIGNAL_NEW_FIELDS: Final = "jullix_new_fields_{}"
+# Dispatcher signal for optional inverter keys reported for the first time
+SIGNAL_NEW_OPTIONAL_KEYS: Final = "jullix_new_optional_keys_{}"
 
 # Device identifiers
 DEVICE_METER: Final = "meter"
@@ -108,26 +221,86 @@ DSMR_BINARY_SENSORS: tuple[BinarySensorEntityDescription, ...] = (
     ),
 )
 
+# Phase and MPPT string families, inverters report the keys they support
+INVERTER_PHASES: Final = ("l1", "l2", "l3")
+INVERTER_PV_STRINGS: Final = 4
+
+
+def _phase_sensors() -> tuple[SensorEntityDescription, ...]:
+    """Return the voltage and current descriptions of every phase."""
+    return tuple(
+        description
+        for phase in INVERTER_PHASES
+        for description in (
+            SensorEntityDescription(
+                key=f"voltage_{phase}",
+                translation_key=f"inverter_voltage_{phase}",
+                name=f"Voltage {phase.upper()}",
+                device_class=SensorDeviceClass.VOLTAGE,
+                state_class=SensorStateClass.MEASUREMENT,
+                native_unit_of_measurement=UnitOfElectricPotential.VOLT,
+                suggested_display_precision=1,
+            ),
+            SensorEntityDescription(
+                key=f"current_{phase}",
+                translation_key=f"inverter_current_{phase}",
+                name=f"Current {phase.upper()}",
+                device_class=SensorDeviceClass.CURRENT,
+                state_class=SensorStateClass.MEASUREMENT,
+                native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
+                suggested_display_precision=2,
+            ),
+        )
+    )
+
+
+def _pv_string_sensors() -> tuple[SensorEntityDescription, ...]:
+    """Return the power, voltage and current descriptions of every PV string."""
+    return tuple(
+        description
+        for string in range(1, INVERTER_PV_STRINGS + 1)
+        for description in (
+            SensorEntityDescription(
+                key=f"pv{string}_power",
+                translation_key=f"pv{string}_power",
+                name=f"PV{string} power",
+                device_class=SensorDeviceClass.POWER,
+                state_class=SensorStateClass.MEASUREMENT,
+                native_unit_of_measurement=UnitOfPower.KILO_WATT,
+                suggested_display_precision=2,
+            ),
+            SensorEntityDescription(
+                key=f"pv{string}_voltage",
+                translation_key=f"pv{string}_voltage",
+                name=f"PV{string} voltage",
+                device_class=SensorDeviceClass.VOLTAGE,
+                state_class=SensorStateClass.MEASUREMENT,
+                native_unit_of_measurement=UnitOfElectricPotential.VOLT,
+                suggested_display_precision=1,
+            ),
+            SensorEntityDescription(
+                key=f"pv{string}_current",
+                translation_key=f"pv{string}_current",
+                name=f"PV{string} current",
+                device_class=SensorDeviceClass.CURRENT,
+                state_class=SensorStateClass.MEASUREMENT,
+                native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
+                suggested_display_precision=2,
+            ),
+        )
+    )
+
+
+# Family sensors beyond the first phase are only created when reported
+OPTIONAL_INVERTER_KEYS: frozenset[str] = frozenset(
+    description.key
+    for description in (*_phase_sensors(), *_pv_string_sensors())
+    if not description.key.endswith("_l1")
+)
+
 # Inverter Sensor Descriptions
 INVERTER_SENSORS: tuple[SensorEntityDescription, ...] = (
-    SensorEntityDescription(
-        key="voltage_l1",
-        translation_key="inverter_voltage_l1",
-        name="Voltage L1",
-        device_class=SensorDeviceClass.VOLTAGE,
-        state_class=SensorStateClass.MEASUREMENT,
-        native_unit_of_measurement=UnitOfElectricPotential.VOLT,
-        suggested_display_precision=1,
-    ),
-    SensorEntityDescription(
-        key="current_l1",
-        translation_key="inverter_current_l1",
-        name="Current L1",
-        device_class=SensorDeviceClass.CURRENT,
-        state_class=SensorStateClass.MEASUREMENT,
-        native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
-        suggested_display_precision=2,
-    ),
+    *_phase_sensors(),
     SensorEntityDescription(
         key="battery_power",
         translation_key="battery_power",
@@ -209,6 +382,7 @@ INVERTER_SENSORS: tuple[SensorEntityDescription, ...] = (
         native_unit_of_measurement=UnitOfPower.KILO_WATT,
         suggested_display_precision=2,
     ),
+    *_pv_string_sensors(),
 )
 
 # Battery Energy Tracking Sensor Descriptions
@@ -233,6 +407,166 @@ BATTERY_ENERGY_SENSORS: tuple[SensorEntityDescription, ...] = (
     ),
 )
 
+# Battery Forecast Sensor Descriptions
+BATTERY_FORECAST_SENSORS: tuple[SensorEntityDescription, ...] = (
+    SensorEntityDescription(
+        key="battery_time_to_full",
+        translation_key="battery_time_to_full",
+        name="Battery time to full",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        suggested_display_precision=0,
+    ),
+    SensorEntityDescription(
+        key="battery_time_to_empty",
+        translation_key="battery_time_to_empty",
+        name="Battery time to reserve",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        suggested_display_precision=0,
+    ),
+)
+
+# Power Flow Sensor Descriptions
+POWER_FLOW_SENSORS: tuple[SensorEntityDescription, ...] = (
+    SensorEntityDescription(
+        key="house_load",
+        translation_key="house_load",
+        name="House load",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfPower.KILO_WATT,
+        suggested_display_precision=2,
+    ),
+    SensorEntityDescription(
+        key="solar_to_home",
+        translation_key="solar_to_home",
+        name="Solar to home",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfPower.KILO_WATT,
+        suggested_display_precision=2,
+    ),
+    SensorEntityDescription(
+        key="solar_to_battery",
+        translation_key="solar_to_battery",
+        name="Solar to battery",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfPower.KILO_WATT,
+        suggested_display_precision=2,
+    ),
+    SensorEntityDescription(
+        key="solar_to_grid",
+        translation_key="solar_to_grid",
+        name="Solar to grid",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfPower.KILO_WATT,
+        suggested_display_precision=2,
+    ),
+    SensorEntityDescription(
+        key="battery_to_home",
+        translation_key="battery_to_home",
+        name="Battery to home",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfPower.KILO_WATT,
+        suggested_display_precision=2,
+    ),
+    SensorEntityDescription(
+        key="battery_to_grid",
+        translation_key="battery_to_grid",
+        name="Battery to grid",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfPower.KILO_WATT,
+        suggested_display_precision=2,
+    ),
+    SensorEntityDescription(
+        key="grid_to_home",
+        translation_key="grid_to_home",
+        name="Grid to home",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfPower.KILO_WATT,
+        suggested_display_precision=2,
+    ),
+    SensorEntityDescription(
+        key="grid_to_battery",
+        translation_key="grid_to_battery",
+        name="Grid to battery",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfPower.KILO_WATT,
+        suggested_display_precision=2,
+    ),
+)
+
+# Energy Balance Sensor Descriptions
+ENERGY_BALANCE_SENSORS: tuple[SensorEntityDescription, ...] = (
+    SensorEntityDescription(
+        key="self_consumption_today",
+        translation_key="self_consumption_today",
+        name="Self-consumption today",
+        native_unit_of_measurement=PERCENTAGE,
+        suggested_display_precision=1,
+    ),
+    SensorEntityDescription(
+        key="self_consumption_month",
+        translation_key="self_consumption_month",
+        name="Self-consumption this month",
+        native_unit_of_measurement=PERCENTAGE,
+        suggested_display_precision=1,
+    ),
+    SensorEntityDescription(
+        key="self_consumption_lifetime",
+        translation_key="self_consumption_lifetime",
+        name="Self-consumption lifetime",
+        native_unit_of_measurement=PERCENTAGE,
+        suggested_display_precision=1,
+    ),
+    SensorEntityDescription(
+        key="self_sufficiency_today",
+        translation_key="self_sufficiency_today",
+        name="Self-sufficiency today",
+        native_unit_of_measurement=PERCENTAGE,
+        suggested_display_precision=1,
+    ),
+    SensorEntityDescription(
+        key="self_sufficiency_month",
+        translation_key="self_sufficiency_month",
+        name="Self-sufficiency this month",
+        native_unit_of_measurement=PERCENTAGE,
+        suggested_display_precision=1,
+    ),
+    SensorEntityDescription(
+        key="self_sufficiency_lifetime",
+        translation_key="self_sufficiency_lifetime",
+        name="Self-sufficiency lifetime",
+        native_unit_of_measurement=PERCENTAGE,
+        suggested_display_precision=1,
+    ),
+)
+
+# Anomaly Binary Sensor Descriptions, created for both devices
+ANOMALY_BINARY_SENSORS: tuple[BinarySensorEntityDescription, ...] = (
+    BinarySensorEntityDescription(
+        key="stuck_reading",
+        translation_key="stuck_reading",
+        name="Stuck reading",
+        device_class=BinarySensorDeviceClass.PROBLEM,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    BinarySensorEntityDescription(
+        key="reading_spike",
+        translation_key="reading_spike",
+        name="Reading spike",
+        device_class=BinarySensorDeviceClass.PROBLEM,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+)
+
 # Inverter Binary Sensor Descriptions
 INVERTER_BINARY_SENSORS: tuple[BinarySensorEntityDescription, ...] = (
     BinarySensorEntityDescription(
@@ -270,3 +604,74 @@ INVERTER_BINARY_SENSORS: tuple[BinarySensorEntityDescription, ...] = (
         name="Battery discharging",
     ),
 )
+
+# Diagnostic Sensor Descriptions for request and update metrics
+DIAGNOSTIC_SENSORS: tuple[SensorEntityDescription, ...] = (
+    SensorEntityDescription(
+        key="dsmr_request_latency",
+        translation_key="dsmr_request_latency",
+        name="DSMR request latency",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=0,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    SensorEntityDescription(
+        key="inverter_request_latency",
+        translation_key="inverter_request_latency",
+        name="Inverter request latency",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=0,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    SensorEntityDescription(
+        key="update_duration",
+        translation_key="update_duration",
+        name="Update duration",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=0,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    SensorEntityDescription(
+        key="request_timeouts",
+        translation_key="request_timeouts",
+        name="Request timeouts",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    SensorEntityDescription(
+        key="connection_errors",
+        translation_key="connection_errors",
+        name="Connection errors",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    SensorEntityDescription(
+        key="http_errors",
+        translation_key="http_errors",
+        name="HTTP errors",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    SensorEntityDescription(
+        key="response_bytes",
+        translation_key="response_bytes",
+        name="Response data received",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+)
@@ -0,0 +1,132 @@
+"""Device identities shared by the entities of a config entry."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.device_registry import DeviceInfo
+
+from .const import DEVICE_INVERTER, DEVICE_METER, DOMAIN
+from .fields import get_meter_id
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class JullixDevices:
+    """Meter and inverter device info and unique IDs of one coordinator.
+
+    All entities of an entry share the DeviceInfo objects built here. They
+    are only rebuilt when the meter ID or the inverter model changes, and a
+    missing meter ID never replaces a known one.
+    """
+
+    def __init__(self, entry_id: str) -> None:
+        """Initialize the identities."""
+        self._entry_id = entry_id
+        self.meter_id: str | None = None
+        self._registered_meter_id: str | None = None
+        self._inverter_model: tuple[str | None, str | None] | None = None
+        self.meter = DeviceInfo()
+        self.inverter = DeviceInfo()
+
+    def update(self, data: dict[str, Any]) -> bool:
+        """Refresh the identities from coordinator data.
+
+        Returns:
+            True if an identity changed after it was first set
+
+        """
+        changed = False
+        meter_id = get_meter_id(data)
+        if meter_id != self.meter_id and (self.meter_id is None or meter_id != "unknown"):
+            changed = self.meter_id is not None
+            if not changed:
+                self._registered_meter_id = meter_id
+            self.meter_id = meter_id
+            self.meter = DeviceInfo(
+                identifiers={(DOMAIN, f"{DEVICE_METER}_{meter_id}")},
+                name="Smart Meter",
+                manufacturer="Jullix",
+                model="DSMR P1 Meter",
+            )
+
+        inverter_data = data.get("inverter", {})
+        model = inverter_data.get("model", "Unknown")
+        desc = inverter_data.get("desc", "Solar Inverter")
+        if (model, desc) != self._inverter_model:
+            changed = changed or self._inverter_model is not None
+            self._inverter_model = (model, desc)
+            self.inverter = DeviceInfo(
+                identifiers={(DOMAIN, f"{DEVICE_INVERTER}_{self._entry_id}")},
+                name=desc,
+                # Use model as-is but capitalize for manufacturer
+                manufacturer=model.capitalize() if model else "Unknown",
+                model=model,
+            )
+        return changed
+
+    def device_info(self, device_type: str) -> DeviceInfo:
+        """Return the shared device info of a device."""
+        return self.meter if device_type == DEVICE_METER else self.inverter
+
+    def unique_id(self, device_type: str, key: str) -> str:
+        """Return the unique ID of an entity of a device.
+
+        Meter entities are keyed by the meter ID, inverter entities by the
+        config entry ID as the inverter may not have a unique serial.
+        """
+        if device_type == DEVICE_METER:
+            return f"{self.meter_id}_{key}"
+        return f"{self._entry_id}_{key}"
+
+    @callback
+    def async_update_registries(self, hass: HomeAssistant) -> bool:
+        """Move registry entries to the current identities in one pass.
+
+        Returns:
+            True if entities were moved to a new meter ID and need to be
+            recreated with their new unique IDs
+
+        """
+        device_registry = dr.async_get(hass)
+        entity_registry = er.async_get(hass)
+
+        inverter_device = device_registry.async_get_device(
+            identifiers=self.inverter["identifiers"]
+        )
+        if inverter_device is not None:
+            device_registry.async_update_device(
+                inverter_device.id,
+                name=self.inverter["name"],
+                manufacturer=self.inverter["manufacturer"],
+                model=self.inverter["model"],
+            )
+
+        old_meter_id, self._registered_meter_id = self._registered_meter_id, self.meter_id
+        if old_meter_id == self.meter_id:
+            return False
+
+        _LOGGER.info("Meter ID changed from %s to %s", old_meter_id, self.meter_id)
+        old_prefix = f"{old_meter_id}_"
+        for entry in er.async_entries_for_config_entry(entity_registry, self._entry_id):
+            if not entry.unique_id.startswith(old_prefix):
+                continue
+            unique_id = self.unique_id(DEVICE_METER, entry.unique_id.removeprefix(old_prefix))
+            # Entities of a meter that was connected before keep their own entries
+            if entity_registry.async_get_entity_id(entry.domain, DOMAIN, unique_id) is None:
+                entity_registry.async_update_entity(entry.entity_id, new_unique_id=unique_id)
+
+        meter_device = device_registry.async_get_device(
+            identifiers={(DOMAIN, f"{DEVICE_METER}_{old_meter_id}")}
+        )
+        if (
+            meter_device is not None
+            and device_registry.async_get_device(identifiers=self.meter["identifiers"]) is None
+        ):
+            device_registry.async_update_device(
+                meter_device.id, new_identifiers=self.meter["identifiers"]
+            )
+        return True
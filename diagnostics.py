@@ -0,0 +1,30 @@
+"""Diagnostics support for Jullix Energy Management."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant
+
+from . import JullixConfigEntry
+from .const import CONF_HOST, CONF_P1_HOST
+
+TO_REDACT = {CONF_HOST, CONF_P1_HOST, CONF_WEBHOOK_ID, "id"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: JullixConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = entry.runtime_data
+
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": async_redact_data(entry.options, TO_REDACT),
+        },
+        "data": async_redact_data(coordinator.data, TO_REDACT),
+        "metrics": coordinator.client.metrics.as_dict(),
+    }
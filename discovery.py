@@ -0,0 +1,85 @@
+"""Discovery of Jullix devices on the local network."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from dataclasses import dataclass
+from ipaddress import IPv4Address, IPv4Network
+import logging
+
+import aiohttp
+
+from homeassistant.components import network
+from homeassistant.core import HomeAssistant
+
+from .api import JullixApiClient, JullixApiError
+from .const import (
+    DISCOVERY_CONCURRENCY,
+    DISCOVERY_MIN_PREFIX,
+    DISCOVERY_TIMEOUT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class DiscoveredDevice:
+    """Jullix device answering on a host."""
+
+    host: str
+    meter_id: str | None
+
+
+async def async_probe(session: aiohttp.ClientSession, host: str) -> DiscoveredDevice | None:
+    """Return the Jullix device at a host, None if it is not a Jullix device.
+
+    Probes are not shared or retried like polled requests, so a host that
+    does not answer within DISCOVERY_TIMEOUT is released at once.
+    """
+    try:
+        meter_id = await JullixApiClient(host, session).probe(DISCOVERY_TIMEOUT)
+    except JullixApiError:
+        return None
+    return DiscoveredDevice(host, meter_id)
+
+
+async def async_scan(
+    session: aiohttp.ClientSession, networks: Iterable[IPv4Network]
+) -> list[DiscoveredDevice]:
+    """Probe every host of the networks, DISCOVERY_CONCURRENCY at a time.
+
+    Returns:
+        Devices found, ordered by address
+
+    """
+    semaphore = asyncio.Semaphore(DISCOVERY_CONCURRENCY)
+
+    async def _async_probe(host: str) -> DiscoveredDevice | None:
+        async with semaphore:
+            return await async_probe(session, host)
+
+    hosts = sorted({host for net in networks for host in net.hosts()})
+    results = await asyncio.gather(*(_async_probe(str(host)) for host in hosts))
+    devices = [device for device in results if device is not None]
+    _LOGGER.debug("Probed %s hosts, found Jullix devices at %s", len(hosts), devices)
+    return devices
+
+
+async def async_get_scan_networks(hass: HomeAssistant) -> list[IPv4Network]:
+    """Return the local IPv4 networks to scan.
+
+    Networks larger than DISCOVERY_MIN_PREFIX are limited to the part
+    around Home Assistant's own address, so a scan stays short.
+    """
+    networks: set[IPv4Network] = set()
+    for adapter in await network.async_get_adapters(hass):
+        if not adapter["enabled"]:
+            continue
+        for ipv4 in adapter["ipv4"]:
+            address = IPv4Address(ipv4["address"])
+            if address.is_loopback or address.is_link_local:
+                continue
+            prefix = max(ipv4["network_prefix"], DISCOVERY_MIN_PREFIX)
+            networks.add(IPv4Network(f"{address}/{prefix}", strict=False))
+    return sorted(networks)
@@ -0,0 +1,136 @@
+"""Incremental self-consumption and self-sufficiency for Jullix."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from datetime import datetime
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DEVICE_INVERTER, DEVICE_METER, DOMAIN, ENERGY_BALANCE_SAVE_DELAY
+from .fields import get_numeric_value
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+# Energy counters feeding the balance, as (device, key) per total
+COUNTERS: dict[str, tuple[str, str]] = {
+    "produced": (DEVICE_INVERTER, "energy_produced"),
+    "consumed": (DEVICE_INVERTER, "energy_consumed"),
+    "imported": (DEVICE_METER, "energy-in"),
+    "exported": (DEVICE_METER, "energy-out"),
+}
+
+PERIODS: tuple[str, ...] = ("today", "month", "lifetime")
+
+
+@dataclass(slots=True)
+class EnergyTotals:
+    """Energy summed over a period in kWh."""
+
+    produced: float = 0.0
+    consumed: float = 0.0
+    imported: float = 0.0
+    exported: float = 0.0
+
+    @property
+    def self_consumption(self) -> float | None:
+        """Return the share of produced energy used on site in %."""
+        if self.produced <= 0:
+            return None
+        return min(max(1 - self.exported / self.produced, 0.0), 1.0) * 100
+
+    @property
+    def self_sufficiency(self) -> float | None:
+        """Return the share of consumed energy not imported from the grid in %."""
+        if self.consumed <= 0:
+            return None
+        return min(max(1 - self.imported / self.consumed, 0.0), 1.0) * 100
+
+
+class EnergyBalance:
+    """Track self-consumption and self-sufficiency from counter deltas.
+
+    Each update adds the increase of the four energy counters to the totals
+    of today, this month and the lifetime of the entry, so the ratios never
+    need recorder history. The totals and last counter readings are stored,
+    so energy counted while Home Assistant was stopped is added on the first
+    update after a restart.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the energy balance."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.energy_balance"
+        )
+        self.periods: dict[str, EnergyTotals] = {
+            period: EnergyTotals() for period in PERIODS
+        }
+        self._last: dict[str, float] = {}
+        self._day: str | None = None
+        self._month: str | None = None
+
+    async def async_load(self) -> None:
+        """Restore the totals from storage."""
+        if (stored := await self._store.async_load()) is None:
+            return
+        self._day = stored["day"]
+        self._month = stored["month"]
+        self._last = stored["last"]
+        self.periods = {
+            period: EnergyTotals(**stored["periods"][period]) for period in PERIODS
+        }
+
+    async def async_remove(self) -> None:
+        """Remove the stored totals."""
+        await self._store.async_remove()
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to store."""
+        return {
+            "day": self._day,
+            "month": self._month,
+            "last": self._last,
+            "periods": {period: asdict(self.periods[period]) for period in PERIODS},
+        }
+
+    @callback
+    def async_process(self, now: datetime, data: dict[str, Any]) -> None:
+        """Add the counter increases of one update.
+
+        Args:
+            now: Local time of the update
+            data: Coordinator data
+
+        """
+        day = now.date().isoformat()
+        if day != self._day:
+            self._day = day
+            self.periods["today"] = EnergyTotals()
+            month = day[:7]
+            if month != self._month:
+                self._month = month
+                self.periods["month"] = EnergyTotals()
+
+        changed = False
+        last = self._last
+        for total, (device, key) in COUNTERS.items():
+            if (value := get_numeric_value(data, device, key)) is None:
+                continue
+            previous = last.get(total)
+            last[total] = value
+            if previous is None or value <= previous:
+                # First reading, unchanged, or a counter reset
+                continue
+            delta = value - previous
+            for totals in self.periods.values():
+                setattr(totals, total, getattr(totals, total) + delta)
+            changed = True
+
+        if changed:
+            self._store.async_delay_save(self._data_to_save, ENERGY_BALANCE_SAVE_DELAY)
@@ -0,0 +1,50 @@
+"""Base entity for Jullix Energy Management."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import (
+    BaseCoordinatorEntity,
+    CoordinatorEntity,
+)
+
+from . import JullixCoordinator
+from .batch import device_available
+
+
+class JullixBatchedEntity(CoordinatorEntity[JullixCoordinator]):
+    """Coordinator entity whose state is written by the entity batch.
+
+    The batch calls _handle_coordinator_update on every entity and writes
+    the state only when batch_state changed, so unchanged readings skip
+    state formatting and the state machine altogether.
+    """
+
+    _device_type: str
+
+    async def async_added_to_hass(self) -> None:
+        """Join the entity batch of the coordinator."""
+        # Skip BaseCoordinatorEntity, which adds a coordinator listener per entity
+        await super(BaseCoordinatorEntity, self).async_added_to_hass()
+        self.async_on_remove(self.coordinator.entity_batch.async_add(self))
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator, without writing the state."""
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return device_available(self.coordinator, self._device_type)
+
+    def batch_state(self, available: Mapping[str, bool]) -> tuple[Any, ...]:
+        """Return the inputs of the state, compared with the last written ones.
+
+        Args:
+            available: Availability of each device in this update
+
+        """
+        return (available[self._device_type], self.extra_state_attributes)
@@ -0,0 +1,215 @@
+"""Hourly long-term statistics aggregated from Jullix samples."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+import logging
+from typing import Any
+
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.components.sensor import SensorEntityDescription, SensorStateClass
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DEVICE_INVERTER,
+    DEVICE_METER,
+    DOMAIN,
+    DSMR_SENSORS,
+    INVERTER_SENSORS,
+    STATISTICS_MAX_HOLD,
+    STATISTICS_SAVE_DELAY,
+)
+from .fields import iter_numeric_values
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+_MAX_HOLD = STATISTICS_MAX_HOLD.total_seconds()
+
+# Measurement sensors whose hourly statistics are aggregated in memory
+MEASUREMENT_SENSORS: dict[tuple[str, str], SensorEntityDescription] = {
+    **{
+        (DEVICE_METER, desc.key): desc
+        for desc in DSMR_SENSORS
+        if desc.state_class == SensorStateClass.MEASUREMENT
+    },
+    **{
+        (DEVICE_INVERTER, desc.key): desc
+        for desc in INVERTER_SENSORS
+        if desc.state_class == SensorStateClass.MEASUREMENT
+    },
+}
+
+
+@dataclass(slots=True)
+class _HourlyBucket:
+    """Time-weighted mean, minimum and maximum of one hour of samples.
+
+    Each value is held until the next sample, so it is weighted by how long
+    it was reported rather than by how often, up to the maximum hold.
+    """
+
+    value: float
+    time: float
+    since: float
+    minimum: float
+    maximum: float
+    weighted: float = 0.0
+    duration: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        """Return the time-weighted mean of the hour."""
+        if self.duration <= 0:
+            return self.value
+        return self.weighted / self.duration
+
+    def hold(self, until: float) -> None:
+        """Weigh the last value up to a time."""
+        end = min(until, self.time + _MAX_HOLD)
+        if end > self.since:
+            self.weighted += self.value * (end - self.since)
+            self.duration += end - self.since
+            self.since = end
+
+    def add(self, time: float, value: float) -> None:
+        """Add a sample."""
+        self.hold(time)
+        self.value = value
+        self.time = time
+        self.since = max(self.since, time)
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    def carry(self, start: float) -> _HourlyBucket | None:
+        """Return the bucket of the next hour, starting with the held value."""
+        if self.time + _MAX_HOLD <= start:
+            return None
+        return _HourlyBucket(self.value, self.time, start, self.value, self.value)
+
+
+class HourlyStatisticsAggregator:
+    """Aggregate measurement samples and import them as hourly statistics.
+
+    Samples are reduced in constant memory per key. When an hour completes,
+    its mean, minimum and maximum are imported as external statistics, so
+    the recorder does not need to compile them from stored states. The hour
+    in progress is stored, so it survives a reload or restart.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, title: str) -> None:
+        """Initialize the aggregator."""
+        self.hass = hass
+        self._title = title
+        self._statistic_prefix = f"{DOMAIN}:{entry_id.lower()}"
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.statistics"
+        )
+        self._hour: datetime | None = None
+        self._buckets: dict[tuple[str, str], _HourlyBucket] = {}
+
+    def statistic_id(self, device: str, key: str) -> str:
+        """Return the external statistic ID of a key."""
+        return f"{self._statistic_prefix}_{device}_{key.lower()}"
+
+    async def async_load(self) -> None:
+        """Restore the hour in progress from storage.
+
+        A stored hour that has completed since is imported with the next sample.
+        """
+        if (stored := await self._store.async_load()) is None:
+            return
+        self._hour = dt_util.parse_datetime(stored["hour"])
+        self._buckets = {
+            (device, key): _HourlyBucket(**bucket)
+            for device, key, bucket in stored["buckets"]
+        }
+
+    async def async_save(self) -> None:
+        """Store the hour in progress."""
+        await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        """Remove the stored hour in progress."""
+        await self._store.async_remove()
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to store."""
+        return {
+            "hour": self._hour.isoformat() if self._hour else None,
+            "buckets": [
+                [device, key, asdict(bucket)]
+                for (device, key), bucket in self._buckets.items()
+            ],
+        }
+
+    @callback
+    def async_add(self, timestamp: datetime, data: dict[str, Any]) -> None:
+        """Add the measurement samples of one update."""
+        hour = timestamp.replace(minute=0, second=0, microsecond=0)
+        if hour != self._hour:
+            if self._hour is not None:
+                self._async_import(self._hour)
+                start = hour.timestamp()
+                self._buckets = {
+                    key: carried
+                    for key, bucket in self._buckets.items()
+                    if (carried := bucket.carry(start)) is not None
+                }
+            self._hour = hour
+
+        now = timestamp.timestamp()
+        buckets = self._buckets
+        for device, key, value in iter_numeric_values(data):
+            if (device, key) not in MEASUREMENT_SENSORS:
+                continue
+            if (bucket := buckets.get((device, key))) is None:
+                buckets[(device, key)] = _HourlyBucket(value, now, now, value, value)
+            else:
+                bucket.add(now, value)
+
+        self._store.async_delay_save(self._data_to_save, STATISTICS_SAVE_DELAY)
+
+    @callback
+    def _async_import(self, hour: datetime) -> None:
+        """Import the statistics of a completed hour."""
+        end = (hour + timedelta(hours=1)).timestamp()
+        for bucket in self._buckets.values():
+            bucket.hold(end)
+
+        if "recorder" not in self.hass.config.components:
+            return
+
+        for (device, key), bucket in self._buckets.items():
+            description = MEASUREMENT_SENSORS[(device, key)]
+            metadata = StatisticMetaData(
+                mean_type=StatisticMeanType.ARITHMETIC,
+                has_sum=False,
+                name=f"{self._title} {description.name}",
+                source=DOMAIN,
+                statistic_id=self.statistic_id(device, key),
+                unit_of_measurement=description.native_unit_of_measurement,
+            )
+            statistics = StatisticData(
+                start=hour,
+                mean=bucket.mean,
+                min=bucket.minimum,
+                max=bucket.maximum,
+            )
+            async_add_external_statistics(self.hass, metadata, [statistics])
+
+        _LOGGER.debug(
+            "Imported hourly statistics for %s keys starting %s",
+            len(self._buckets),
+            hour,
+        )
@@ -0,0 +1,135 @@
+"""Helpers to read values from Jullix coordinator data."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+import sys
+from typing import Any
+
+from .const import (
+    DEVICE_INVERTER,
+    DEVICE_METER,
+    DSMR_BINARY_SENSORS,
+    DSMR_SENSORS,
+    INVERTER_BINARY_SENSORS,
+    INVERTER_SENSORS,
+)
+
+# Inverter metadata used for the device info, other metadata is dropped
+INVERTER_INFO_KEYS = ("model", "desc", "running")
+
+
+def iter_numeric_values(data: dict[str, Any]) -> Iterator[tuple[str, str, float]]:
+    """Yield (device, key, value) for every numeric value in coordinator data."""
+    for key, item in data.get("dsmr", {}).items():
+        value = item.get("value") if isinstance(item, dict) else item
+        if isinstance(value, int | float) and not isinstance(value, bool):
+            yield DEVICE_METER, key, float(value)
+
+    for key, value in data.get("inverter", {}).get("data", {}).items():
+        if isinstance(value, int | float) and not isinstance(value, bool):
+            yield DEVICE_INVERTER, key, float(value)
+
+
+def get_numeric_value(data: dict[str, Any], device: str, key: str) -> float | None:
+    """Return a single numeric value from coordinator data."""
+    if device == DEVICE_METER:
+        item = data.get("dsmr", {}).get(key)
+        value = item.get("value") if isinstance(item, dict) else item
+    else:
+        value = data.get("inverter", {}).get("data", {}).get(key)
+    if isinstance(value, int | float) and not isinstance(value, bool):
+        return float(value)
+    return None
+
+
+class FieldTable:
+    """Fixed set of fields extracted from coordinator data in one pass.
+
+    Every field gets a position in a flat list, so entities read their value
+    by index instead of walking the nested payload themselves.
+    """
+
+    def __init__(self, fields: Iterable[tuple[str, str]]) -> None:
+        """Initialize the table from (device, key) pairs."""
+        fields = tuple(fields)
+        self._meter_keys = [key for device, key in fields if device == DEVICE_METER]
+        self._inverter_keys = [key for device, key in fields if device == DEVICE_INVERTER]
+
+        # Meter values come first in the flat list, then inverter values
+        self.fields: tuple[tuple[str, str], ...] = (
+            *((DEVICE_METER, key) for key in self._meter_keys),
+            *((DEVICE_INVERTER, key) for key in self._inverter_keys),
+        )
+        self.index = {field: position for position, field in enumerate(self.fields)}
+
+    def extract(self, data: dict[str, Any]) -> list[Any]:
+        """Return the values of all fields, None for missing ones."""
+        dsmr = data.get("dsmr", {})
+        inverter_data = data.get("inverter", {}).get("data", {})
+        values = [
+            item.get("value") if isinstance(item, dict) else item
+            for item in map(dsmr.get, self._meter_keys)
+        ]
+        values.extend(map(inverter_data.get, self._inverter_keys))
+        return values
+
+
+# Fields of all described meter and inverter sensors
+SENSOR_FIELDS = FieldTable(
+    (
+        *((DEVICE_METER, desc.key) for desc in DSMR_SENSORS),
+        *((DEVICE_INVERTER, desc.key) for desc in INVERTER_SENSORS),
+    )
+)
+
+
+# Fields read by entities, kept in compact data even when they are not numeric
+READ_FIELDS: frozenset[tuple[str, str]] = frozenset(
+    (
+        *SENSOR_FIELDS.fields,
+        (DEVICE_METER, "id"),
+        *((DEVICE_METER, desc.key) for desc in DSMR_BINARY_SENSORS),
+        *((DEVICE_INVERTER, desc.key) for desc in INVERTER_BINARY_SENSORS),
+    )
+)
+
+
+def _is_number(value: Any) -> bool:
+    """Return True if a value is an int or float but not a bool."""
+    return isinstance(value, int | float) and not isinstance(value, bool)
+
+
+def compact_payload(data: dict[str, Any]) -> dict[str, Any]:
+    """Return coordinator data reduced to the fields that are read.
+
+    Meter items are unwrapped from their value, title and units objects and
+    non-numeric fields no entity reads are dropped, as is inverter metadata
+    that is not part of the device info. Numeric fields are all kept so
+    discovered sensors and the derived engines see them. Keys are interned,
+    so payloads of every poll and config entry share the same key strings.
+    Compacting compact data returns an equal copy.
+    """
+    intern = sys.intern
+    dsmr: dict[str, Any] = {}
+    for key, item in data.get("dsmr", {}).items():
+        value = item.get("value") if isinstance(item, dict) else item
+        if _is_number(value) or (DEVICE_METER, key) in READ_FIELDS:
+            dsmr[intern(key)] = value
+
+    inverter = data.get("inverter", {})
+    compact_inverter = {key: inverter[key] for key in INVERTER_INFO_KEYS if key in inverter}
+    compact_inverter["data"] = {
+        intern(key): value
+        for key, value in inverter.get("data", {}).items()
+        if _is_number(value) or (DEVICE_INVERTER, key) in READ_FIELDS
+    }
+
+    return {"dsmr": dsmr, "inverter": compact_inverter}
+
+
+def get_meter_id(data: dict[str, Any]) -> str:
+    """Return the meter ID from raw or compact coordinator data."""
+    item = data.get("dsmr", {}).get("id")
+    value = item.get("value") if isinstance(item, dict) else item
+    return value if value is not None else "unknown"
@@ -0,0 +1,175 @@
+"""In-memory metrics for Jullix Energy Management."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass, field
+import heapq
+import math
+from typing import Any
+
+# Upper bounds of the latency histogram buckets in seconds
+LATENCY_BUCKETS: tuple[float, ...] = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Requests kept in the rolling window the latency objectives are checked on
+REQUEST_WINDOW_SIZE = 100
+
+
+@dataclass(slots=True)
+class LatencyHistogram:
+    """Fixed-bucket histogram of durations in seconds."""
+
+    buckets: tuple[float, ...] = LATENCY_BUCKETS
+    counts: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    count: int = 0
+    total: float = 0.0
+    last: float | None = None
+
+    def observe(self, value: float) -> None:
+        """Record a duration."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.last = value
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean duration."""
+        return self.total / self.count if self.count else None
+
+    def quantile(self, quantile: float) -> float | None:
+        """Return the upper bucket bound containing the given quantile."""
+        if not self.count:
+            return None
+        rank = quantile * self.count
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, self.counts, strict=False):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                return bound
+        return float("inf")
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram as a dictionary."""
+        return {
+            "buckets": dict(
+                zip((*map(str, self.buckets), "+Inf"), self.counts, strict=True)
+            ),
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "last": self.last,
+        }
+
+
+@dataclass(slots=True)
+class RequestWindow:
+    """Latencies and timeouts of the most recent requests.
+
+    Unlike the cumulative histograms, old requests leave the window, so
+    its quantiles follow a device that slows down after a long uptime.
+    """
+
+    size: int = REQUEST_WINDOW_SIZE
+    # Latency of each request in seconds, None for a timeout
+    outcomes: deque[float | None] = field(default_factory=deque)
+    timeouts: int = 0
+
+    def _add(self, outcome: float | None) -> None:
+        """Add a request, evicting the oldest one from a full window."""
+        if len(self.outcomes) >= self.size and self.outcomes.popleft() is None:
+            self.timeouts -= 1
+        self.outcomes.append(outcome)
+
+    def observe(self, value: float) -> None:
+        """Record the latency of a completed request."""
+        self._add(value)
+
+    def observe_timeout(self) -> None:
+        """Record a request that timed out."""
+        self.timeouts += 1
+        self._add(None)
+
+    @property
+    def count(self) -> int:
+        """Return the number of requests in the window."""
+        return len(self.outcomes)
+
+    @property
+    def timeout_ratio(self) -> float | None:
+        """Return the fraction of requests in the window that timed out."""
+        return self.timeouts / len(self.outcomes) if self.outcomes else None
+
+    def quantile(self, quantile: float) -> float | None:
+        """Return the nearest-rank latency quantile of completed requests."""
+        count = len(self.outcomes) - self.timeouts
+        if not count:
+            return None
+        # Only the values above the rank are kept, cheaper than sorting the window
+        largest = count - math.ceil(quantile * count) + 1
+        return heapq.nlargest(
+            largest, (value for value in self.outcomes if value is not None)
+        )[-1]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the window summary as a dictionary."""
+        return {
+            "count": self.count,
+            "p95": self.quantile(0.95),
+            "timeout_ratio": self.timeout_ratio,
+        }
+
+
+@dataclass(slots=True)
+class EndpointMetrics:
+    """Request metrics for a single API endpoint."""
+
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    requests: int = 0
+    timeouts: int = 0
+    connection_errors: int = 0
+    http_errors: int = 0
+    response_bytes: int = 0
+    last_response_bytes: int | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the endpoint metrics as a dictionary."""
+        return {
+            "latency": self.latency.as_dict(),
+            "requests": self.requests,
+            "timeouts": self.timeouts,
+            "connection_errors": self.connection_errors,
+            "http_errors": self.http_errors,
+            "response_bytes": self.response_bytes,
+            "last_response_bytes": self.last_response_bytes,
+        }
+
+
+@dataclass(slots=True)
+class JullixMetrics:
+    """Metrics kept by the API client and coordinator."""
+
+    endpoints: dict[str, EndpointMetrics] = field(default_factory=dict)
+    update_duration: LatencyHistogram = field(default_factory=LatencyHistogram)
+    window: RequestWindow = field(default_factory=RequestWindow)
+
+    def endpoint(self, endpoint: str) -> EndpointMetrics:
+        """Return the metrics for an endpoint, creating them if needed."""
+        if (metrics := self.endpoints.get(endpoint)) is None:
+            metrics = self.endpoints[endpoint] = EndpointMetrics()
+        return metrics
+
+    def total(self, name: str) -> int:
+        """Return a counter summed over all endpoints."""
+        return sum(getattr(metrics, name) for metrics in self.endpoints.values())
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return all metrics as a dictionary."""
+        return {
+            "endpoints": {
+                endpoint: metrics.as_dict()
+                for endpoint, metrics in self.endpoints.items()
+            },
+            "update_duration": self.update_duration.as_dict(),
+            "window": self.window.as_dict(),
+        }
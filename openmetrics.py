@@ -0,0 +1,111 @@
+"""OpenMetrics exposition of Jullix values."""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import web
+
+from homeassistant.components.http import KEY_HASS, HomeAssistantView
+from homeassistant.components.sensor import SensorStateClass
+
+from .const import DOMAIN, DSMR_SENSORS, INVERTER_SENSORS
+from .fields import iter_numeric_values
+
+if TYPE_CHECKING:
+    from . import JullixConfigEntry
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Keys reported as monotonic counters rather than gauges
+COUNTER_KEYS: frozenset[str] = frozenset(
+    desc.key
+    for desc in (*DSMR_SENSORS, *INVERTER_SENSORS)
+    if desc.state_class == SensorStateClass.TOTAL_INCREASING
+)
+
+_INVALID_NAME_CHARS = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def _escape_label(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class OpenMetricsBuffer:
+    """Precomputed OpenMetrics samples for one coordinator.
+
+    Samples are rebuilt when the coordinator data changes, so scrapes only
+    concatenate buffers and never touch the device.
+    """
+
+    def __init__(self, entry_id: str, host: str) -> None:
+        """Initialize the buffer."""
+        self._labels = (
+            f'entry_id="{_escape_label(entry_id)}",host="{_escape_label(host)}"'
+        )
+        self.generation = 0
+        # (family name, metric type, sample line)
+        self.samples: list[tuple[str, str, str]] = []
+
+    def update(self, data: dict[str, Any]) -> None:
+        """Rebuild the samples from coordinator data."""
+        samples: list[tuple[str, str, str]] = []
+        for device, key, value in iter_numeric_values(data):
+            family = _INVALID_NAME_CHARS.sub("_", f"{DOMAIN}_{device}_{key}").lower()
+            if key in COUNTER_KEYS:
+                samples.append(
+                    (family, "counter", f"{family}_total{{{self._labels}}} {value!r}")
+                )
+            else:
+                samples.append((family, "gauge", f"{family}{{{self._labels}}} {value!r}"))
+        self.samples = samples
+        self.generation += 1
+
+
+def render(buffers: list[OpenMetricsBuffer]) -> bytes:
+    """Render the samples of all buffers grouped per metric family."""
+    families: dict[str, tuple[str, list[str]]] = {}
+    for buffer in buffers:
+        for family, metric_type, line in buffer.samples:
+            if (entry := families.get(family)) is None:
+                entry = families[family] = (metric_type, [])
+            entry[1].append(line)
+
+    lines: list[str] = []
+    for family, (metric_type, samples) in families.items():
+        lines.append(f"# TYPE {family} {metric_type}")
+        lines.extend(samples)
+    lines.append("# EOF\n")
+    return "\n".join(lines).encode()
+
+
+class JullixOpenMetricsView(HomeAssistantView):
+    """Serve the latest Jullix values in OpenMetrics text format."""
+
+    url = f"/api/{DOMAIN}/metrics"
+    name = f"api:{DOMAIN}:metrics"
+
+    def __init__(self) -> None:
+        """Initialize the view."""
+        self._key: tuple[tuple[str, int], ...] | None = None
+        self._body = b""
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Handle a scrape."""
+        hass = request.app[KEY_HASS]
+        entries: list[JullixConfigEntry] = hass.config_entries.async_loaded_entries(
+            DOMAIN
+        )
+        buffers = [entry.runtime_data.openmetrics for entry in entries]
+
+        key = tuple(
+            (entry.entry_id, buffer.generation)
+            for entry, buffer in zip(entries, buffers, strict=True)
+        )
+        if key != self._key:
+            self._body = render(buffers)
+            self._key = key
+
+        return web.Response(body=self._body, headers={"Content-Type": CONTENT_TYPE})
@@ -0,0 +1,211 @@
+"""Streaming DSMR P1 telegram reader for Jullix Energy Management."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import logging
+import re
+from typing import Any
+
+from .const import P1_RECONNECT_INTERVAL
+
+_LOGGER = logging.getLogger(__name__)
+
+# COSEM object lines, e.g. "1-0:1.8.1(004380.460*kWh)" or the two value
+# M-Bus form "0-1:24.2.1(231017120000S)(01036.920*m3)"
+_OBIS_LINE = re.compile(rb"(\d+)-(\d+):(\d+\.\d+\.\d+)((?:\([^)\r\n]*\))+)")
+_OBIS_VALUE = re.compile(rb"\(([^)]*)\)")
+
+_READ_SIZE = 4096
+# Drop garbage if no telegram start/end is seen within this many bytes
+_MAX_BUFFER = 16384
+
+# M-Bus device types (0-n:24.1.0)
+_MBUS_GAS = 3
+_MBUS_WATER = 7
+
+
+def _crc16_table() -> tuple[int, ...]:
+    """Build the CRC16/ARC lookup table used by DSMR 4+ telegrams."""
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+        table.append(crc)
+    return tuple(table)
+
+
+_CRC16_TABLE = _crc16_table()
+
+
+def crc16(data: bytes | bytearray | memoryview) -> int:
+    """Return the CRC16/ARC checksum of data."""
+    crc = 0
+    table = _CRC16_TABLE
+    for byte in data:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc
+
+
+def _number(raw: bytes) -> float | None:
+    """Return the numeric part of a COSEM value like b'00.878*kW'."""
+    try:
+        return float(raw.partition(b"*")[0])
+    except ValueError:
+        return None
+
+
+class P1TelegramParser:
+    """Incremental parser for DSMR P1 telegrams.
+
+    Bytes are appended to a single buffer as they arrive. Telegrams are
+    validated and parsed in place, and only consumed bytes are dropped.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the parser."""
+        self._buffer = bytearray()
+        self.crc_errors = 0
+
+    def feed(self, data: bytes) -> list[dict[str, Any]]:
+        """Feed received bytes and return values of completed telegrams."""
+        buffer = self._buffer
+        buffer += data
+        results: list[dict[str, Any]] = []
+
+        while True:
+            start = buffer.find(b"/")
+            if start == -1:
+                buffer.clear()
+                break
+            end = buffer.find(b"!", start)
+            line_end = buffer.find(b"\r\n", end) if end != -1 else -1
+            if line_end == -1:
+                # Incomplete telegram, drop leading garbage and wait for more
+                if start:
+                    del buffer[:start]
+                if len(buffer) > _MAX_BUFFER:
+                    buffer.clear()
+                break
+
+            if self._crc_valid(buffer, start, end, line_end):
+                results.append(self._parse(buffer, start, end))
+            else:
+                self.crc_errors += 1
+                _LOGGER.debug("Discarding P1 telegram with invalid CRC")
+            del buffer[:line_end + 2]
+
+        return results
+
+    @staticmethod
+    def _crc_valid(buffer: bytearray, start: int, end: int, line_end: int) -> bool:
+        """Validate the telegram CRC. DSMR 2/3 telegrams carry no CRC."""
+        crc_text = buffer[end + 1 : line_end]
+        if not crc_text:
+            return True
+        try:
+            expected = int(crc_text, 16)
+        except ValueError:
+            return False
+        with memoryview(buffer) as view:
+            return crc16(view[start : end + 1]) == expected
+
+    @staticmethod
+    def _parse(buffer: bytearray, start: int, end: int) -> dict[str, Any]:
+        """Map the OBIS lines of one telegram onto DSMR sensor keys."""
+        objects: dict[tuple[bytes, bytes], list[bytes]] = {}
+        for match in _OBIS_LINE.finditer(buffer, start, end):
+            objects[(match.group(2), match.group(3))] = _OBIS_VALUE.findall(
+                match.group(4)
+            )
+
+        values: dict[str, Any] = {}
+
+        def _value(channel: bytes, code: bytes) -> float | None:
+            raw = objects.get((channel, code))
+            return _number(raw[-1]) if raw else None
+
+        delivered = _value(b"0", b"1.7.0")
+        returned = _value(b"0", b"2.7.0")
+        if delivered is not None:
+            values["power"] = delivered - (returned or 0.0)
+
+        for key, codes in (
+            ("energy-in", (b"1.8.1", b"1.8.2")),
+            ("energy-out", (b"2.8.1", b"2.8.2")),
+        ):
+            readings = [
+                reading
+                for code in codes
+                if (reading := _value(b"0", code)) is not None
+            ]
+            if readings:
+                values[key] = sum(readings)
+
+        # The meter ID (96.1.1) is left to the polled payload, as the device
+        # and unique IDs are keyed on the ID the Jullix box reports
+
+        # M-Bus channels carry gas and water meters
+        for (channel, code), raw in objects.items():
+            if code != b"24.1.0" or not raw:
+                continue
+            try:
+                device_type = int(raw[0])
+            except ValueError:
+                continue
+            key = {_MBUS_GAS: "gas", _MBUS_WATER: "water"}.get(device_type)
+            if key is not None and (reading := _value(channel, b"24.2.1")) is not None:
+                values[key] = reading
+
+        return {key: {"value": value} for key, value in values.items()}
+
+
+class P1StreamReader:
+    """Read DSMR telegrams from a raw P1 TCP stream (ser2net style)."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        telegram_callback: Callable[[dict[str, Any]], None],
+    ) -> None:
+        """Initialize the stream reader.
+
+        Args:
+            host: IP address or hostname of the P1 TCP bridge
+            port: TCP port of the P1 bridge
+            telegram_callback: Called with DSMR values of each valid telegram
+
+        """
+        self.host = host
+        self.port = port
+        self._telegram_callback = telegram_callback
+
+    async def run(self) -> None:
+        """Read telegrams until cancelled, reconnecting on errors."""
+        while True:
+            try:
+                await self._read_stream()
+            except OSError as err:
+                _LOGGER.debug(
+                    "P1 stream %s:%s failed: %s", self.host, self.port, err
+                )
+            await asyncio.sleep(P1_RECONNECT_INTERVAL)
+
+    async def _read_stream(self) -> None:
+        """Connect to the P1 stream and parse it until it closes."""
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        _LOGGER.debug("Connected to P1 stream %s:%s", self.host, self.port)
+        parser = P1TelegramParser()
+        try:
+            while data := await reader.read(_READ_SIZE):
+                for values in parser.feed(data):
+                    try:
+                        self._telegram_callback(values)
+                    except Exception:
+                        # Keep reading, a failing listener must not stop the stream
+                        _LOGGER.exception("Error handling P1 telegram")
+        finally:
+            writer.close()
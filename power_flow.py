@@ -0,0 +1,71 @@
+"""Instantaneous power flow decomposition for Jullix."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from .const import DEVICE_INVERTER, DEVICE_METER
+from .fields import get_numeric_value
+
+
+@dataclass(frozen=True, slots=True)
+class PowerFlows:
+    """Power flowing between solar, battery, grid and house in kW."""
+
+    house_load: float
+    solar_to_home: float
+    solar_to_battery: float
+    solar_to_grid: float
+    battery_to_home: float
+    battery_to_grid: float
+    grid_to_home: float
+    grid_to_battery: float
+
+
+def compute_power_flows(data: dict[str, Any]) -> PowerFlows | None:
+    """Decompose the power readings of one update into flows.
+
+    Grid power is positive when importing and battery power is negative when
+    charging. The meter reading is used for the grid when available, as it
+    also covers loads and production the inverter does not see. Solar power
+    is assigned to the house first, then to the battery and then to the grid.
+
+    Returns:
+        The flows, or None when solar or grid power is unknown
+
+    """
+    if not data.get("inverter", {}).get("running", False):
+        return None
+    pv_power = get_numeric_value(data, DEVICE_INVERTER, "pv_power")
+    grid_power = get_numeric_value(data, DEVICE_METER, "power")
+    if grid_power is None:
+        grid_power = get_numeric_value(data, DEVICE_INVERTER, "gridpower")
+    if pv_power is None or grid_power is None:
+        return None
+    battery_power = get_numeric_value(data, DEVICE_INVERTER, "battery_power") or 0.0
+
+    solar = max(pv_power, 0.0)
+    charge = max(-battery_power, 0.0)
+    discharge = max(battery_power, 0.0)
+    grid_import = max(grid_power, 0.0)
+    grid_export = max(-grid_power, 0.0)
+
+    house_load = max(solar + discharge + grid_import - charge - grid_export, 0.0)
+
+    solar_to_home = min(solar, house_load)
+    solar_to_battery = min(solar - solar_to_home, charge)
+    solar_to_grid = min(solar - solar_to_home - solar_to_battery, grid_export)
+    battery_to_home = min(discharge, house_load - solar_to_home)
+    battery_to_grid = max(min(discharge - battery_to_home, grid_export - solar_to_grid), 0.0)
+
+    return PowerFlows(
+        house_load=house_load,
+        solar_to_home=solar_to_home,
+        solar_to_battery=solar_to_battery,
+        solar_to_grid=solar_to_grid,
+        battery_to_home=battery_to_home,
+        battery_to_grid=battery_to_grid,
+        grid_to_home=max(house_load - solar_to_home - battery_to_home, 0.0),
+        grid_to_battery=max(charge - solar_to_battery, 0.0),
+    )
@@ -0,0 +1,121 @@
+"""Opt-in profiling of the Jullix coordinator update cycle."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+import cProfile
+import io
+import logging
+import pstats
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+# Number of functions listed in the cProfile section of the report
+REPORT_FUNCTIONS = 40
+
+
+def listener_name(update_callback: Callable[[], None]) -> str:
+    """Return a readable name for a coordinator listener."""
+    owner = getattr(update_callback, "__self__", None)
+    if owner is None:
+        return getattr(update_callback, "__qualname__", repr(update_callback))
+    if entity_id := getattr(owner, "entity_id", None):
+        return f"{entity_id} ({type(owner).__name__})"
+    return type(owner).__name__
+
+
+class CycleProfiler:
+    """Profile a number of coordinator update cycles.
+
+    Wall time is recorded per phase and per listener, and cProfile collects
+    function level statistics while a synchronous phase runs.
+    """
+
+    def __init__(self, cycles: int, path: str) -> None:
+        """Initialize the profiler.
+
+        Args:
+            cycles: Number of update cycles to profile
+            path: File the report is written to
+
+        """
+        self.cycles = cycles
+        self.path = path
+        self.completed = 0
+        self._phases: dict[str, list[float]] = defaultdict(list)
+        self._listeners: dict[str, list[float]] = defaultdict(list)
+        self._profile: cProfile.Profile | None = cProfile.Profile()
+        self._profiled = False
+
+    @contextmanager
+    def phase(self, name: str, *, profile: bool = True) -> Iterator[None]:
+        """Time a phase of the update cycle.
+
+        Phases that await must pass profile=False, as cProfile would also
+        collect every other task that runs on the event loop meanwhile.
+        """
+        profile = self._profile if profile else None
+        if profile is not None:
+            try:
+                profile.enable()
+                self._profiled = True
+            except ValueError:
+                # Another profiler is active, fall back to timing only
+                _LOGGER.debug("cProfile unavailable, only recording timings")
+                profile = self._profile = None
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._phases[name].append(time.perf_counter() - start)
+            if profile is not None:
+                profile.disable()
+
+    def record_listener(self, name: str, duration: float) -> None:
+        """Record the time spent in a single listener."""
+        self._listeners[name].append(duration)
+
+    def finish_cycle(self) -> bool:
+        """Mark a cycle as completed and return True when profiling is done."""
+        self.completed += 1
+        return self.completed >= self.cycles
+
+    def report(self) -> str:
+        """Return the profiling report as text."""
+        lines = [f"Jullix coordinator profile, {self.completed} update cycles", ""]
+
+        lines.extend(self._table("Phase", self._phases))
+        lines.append("")
+        lines.extend(self._table("Listener", self._listeners))
+
+        if self._profile is not None and self._profiled:
+            stream = io.StringIO()
+            stats = pstats.Stats(self._profile, stream=stream)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(REPORT_FUNCTIONS)
+            lines.extend(("", stream.getvalue()))
+
+        return "\n".join(lines)
+
+    @staticmethod
+    def _table(title: str, timings: dict[str, list[float]]) -> list[str]:
+        """Format timings as total, mean and max milliseconds per name."""
+        lines = [
+            f"{title:<60} {'calls':>6} {'total ms':>10} {'mean ms':>10} {'max ms':>10}"
+        ]
+        for name, durations in sorted(
+            timings.items(), key=lambda item: sum(item[1]), reverse=True
+        ):
+            total = sum(durations) * 1000
+            lines.append(
+                f"{name:<60} {len(durations):>6} {total:>10.3f} "
+                f"{total / len(durations):>10.3f} {max(durations) * 1000:>10.3f}"
+            )
+        return lines
+
+    def write_report(self) -> None:
+        """Write the report to disk. Must run in the executor."""
+        with open(self.path, "w", encoding="utf-8") as report_file:
+            report_file.write(self.report())
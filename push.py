@@ -0,0 +1,71 @@
+"""Push ingestion webhook for Jullix Energy Management."""
+
+from __future__ import annotations
+
+from http import HTTPStatus
+import logging
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import hdrs, web
+
+from homeassistant.components import webhook
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from . import JullixConfigEntry, JullixCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def is_valid_payload(payload: Any) -> bool:
+    """Return True if payload has the shape returned by get_all_data."""
+    return (
+        isinstance(payload, dict)
+        and isinstance(payload.get("dsmr"), dict)
+        and isinstance(payload.get("inverter"), dict)
+        and isinstance(payload["inverter"].get("data", {}), dict)
+    )
+
+
+@callback
+def async_setup_push(
+    hass: HomeAssistant,
+    entry: JullixConfigEntry,
+    coordinator: JullixCoordinator,
+) -> None:
+    """Register the push webhook for a config entry."""
+    webhook_id = entry.options[CONF_WEBHOOK_ID]
+
+    async def _async_handle_webhook(
+        hass: HomeAssistant, webhook_id: str, request: web.Request
+    ) -> web.Response | None:
+        """Handle a pushed Jullix payload."""
+        try:
+            payload = await request.json()
+        except ValueError:
+            _LOGGER.warning("Received invalid JSON on Jullix webhook %s", webhook_id)
+            return web.Response(status=HTTPStatus.BAD_REQUEST)
+
+        if not is_valid_payload(payload):
+            _LOGGER.warning(
+                "Received payload without 'dsmr' and 'inverter' on Jullix webhook %s",
+                webhook_id,
+            )
+            return web.Response(status=HTTPStatus.BAD_REQUEST)
+
+        coordinator.async_push_data(payload)
+        return None
+
+    webhook.async_register(
+        hass,
+        DOMAIN,
+        entry.title,
+        webhook_id,
+        _async_handle_webhook,
+        local_only=True,
+        allowed_methods=[hdrs.METH_POST],
+    )
+    entry.async_on_unload(lambda: webhook.async_unregister(hass, webhook_id))
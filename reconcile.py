@@ -0,0 +1,77 @@
+"""Reconciliation of integrated energy with device counters."""
+
+from __future__ import annotations
+
+from .const import RECONCILE_MAX_CORRECTION, RECONCILE_MAX_RATIO
+
+
+class CounterReconciler:
+    """Correct an integrated energy total against a cumulative device counter.
+
+    Between counter changes the integrated increments fill the gap. When the
+    counter advances, the energy integrated since its previous change is
+    compared with the counter difference and the total is corrected by the
+    error, bounded to RECONCILE_MAX_CORRECTION of the counter difference.
+    As the total must never decrease, negative corrections are taken from
+    the following increments instead. Counter changes more than
+    RECONCILE_MAX_RATIO times the integrated energy, such as a counter
+    reported in Wh, are implausible and only start a new baseline.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the reconciler."""
+        self._last_counter: float | None = None
+        self._integrated = 0.0
+        self._deferred = 0.0
+        self.corrections = 0.0
+        self.rejected = 0
+
+    @property
+    def active(self) -> bool:
+        """Return True once a device counter has been seen."""
+        return self._last_counter is not None
+
+    def integrate(self, increment: float) -> float:
+        """Record an integrated increment.
+
+        Returns:
+            The increment to add to the total, less deferred corrections
+
+        """
+        self._integrated += increment
+        if self._deferred < 0:
+            taken = max(self._deferred, -increment)
+            self._deferred -= taken
+            increment += taken
+        return increment
+
+    def reconcile(self, counter: float) -> float:
+        """Compare a counter reading with the integrated energy.
+
+        Returns:
+            The non-negative correction to add to the total
+
+        """
+        last_counter = self._last_counter
+        self._last_counter = counter
+        if last_counter is None or counter < last_counter:
+            # First reading or counter reset, start a new baseline
+            self._integrated = 0.0
+            return 0.0
+        if counter == last_counter:
+            return 0.0
+
+        counter_delta = counter - last_counter
+        if counter_delta > self._integrated * RECONCILE_MAX_RATIO:
+            self._integrated = 0.0
+            self.rejected += 1
+            return 0.0
+
+        limit = counter_delta * RECONCILE_MAX_CORRECTION
+        correction = min(max(counter_delta - self._integrated, -limit), limit)
+        self._integrated = 0.0
+        self.corrections += correction
+        if correction < 0:
+            self._deferred += correction
+            return 0.0
+        return correction
@@ -0,0 +1,214 @@
+"""Recording and replay of raw Jullix device responses."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
+import gzip
+import json
+import logging
+import time
+from typing import IO, TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.util import dt as dt_util
+
+from .api import JullixApiClient, JullixApiError
+from .const import RECORD_FLUSH_INTERVAL, REPLAY_READ_SIZE
+
+if TYPE_CHECKING:
+    from . import JullixCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ResponseRecorder:
+    """Append raw responses of an API client to a gzip compressed JSON lines file.
+
+    Responses are buffered in memory and written in the executor every
+    RECORD_FLUSH_INTERVAL. Each write appends a gzip member, which gzip
+    readers handle as one continuous stream.
+    """
+
+    def __init__(self, hass: HomeAssistant, client: JullixApiClient, path: str) -> None:
+        """Initialize the recorder."""
+        self._hass = hass
+        self._client = client
+        self.path = path
+        self._pending: list[bytes] = []
+        self._lock = asyncio.Lock()
+        self._unsubs: list[Callable[[], None]] = []
+
+    def record(self, endpoint: str, body: bytes) -> None:
+        """Buffer a raw response body."""
+        record = {
+            "time": time.time(),
+            "endpoint": endpoint,
+            "body": body.decode("utf-8", "replace"),
+        }
+        self._pending.append(json.dumps(record).encode() + b"\n")
+
+    @callback
+    def async_start(self, duration: float) -> Callable[[], None]:
+        """Start recording the responses of the client.
+
+        Args:
+            duration: Seconds after which recording stops
+
+        Returns:
+            Callback that stops the recording
+
+        """
+        self._client.recorder = self
+        self._unsubs = [
+            async_track_time_interval(
+                self._hass, self._async_flush, RECORD_FLUSH_INTERVAL, cancel_on_shutdown=True
+            ),
+            async_call_later(self._hass, duration, self._async_finish),
+        ]
+        return self.async_stop
+
+    @callback
+    def _async_finish(self, _now: datetime) -> None:
+        """Stop recording once the duration passed."""
+        self.async_stop()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop recording and write the remaining responses."""
+        if self._client.recorder is not self:
+            return
+        self._client.recorder = None
+        for unsub in self._unsubs:
+            unsub()
+        self._hass.async_create_background_task(
+            self._async_flush(), f"jullix_record_flush_{self.path}"
+        )
+        _LOGGER.info("Stopped recording Jullix responses to %s", self.path)
+
+    async def _async_flush(self, _now: datetime | None = None) -> None:
+        """Write the buffered responses."""
+        async with self._lock:
+            lines, self._pending = self._pending, []
+            if lines:
+                await self._hass.async_add_executor_job(self._write, lines)
+
+    def _write(self, lines: list[bytes]) -> None:
+        """Append lines to the file. Must run in the executor."""
+        with gzip.open(self.path, "ab") as record_file:
+            record_file.writelines(lines)
+
+
+@dataclass(frozen=True, slots=True)
+class ReplaySample:
+    """Raw response bodies of one poll of both endpoints."""
+
+    time: float
+    bodies: dict[str, str]
+
+
+class ReplaySource:
+    """Stream samples from a recorded file.
+
+    Lines are read in batches in the executor. Responses are grouped into a
+    sample until an endpoint repeats, and endpoints missing from a sample
+    keep their previous response, like a failed poll would.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: str) -> None:
+        """Initialize the replay source."""
+        self._hass = hass
+        self.path = path
+
+    async def async_samples(self) -> AsyncIterator[ReplaySample]:
+        """Yield the recorded samples in order."""
+        hass = self._hass
+        replay_file: IO[str] = await hass.async_add_executor_job(
+            partial(gzip.open, self.path, "rt", encoding="utf-8")
+        )
+        bodies: dict[str, str] = {}
+        seen: set[str] = set()
+        sample_time = 0.0
+        try:
+            while lines := await hass.async_add_executor_job(
+                replay_file.readlines, REPLAY_READ_SIZE
+            ):
+                for line in lines:
+                    record = json.loads(line)
+                    if record["endpoint"] in seen:
+                        yield ReplaySample(sample_time, dict(bodies))
+                        seen.clear()
+                    bodies[record["endpoint"]] = record["body"]
+                    seen.add(record["endpoint"])
+                    sample_time = record["time"]
+        finally:
+            await hass.async_add_executor_job(replay_file.close)
+        if seen:
+            yield ReplaySample(sample_time, dict(bodies))
+
+
+class JullixReplayClient(JullixApiClient):
+    """API client answering requests from the current replay sample."""
+
+    def __init__(self, host: str) -> None:
+        """Initialize the replay client."""
+        super().__init__(host, None)  # type: ignore[arg-type]
+        self.sample: ReplaySample | None = None
+
+    async def _request(self, endpoint: str) -> dict[str, Any]:
+        """Return the recorded response of an endpoint."""
+        if self.sample is None or (body := self.sample.bodies.get(endpoint)) is None:
+            raise JullixApiError(f"No recorded response for {endpoint}")
+        try:
+            return json.loads(body)
+        except ValueError as err:
+            raise JullixApiError(f"Invalid JSON recorded for {endpoint}") from err
+
+    async def get_all_data(self) -> dict[str, Any]:
+        """Return the responses of the current sample."""
+        if self.sample is None:
+            raise JullixApiError("No replay sample")
+        return await super().get_all_data()
+
+
+async def async_replay(
+    coordinator: JullixCoordinator, source: ReplaySource, speed: float
+) -> int:
+    """Replay recorded samples through a coordinator.
+
+    Every sample is fetched through a full coordinator refresh, so entities
+    update as if the device had been polled, with the recorded time in the
+    replay_time of the coordinator. Polling of the device pauses meanwhile
+    and resumes with a refresh afterwards.
+
+    Args:
+        coordinator: Coordinator to replay into
+        source: Recorded samples
+        speed: Replay speed relative to real time, 0 replays without delays
+
+    Returns:
+        Number of replayed samples
+
+    """
+    replay_client = JullixReplayClient(coordinator.client.host)
+    samples = 0
+    previous: float | None = None
+    try:
+        with coordinator.replay(replay_client):
+            async for sample in source.async_samples():
+                if speed and previous is not None:
+                    await asyncio.sleep(max(sample.time - previous, 0) / speed)
+                previous = sample.time
+                replay_client.sample = sample
+                coordinator.replay_time = dt_util.utc_from_timestamp(sample.time)
+                await coordinator.async_refresh()
+                samples += 1
+    finally:
+        # Entities return to live data and the polling schedule restarts
+        await coordinator.async_refresh()
+    _LOGGER.info("Replayed %s samples from %s", samples, source.path)
+    return samples
@@ -0,0 +1,160 @@
+"""Schema inference for fields the integration does not describe."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+from homeassistant.const import (
+    PERCENTAGE,
+    UnitOfElectricCurrent,
+    UnitOfElectricPotential,
+    UnitOfEnergy,
+    UnitOfFrequency,
+    UnitOfPower,
+    UnitOfTemperature,
+    UnitOfVolume,
+)
+
+from .const import (
+    BATTERY_COUNTER_KEYS,
+    DEVICE_INVERTER,
+    DEVICE_METER,
+    DSMR_SENSORS,
+    INVERTER_SENSORS,
+    OPTIONAL_INVERTER_KEYS,
+)
+from .fields import iter_numeric_values
+
+# Keys already covered by a sensor description or a battery energy sensor
+KNOWN_KEYS: frozenset[tuple[str, str]] = frozenset(
+    {(DEVICE_METER, desc.key) for desc in DSMR_SENSORS}
+    | {(DEVICE_INVERTER, desc.key) for desc in INVERTER_SENSORS}
+    | {
+        (DEVICE_INVERTER, key)
+        for keys in BATTERY_COUNTER_KEYS.values()
+        for key in keys
+    }
+)
+
+# Device class and state class per unit, counters are monotonic
+UNIT_CLASSES: dict[str, tuple[SensorDeviceClass | None, SensorStateClass]] = {
+    UnitOfPower.WATT: (SensorDeviceClass.POWER, SensorStateClass.MEASUREMENT),
+    UnitOfPower.KILO_WATT: (SensorDeviceClass.POWER, SensorStateClass.MEASUREMENT),
+    UnitOfEnergy.WATT_HOUR: (
+        SensorDeviceClass.ENERGY,
+        SensorStateClass.TOTAL_INCREASING,
+    ),
+    UnitOfEnergy.KILO_WATT_HOUR: (
+        SensorDeviceClass.ENERGY,
+        SensorStateClass.TOTAL_INCREASING,
+    ),
+    UnitOfElectricPotential.VOLT: (
+        SensorDeviceClass.VOLTAGE,
+        SensorStateClass.MEASUREMENT,
+    ),
+    UnitOfElectricCurrent.AMPERE: (
+        SensorDeviceClass.CURRENT,
+        SensorStateClass.MEASUREMENT,
+    ),
+    UnitOfFrequency.HERTZ: (SensorDeviceClass.FREQUENCY, SensorStateClass.MEASUREMENT),
+    UnitOfTemperature.CELSIUS: (
+        SensorDeviceClass.TEMPERATURE,
+        SensorStateClass.MEASUREMENT,
+    ),
+    UnitOfVolume.CUBIC_METERS: (None, SensorStateClass.TOTAL_INCREASING),
+    PERCENTAGE: (None, SensorStateClass.MEASUREMENT),
+}
+
+# Units guessed from key names, checked in order, for payloads without units
+KEY_UNITS: tuple[tuple[str, str], ...] = (
+    ("energy", UnitOfEnergy.KILO_WATT_HOUR),
+    ("power", UnitOfPower.KILO_WATT),
+    ("voltage", UnitOfElectricPotential.VOLT),
+    ("current", UnitOfElectricCurrent.AMPERE),
+    ("freq", UnitOfFrequency.HERTZ),
+    ("temp", UnitOfTemperature.CELSIUS),
+    ("soc", PERCENTAGE),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class InferredField:
+    """Sensor properties inferred for a numeric field."""
+
+    device: str
+    key: str
+    name: str
+    unit: str | None
+    device_class: SensorDeviceClass | None
+    state_class: SensorStateClass
+
+
+def infer_field(device: str, key: str, item: Any = None) -> InferredField:
+    """Infer the sensor properties of a numeric field.
+
+    Args:
+        device: Device the field belongs to
+        key: Key of the field in the payload
+        item: DSMR item carrying a title and units, if any
+
+    """
+    title = item.get("title") if isinstance(item, dict) else None
+    unit = (item.get("units") or None) if isinstance(item, dict) else None
+    if unit is None:
+        lower_key = key.lower()
+        unit = next((unit for part, unit in KEY_UNITS if part in lower_key), None)
+
+    device_class, state_class = UNIT_CLASSES.get(unit, (None, SensorStateClass.MEASUREMENT))
+    if device_class is None and unit == PERCENTAGE and "soc" in key.lower():
+        device_class = SensorDeviceClass.BATTERY
+
+    return InferredField(
+        device=device,
+        key=key,
+        name=title or key.replace("_", " ").replace("-", " ").capitalize(),
+        unit=unit,
+        device_class=device_class,
+        state_class=state_class,
+    )
+
+
+class PayloadSchema:
+    """Cache of the fields found in payloads that have no sensor description.
+
+    The key sets of the last payload are kept, so fields are only inferred
+    again when the firmware starts reporting a different set of keys. The
+    described optional inverter keys reported so far are collected as well.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the schema."""
+        self.fields: dict[tuple[str, str], InferredField] = {}
+        self.optional_keys: set[str] = set()
+        self._dsmr_keys: frozenset[str] = frozenset()
+        self._inverter_keys: frozenset[str] = frozenset()
+
+    def update(self, data: dict[str, Any]) -> list[InferredField]:
+        """Validate the schema against a payload.
+
+        Returns:
+            Fields seen for the first time
+
+        """
+        dsmr = data.get("dsmr", {})
+        inverter_data = data.get("inverter", {}).get("data", {})
+        if dsmr.keys() == self._dsmr_keys and inverter_data.keys() == self._inverter_keys:
+            return []
+        self._dsmr_keys = frozenset(dsmr)
+        self._inverter_keys = frozenset(inverter_data)
+        self.optional_keys.update(OPTIONAL_INVERTER_KEYS.intersection(inverter_data))
+
+        new_fields: list[InferredField] = []
+        for device, key, _ in iter_numeric_values(data):
+            if (device, key) in KNOWN_KEYS or (device, key) in self.fields:
+                continue
+            field = infer_field(device, key, dsmr.get(key) if device == DEVICE_METER else None)
+            self.fields[(device, key)] = field
+            new_fields.append(field)
+        return new_fields
@@ -2,38 +2,267 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import cache, partial
+from operator import attrgetter
 from typing import Any
 
 from homeassistant.components.sensor import (
     RestoreSensor,
     SensorEntity,
     SensorEntityDescription,
+    SensorStateClass,
 )
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 
 from . import JullixConfigEntry, JullixCoordinator
+from .battery_forecast import BatteryForecast
 from .const import (
+    API_DSMR_STATUS,
+    API_INVERTER_STATUS,
+    BATTERY_COUNTER_KEYS,
+    BATTERY_ENERGY_MAX_GAP,
     BATTERY_ENERGY_SENSORS,
+    BATTERY_FORECAST_SENSORS,
+    CONF_LONG_TERM_STATISTICS,
     DEVICE_INVERTER,
     DEVICE_METER,
-    DOMAIN,
+    DIAGNOSTIC_SENSORS,
     DSMR_SENSORS,
+    ENERGY_BALANCE_SENSORS,
     INVERTER_SENSORS,
+    OPTIONAL_INVERTER_KEYS,
+    POWER_FLOW_SENSORS,
+    SIGNAL_NEW_FIELDS,
+    SIGNAL_NEW_OPTIONAL_KEYS,
 )
+from .energy_balance import PERIODS, EnergyBalance
+from .entity import JullixBatchedEntity
+from .fields import SENSOR_FIELDS, get_numeric_value
+from .metrics import JullixMetrics, LatencyHistogram
+from .power_flow import PowerFlows
+from .reconcile import CounterReconciler
+from .schema import InferredField
+
+
+def _milliseconds(histogram: LatencyHistogram) -> float | None:
+    """Return the last duration of a histogram in milliseconds."""
+    return histogram.last * 1000 if histogram.last is not None else None
+
+
+# Value functions for the diagnostic metric sensors
+METRIC_VALUE_FNS: dict[str, Callable[[JullixMetrics], float | int | None]] = {
+    "dsmr_request_latency": lambda metrics: _milliseconds(
+        metrics.endpoint(API_DSMR_STATUS).latency
+    ),
+    "inverter_request_latency": lambda metrics: _milliseconds(
+        metrics.endpoint(API_INVERTER_STATUS).latency
+    ),
+    "update_duration": lambda metrics: _milliseconds(metrics.update_duration),
+    "request_timeouts": lambda metrics: metrics.total("timeouts"),
+    "connection_errors": lambda metrics: metrics.total("connection_errors"),
+    "http_errors": lambda metrics: metrics.total("http_errors"),
+    "response_bytes": lambda metrics: metrics.total("response_bytes"),
+}
+
+# Attribute functions exposing the full histogram or per-endpoint breakdown
+METRIC_ATTRIBUTES_FNS: dict[str, Callable[[JullixMetrics], dict[str, Any]]] = {
+    "dsmr_request_latency": lambda metrics: metrics.endpoint(
+        API_DSMR_STATUS
+    ).latency.as_dict(),
+    "inverter_request_latency": lambda metrics: metrics.endpoint(
+        API_INVERTER_STATUS
+    ).latency.as_dict(),
+    "update_duration": lambda metrics: metrics.update_duration.as_dict(),
+}
+
+# Value functions for the battery forecast sensors
+FORECAST_VALUE_FNS: dict[str, Callable[[BatteryForecast], float | None]] = {
+    "battery_time_to_full": lambda forecast: forecast.minutes_to_full,
+    "battery_time_to_empty": lambda forecast: forecast.minutes_to_empty,
+}
+
+# Value functions for the energy balance sensors, keyed by ratio and period
+ENERGY_BALANCE_VALUE_FNS: dict[str, Callable[[EnergyBalance], float | None]] = {
+    f"{ratio}_{period}": lambda balance, ratio=ratio, period=period: getattr(
+        balance.periods[period], ratio
+    )
+    for ratio in ("self_consumption", "self_sufficiency")
+    for period in PERIODS
+}
 
 
 @dataclass(frozen=True, kw_only=True)
 class JullixSensorEntityDescription(SensorEntityDescription):
-    """Describes Jullix sensor entity."""
+    """Describes Jullix sensor entity.
+
+    Sensors with a field read their value from the coordinator's field table,
+    others call value_fn with the coordinator data.
+    """
+
+    value_fn: Callable[[dict[str, Any]], float | int | str | None] | None = None
+    field: tuple[str, str] | None = None
+
+
+@cache
+def _discovered_description(field: InferredField) -> JullixSensorEntityDescription:
+    """Return a disabled by default description for a discovered field.
+
+    The key is prefixed, so the unique IDs of discovered fields can never
+    collide with those of described or derived sensors.
+    """
+    return JullixSensorEntityDescription(
+        key=f"field_{field.key}",
+        name=field.name,
+        device_class=field.device_class,
+        state_class=field.state_class,
+        native_unit_of_measurement=field.unit,
+        entity_registry_enabled_default=False,
+        value_fn=partial(get_numeric_value, device=field.device, key=field.key),
+    )
+
+
+@dataclass(frozen=True, kw_only=True)
+class JullixMetricSensorEntityDescription(SensorEntityDescription):
+    """Describes Jullix diagnostic metric sensor entity."""
+
+    value_fn: Callable[[JullixMetrics], float | int | None]
+    attributes_fn: Callable[[JullixMetrics], dict[str, Any]] | None = None
+
+
+@dataclass(frozen=True, kw_only=True)
+class JullixForecastSensorEntityDescription(SensorEntityDescription):
+    """Describes Jullix battery forecast sensor entity."""
+
+    value_fn: Callable[[BatteryForecast], float | None]
 
-    value_fn: Callable[[dict[str, Any]], float | int | str | None]
+
+@dataclass(frozen=True, kw_only=True)
+class JullixPowerFlowSensorEntityDescription(SensorEntityDescription):
+    """Describes Jullix power flow sensor entity."""
+
+    value_fn: Callable[[PowerFlows], float]
+
+
+@dataclass(frozen=True, kw_only=True)
+class JullixEnergyBalanceSensorEntityDescription(SensorEntityDescription):
+    """Describes Jullix energy balance sensor entity."""
+
+    period: str
+    value_fn: Callable[[EnergyBalance], float | None]
+
+
+def _field_description(
+    desc: SensorEntityDescription, device: str, long_term_statistics: bool
+) -> JullixSensorEntityDescription:
+    """Return the description of a sensor reading a field."""
+    state_class = desc.state_class
+    if long_term_statistics and state_class == SensorStateClass.MEASUREMENT:
+        # Hourly statistics are imported by the coordinator instead
+        state_class = None
+    return JullixSensorEntityDescription(
+        key=desc.key,
+        translation_key=desc.translation_key,
+        name=desc.name,
+        device_class=desc.device_class,
+        state_class=state_class,
+        native_unit_of_measurement=desc.native_unit_of_measurement,
+        suggested_display_precision=desc.suggested_display_precision,
+        entity_registry_enabled_default=desc.entity_registry_enabled_default,
+        field=(device, desc.key),
+    )
+
+
+@cache
+def _field_descriptions(
+    long_term_statistics: bool,
+) -> tuple[JullixSensorEntityDescription, ...]:
+    """Return the meter and inverter sensor descriptions, shared by all entries.
+
+    Args:
+        long_term_statistics: Leave measurements to the imported statistics
+
+    """
+    return (
+        *(
+            _field_description(desc, DEVICE_METER, long_term_statistics)
+            for desc in DSMR_SENSORS
+        ),
+        *(
+            _field_description(desc, DEVICE_INVERTER, long_term_statistics)
+            for desc in INVERTER_SENSORS
+        ),
+    )
+
+
+# Diagnostic metric sensor descriptions with value functions
+METRIC_SENSOR_DESCRIPTIONS: tuple[JullixMetricSensorEntityDescription, ...] = tuple(
+    JullixMetricSensorEntityDescription(
+        key=desc.key,
+        translation_key=desc.translation_key,
+        name=desc.name,
+        device_class=desc.device_class,
+        state_class=desc.state_class,
+        native_unit_of_measurement=desc.native_unit_of_measurement,
+        suggested_display_precision=desc.suggested_display_precision,
+        entity_category=desc.entity_category,
+        entity_registry_enabled_default=desc.entity_registry_enabled_default,
+        value_fn=METRIC_VALUE_FNS[desc.key],
+        attributes_fn=METRIC_ATTRIBUTES_FNS.get(desc.key),
+    )
+    for desc in DIAGNOSTIC_SENSORS
+)
+
+# Battery forecast sensor descriptions with value functions
+FORECAST_SENSOR_DESCRIPTIONS: tuple[JullixForecastSensorEntityDescription, ...] = tuple(
+    JullixForecastSensorEntityDescription(
+        key=desc.key,
+        translation_key=desc.translation_key,
+        name=desc.name,
+        device_class=desc.device_class,
+        native_unit_of_measurement=desc.native_unit_of_measurement,
+        suggested_display_precision=desc.suggested_display_precision,
+        value_fn=FORECAST_VALUE_FNS[desc.key],
+    )
+    for desc in BATTERY_FORECAST_SENSORS
+)
+
+# Power flow sensor descriptions with value functions
+POWER_FLOW_SENSOR_DESCRIPTIONS: tuple[JullixPowerFlowSensorEntityDescription, ...] = tuple(
+    JullixPowerFlowSensorEntityDescription(
+        key=desc.key,
+        translation_key=desc.translation_key,
+        name=desc.name,
+        device_class=desc.device_class,
+        state_class=desc.state_class,
+        native_unit_of_measurement=desc.native_unit_of_measurement,
+        suggested_display_precision=desc.suggested_display_precision,
+        value_fn=attrgetter(desc.key),
+    )
+    for desc in POWER_FLOW_SENSORS
+)
+
+# Energy balance sensor descriptions with value functions
+ENERGY_BALANCE_SENSOR_DESCRIPTIONS: tuple[
+    JullixEnergyBalanceSensorEntityDescription, ...
+] = tuple(
+    JullixEnergyBalanceSensorEntityDescription(
+        key=desc.key,
+        translation_key=desc.translation_key,
+        name=desc.name,
+        native_unit_of_measurement=desc.native_unit_of_measurement,
+        suggested_display_precision=desc.suggested_display_precision,
+        period=desc.key.rsplit("_", 1)[1],
+        value_fn=ENERGY_BALANCE_VALUE_FNS[desc.key],
+    )
+    for desc in ENERGY_BALANCE_SENSORS
+)
 
 
 async def async_setup_entry(
@@ -44,64 +273,101 @@ async def async_setup_entry(
     """Set up Jullix sensor entities."""
     coordinator = entry.runtime_data
 
-    # Create DSMR sensor descriptions with value functions
-    dsmr_sensor_descriptions = [
-        JullixSensorEntityDescription(
-            key=desc.key,
-            translation_key=desc.translation_key,
-            name=desc.name,
-            device_class=desc.device_class,
-            state_class=desc.state_class,
-            native_unit_of_measurement=desc.native_unit_of_measurement,
-            suggested_display_precision=desc.suggested_display_precision,
-            entity_registry_enabled_default=desc.entity_registry_enabled_default,
-            value_fn=lambda data, key=desc.key: (
-                data.get("dsmr", {}).get(key, {}).get("value")
-            ),
-        )
-        for desc in DSMR_SENSORS
+    # Create meter and inverter sensor entities
+    field_descriptions = _field_descriptions(
+        entry.options.get(CONF_LONG_TERM_STATISTICS, False)
+    )
+    entities: list[SensorEntity] = [
+        JullixSensor(coordinator, description, description.field[0])
+        for description in field_descriptions
+        if description.key not in OPTIONAL_INVERTER_KEYS
     ]
 
-    # Create inverter sensor descriptions with value functions
-    inverter_sensor_descriptions = [
-        JullixSensorEntityDescription(
-            key=desc.key,
-            translation_key=desc.translation_key,
-            name=desc.name,
-            device_class=desc.device_class,
-            state_class=desc.state_class,
-            native_unit_of_measurement=desc.native_unit_of_measurement,
-            suggested_display_precision=desc.suggested_display_precision,
-            entity_registry_enabled_default=desc.entity_registry_enabled_default,
-            value_fn=lambda data, key=desc.key: (
-                data.get("inverter", {}).get("data", {}).get(key)
-            ),
-        )
-        for desc in INVERTER_SENSORS
-    ]
+    # Further phases and PV strings only exist on some inverters, they are
+    # created once reported, which may be after setup for a sleeping inverter
+    optional_descriptions = {
+        description.key: description
+        for description in field_descriptions
+        if description.key in OPTIONAL_INVERTER_KEYS
+    }
+    added_optional_keys: set[str] = set()
+
+    def _optional_sensors() -> list[JullixSensor]:
+        """Return sensors for the optional keys reported since the last call."""
+        new_keys = coordinator.schema.optional_keys - added_optional_keys
+        added_optional_keys.update(new_keys)
+        return [
+            JullixSensor(coordinator, optional_descriptions[key], DEVICE_INVERTER)
+            for key in sorted(new_keys)
+        ]
+
+    entities.extend(_optional_sensors())
 
-    # Create DSMR sensor entities
-    entities: list[JullixSensor] = [
-        JullixSensor(coordinator, description, DEVICE_METER)
-        for description in dsmr_sensor_descriptions
-    ]
+    # Create battery energy tracking sensors
+    entities.extend(
+        BatteryEnergySensor(coordinator, description)
+        for description in BATTERY_ENERGY_SENSORS
+    )
 
-    # Create inverter sensor entities
+    # Create battery forecast sensors
     entities.extend(
-        JullixSensor(coordinator, description, DEVICE_INVERTER)
-        for description in inverter_sensor_descriptions
+        JullixBatteryForecastSensor(coordinator, description)
+        for description in FORECAST_SENSOR_DESCRIPTIONS
     )
 
-    # Create battery energy tracking sensors
+    # Create power flow sensors
     entities.extend(
-        BatteryEnergySensor(coordinator, description)
-        for description in BATTERY_ENERGY_SENSORS
+        JullixPowerFlowSensor(coordinator, description)
+        for description in POWER_FLOW_SENSOR_DESCRIPTIONS
+    )
+
+    # Create energy balance sensors
+    entities.extend(
+        JullixEnergyBalanceSensor(coordinator, description)
+        for description in ENERGY_BALANCE_SENSOR_DESCRIPTIONS
+    )
+
+    # Create diagnostic metric sensors
+    entities.extend(
+        JullixMetricSensor(coordinator, description)
+        for description in METRIC_SENSOR_DESCRIPTIONS
+    )
+
+    # Create disabled sensors for fields without a description
+    entities.extend(
+        JullixSensor(coordinator, _discovered_description(field), field.device)
+        for field in coordinator.schema.fields.values()
     )
 
     async_add_entities(entities)
 
+    @callback
+    def _async_add_discovered(fields: list[InferredField]) -> None:
+        """Add sensors for fields that appeared in a later payload."""
+        async_add_entities(
+            JullixSensor(coordinator, _discovered_description(field), field.device)
+            for field in fields
+        )
+
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_NEW_FIELDS.format(entry.entry_id), _async_add_discovered
+        )
+    )
+
+    @callback
+    def _async_add_optional() -> None:
+        """Add sensors for optional keys that appeared in a later payload."""
+        async_add_entities(_optional_sensors())
+
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_NEW_OPTIONAL_KEYS.format(entry.entry_id), _async_add_optional
+        )
+    )
+
 
-class JullixSensor(CoordinatorEntity[JullixCoordinator], SensorEntity):
+class JullixSensor(JullixBatchedEntity, SensorEntity):
     """Representation of a Jullix sensor."""
 
     entity_description: JullixSensorEntityDescription
@@ -117,70 +383,182 @@ class JullixSensor(CoordinatorEntity[JullixCoordinator], SensorEntity):
         super().__init__(coordinator)
         self.entity_description = description
         self._device_type = device_type
+        self._field_index = (
+            SENSOR_FIELDS.index[description.field] if description.field else None
+        )
 
-        # Set unique ID based on device type and sensor key
-        if device_type == DEVICE_METER:
-            meter_id = coordinator.data.get("dsmr", {}).get("id", {}).get("value", "unknown")
-            self._attr_unique_id = f"{meter_id}_{description.key}"
-        else:
-            # Use config entry ID for inverter as it may not have a unique serial
-            self._attr_unique_id = (
-                f"{coordinator.config_entry.entry_id}_{description.key}"
-            )
+        # Unique ID and device info are shared by the coordinator's entities
+        self._attr_unique_id = coordinator.devices.unique_id(device_type, description.key)
+        self._attr_device_info = coordinator.devices.device_info(device_type)
 
-        # Set device info
-        self._attr_device_info = self._get_device_info()
-
-    def _get_device_info(self) -> DeviceInfo:
-        """Return device info for this sensor."""
-        if self._device_type == DEVICE_METER:
-            meter_id = self.coordinator.data.get("dsmr", {}).get("id", {}).get("value", "unknown")
-            return DeviceInfo(
-                identifiers={(DOMAIN, f"{DEVICE_METER}_{meter_id}")},
-                name="Smart Meter",
-                manufacturer="Jullix",
-                model="DSMR P1 Meter",
-            )
+    def batch_state(self, available: Mapping[str, bool]) -> tuple[Any, ...]:
+        """Return the inputs of the state, compared with the last written ones."""
+        return (available[self._device_type], self.native_value)
 
-        # Inverter device
-        inverter_data = self.coordinator.data.get("inverter", {})
-        model = inverter_data.get("model", "Unknown")
-        desc = inverter_data.get("desc", "Solar Inverter")
+    @property
+    def native_value(self) -> float | int | str | None:
+        """Return the state of the sensor."""
+        if self._field_index is not None:
+            return self.coordinator.values[self._field_index]
+        return self.entity_description.value_fn(self.coordinator.data)
 
-        # Use model as-is but capitalize for manufacturer
-        manufacturer = model.capitalize() if model else "Unknown"
 
-        return DeviceInfo(
-            identifiers={(DOMAIN, f"{DEVICE_INVERTER}_{self.coordinator.config_entry.entry_id}")},
-            name=desc,
-            manufacturer=manufacturer,
-            model=model,
-        )
+class JullixMetricSensor(CoordinatorEntity[JullixCoordinator], SensorEntity):
+    """Diagnostic sensor exposing request and update metrics."""
+
+    entity_description: JullixMetricSensorEntityDescription
+    _attr_has_entity_name = True
+    _unrecorded_attributes = frozenset({"buckets", "count", "sum", "last"})
+
+    def __init__(
+        self,
+        coordinator: JullixCoordinator,
+        description: JullixMetricSensorEntityDescription,
+    ) -> None:
+        """Initialize the metric sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = coordinator.devices.unique_id(DEVICE_INVERTER, description.key)
+
+        # Metrics describe the Jullix device itself, group them with the inverter
+        self._attr_device_info = coordinator.devices.inverter
 
     @property
-    def native_value(self) -> float | int | str | None:
+    def native_value(self) -> float | int | None:
         """Return the state of the sensor."""
-        return self.entity_description.value_fn(self.coordinator.data)
+        return self.entity_description.value_fn(self.coordinator.client.metrics)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the histogram or breakdown behind the sensor value."""
+        if (attributes_fn := self.entity_description.attributes_fn) is None:
+            return None
+        return attributes_fn(self.coordinator.client.metrics)
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available.
+
+        Metrics stay available while the device fails, that is when they matter.
+        """
+        return True
+
+
+class JullixBatteryForecastSensor(CoordinatorEntity[JullixCoordinator], SensorEntity):
+    """Estimated time until the battery is full or reaches the reserve."""
+
+    entity_description: JullixForecastSensorEntityDescription
+    _attr_has_entity_name = True
+    _unrecorded_attributes = frozenset({"rate", "reserve"})
+
+    def __init__(
+        self,
+        coordinator: JullixCoordinator,
+        description: JullixForecastSensorEntityDescription,
+    ) -> None:
+        """Initialize the battery forecast sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = coordinator.devices.unique_id(DEVICE_INVERTER, description.key)
+
+        self._attr_device_info = coordinator.devices.inverter
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the estimated minutes, None while the battery is idle."""
+        return self.entity_description.value_fn(self.coordinator.battery_forecast)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the state of charge rate behind the estimate."""
+        forecast = self.coordinator.battery_forecast
+        rate = forecast.rate
+        return {
+            "rate": round(rate, 2) if rate is not None else None,
+            "reserve": forecast.reserve,
+        }
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
         if not super().available:
             return False
+        return self.coordinator.data.get("inverter", {}).get("running", False)
 
-        # Check device-specific availability
-        if self._device_type == DEVICE_METER:
-            return self.coordinator.data.get("dsmr", {}).get("connected", False)
 
-        # For inverter, check if it's running
-        return self.coordinator.data.get("inverter", {}).get("running", False)
+class JullixPowerFlowSensor(CoordinatorEntity[JullixCoordinator], SensorEntity):
+    """Power flowing from one source to one destination."""
 
+    entity_description: JullixPowerFlowSensorEntityDescription
+    _attr_has_entity_name = True
 
-class BatteryEnergySensor(CoordinatorEntity[JullixCoordinator], RestoreSensor):
+    def __init__(
+        self,
+        coordinator: JullixCoordinator,
+        description: JullixPowerFlowSensorEntityDescription,
+    ) -> None:
+        """Initialize the power flow sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = coordinator.devices.unique_id(DEVICE_INVERTER, description.key)
+
+        self._attr_device_info = coordinator.devices.inverter
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the power of the flow."""
+        if (flows := self.coordinator.power_flows) is None:
+            return None
+        return self.entity_description.value_fn(flows)
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return super().available and self.coordinator.power_flows is not None
+
+
+class JullixEnergyBalanceSensor(CoordinatorEntity[JullixCoordinator], SensorEntity):
+    """Self-consumption or self-sufficiency ratio over a period."""
+
+    entity_description: JullixEnergyBalanceSensorEntityDescription
+    _attr_has_entity_name = True
+    _unrecorded_attributes = frozenset({"produced", "consumed", "imported", "exported"})
+
+    def __init__(
+        self,
+        coordinator: JullixCoordinator,
+        description: JullixEnergyBalanceSensorEntityDescription,
+    ) -> None:
+        """Initialize the energy balance sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = coordinator.devices.unique_id(DEVICE_INVERTER, description.key)
+
+        self._attr_device_info = coordinator.devices.inverter
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the ratio in %."""
+        return self.entity_description.value_fn(self.coordinator.energy_balance)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the energy totals of the period in kWh."""
+        totals = self.coordinator.energy_balance.periods[self.entity_description.period]
+        return {
+            "produced": round(totals.produced, 3),
+            "consumed": round(totals.consumed, 3),
+            "imported": round(totals.imported, 3),
+            "exported": round(totals.exported, 3),
+        }
+
+
+class BatteryEnergySensor(JullixBatchedEntity, RestoreSensor):
     """Battery energy tracking sensor using Riemann sum integration."""
 
     _attr_has_entity_name = True
-    _unrecorded_attributes = frozenset({"last_period"})
+    _unrecorded_attributes = frozenset({"counter_corrections", "counter_rejections"})
+    _device_type = DEVICE_INVERTER
 
     def __init__(
         self,
@@ -190,7 +568,7 @@ class BatteryEnergySensor(CoordinatorEntity[JullixCoordinator], RestoreSensor):
         """Initialize the battery energy sensor."""
         super().__init__(coordinator)
         self.entity_description = description
-        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_{description.key}"
+        self._attr_unique_id = coordinator.devices.unique_id(DEVICE_INVERTER, description.key)
 
         # Initialize tracking variables
         self._last_update_time: datetime | None = None
@@ -200,18 +578,11 @@ class BatteryEnergySensor(CoordinatorEntity[JullixCoordinator], RestoreSensor):
         # Determine if this tracks charging or discharging
         self._track_charging = description.key == "battery_energy_charged"
 
-        # Set device info
-        inverter_data = coordinator.data.get("inverter", {})
-        model = inverter_data.get("model", "Unknown")
-        desc = inverter_data.get("desc", "Solar Inverter")
-        manufacturer = model.capitalize() if model else "Unknown"
-
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, f"{DEVICE_INVERTER}_{coordinator.config_entry.entry_id}")},
-            name=desc,
-            manufacturer=manufacturer,
-            model=model,
-        )
+        # Correct drift against a battery counter when the inverter reports one
+        self._counter_keys = BATTERY_COUNTER_KEYS.get(description.key, ())
+        self._reconciler = CounterReconciler()
+
+        self._attr_device_info = coordinator.devices.inverter
 
     async def async_added_to_hass(self) -> None:
         """Handle entity added to hass."""
@@ -223,20 +594,49 @@ class BatteryEnergySensor(CoordinatorEntity[JullixCoordinator], RestoreSensor):
                 self._total_energy = float(last_sensor_data.native_value)
 
     def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
+        """Integrate battery power from updated coordinator data.
+
+        The entity batch writes the state afterwards if it changed. Replayed
+        recordings are not integrated, so the total never includes them and
+        never decreases when the replay ends.
+        """
+        if self.coordinator.replaying:
+            # Restart the integration from the first live sample afterwards
+            self._last_update_time = None
+            return
+
         # Get current battery power (in kW)
         inverter_data = self.coordinator.data.get("inverter", {})
         if not inverter_data.get("running", False):
             return
 
+        # P1 telegrams and reused responses repeat the last inverter sample
+        if DEVICE_INVERTER not in self.coordinator.updated_devices:
+            return
+
         battery_power = inverter_data.get("data", {}).get("battery_power")
         if battery_power is None:
             return
 
         now = dt_util.utcnow()
 
+        # Leave the interval ending at a stuck or spiking sample out of the
+        # integration, and restart from this sample unless it is still stuck
+        anomalies = self.coordinator.anomalies
+        if anomalies.is_flagged(DEVICE_INVERTER, "battery_power"):
+            self._last_update_time = now
+            self._last_power = (
+                None if anomalies.is_stuck(DEVICE_INVERTER, "battery_power") else battery_power
+            )
+            return
+
         # Calculate energy increment using left Riemann sum
-        if self._last_update_time is not None and self._last_power is not None:
+        # A step back in time or a long gap restarts the integration here
+        if (
+            self._last_update_time is not None
+            and self._last_power is not None
+            and timedelta(0) < now - self._last_update_time <= BATTERY_ENERGY_MAX_GAP
+        ):
             time_delta_hours = (now - self._last_update_time).total_seconds() / 3600
 
             # Use left Riemann sum: energy = power × time
@@ -246,16 +646,25 @@ class BatteryEnergySensor(CoordinatorEntity[JullixCoordinator], RestoreSensor):
             # Only accumulate if power direction matches what we're tracking
             if self._track_charging and self._last_power < 0:
                 # Charging: negative power
-                self._total_energy += energy_increment
+                self._total_energy += self._reconciler.integrate(energy_increment)
             elif not self._track_charging and self._last_power > 0:
                 # Discharging: positive power
-                self._total_energy += energy_increment
+                self._total_energy += self._reconciler.integrate(energy_increment)
+
+        # Reconcile with the device counter whenever it advances
+        device_data = inverter_data.get("data", {})
+        for key in self._counter_keys:
+            if isinstance(counter := device_data.get(key), int | float):
+                self._total_energy += self._reconciler.reconcile(counter)
+                break
 
         # Update tracking variables for next calculation
         self._last_update_time = now
         self._last_power = battery_power
 
-        self.async_write_ha_state()
+    def batch_state(self, available: Mapping[str, bool]) -> tuple[Any, ...]:
+        """Return the inputs of the state, compared with the last written ones."""
+        return (*super().batch_state(available), self.native_value)
 
     @property
     def native_value(self) -> float:
@@ -263,8 +672,11 @@ class BatteryEnergySensor(CoordinatorEntity[JullixCoordinator], RestoreSensor):
         return round(self._total_energy, 2)
 
     @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        if not super().available:
-            return False
-        return self.coordinator.data.get("inverter", {}).get("running", False)
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the corrections applied from the device counter."""
+        if not self._reconciler.active:
+            return None
+        return {
+            "counter_corrections": round(self._reconciler.corrections, 3),
+            "counter_rejections": self._reconciler.rejected,
+        }
@@ -0,0 +1,168 @@
+"""Services for Jullix Energy Management."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .profiler import CycleProfiler
+from .replay import ReplaySource, ResponseRecorder, async_replay
+
+if TYPE_CHECKING:
+    from . import JullixConfigEntry
+
+SERVICE_PROFILE = "profile"
+SERVICE_RECORD = "record"
+SERVICE_REPLAY = "replay"
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_CYCLES = "cycles"
+ATTR_DURATION = "duration"
+ATTR_FILE = "file"
+ATTR_SPEED = "speed"
+
+DEFAULT_PROFILE_CYCLES = 5
+DEFAULT_RECORD_DURATION = 3600
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_CYCLES, default=DEFAULT_PROFILE_CYCLES): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+    }
+)
+
+RECORD_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_DURATION, default=DEFAULT_RECORD_DURATION): vol.All(
+            vol.Coerce(int), vol.Range(min=10, max=7 * 86400)
+        ),
+    }
+)
+
+REPLAY_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_FILE): cv.string,
+        vol.Optional(ATTR_SPEED, default=0): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    }
+)
+
+
+@callback
+def _async_get_entries(call: ServiceCall) -> list[JullixConfigEntry]:
+    """Return the loaded config entries targeted by a service call."""
+    if (entry_id := call.data.get(ATTR_CONFIG_ENTRY_ID)) is None:
+        return call.hass.config_entries.async_loaded_entries(DOMAIN)
+
+    entry = call.hass.config_entries.async_get_entry(entry_id)
+    if entry is None or entry.domain != DOMAIN:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="entry_not_found",
+            translation_placeholders={"entry_id": entry_id},
+        )
+    if entry.state is not ConfigEntryState.LOADED:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="entry_not_loaded",
+            translation_placeholders={"entry_id": entry_id},
+        )
+    return [entry]
+
+
+async def _async_profile(call: ServiceCall) -> ServiceResponse:
+    """Profile the next update cycles of the targeted coordinators."""
+    timestamp = dt_util.now().strftime("%Y%m%d_%H%M%S")
+    files: dict[str, str] = {}
+
+    for entry in _async_get_entries(call):
+        path = call.hass.config.path(f"{DOMAIN}_profile_{entry.entry_id}_{timestamp}.txt")
+        entry.runtime_data.profiler = CycleProfiler(call.data[ATTR_CYCLES], path)
+        files[entry.entry_id] = path
+
+    return {"files": files}
+
+
+async def _async_record(call: ServiceCall) -> ServiceResponse:
+    """Record the raw responses of the targeted devices."""
+    timestamp = dt_util.now().strftime("%Y%m%d_%H%M%S")
+    entries = _async_get_entries(call)
+    for entry in entries:
+        if entry.runtime_data.client.recorder is not None:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="already_recording",
+                translation_placeholders={"entry_id": entry.entry_id},
+            )
+
+    files: dict[str, str] = {}
+    for entry in entries:
+        path = call.hass.config.path(
+            f"{DOMAIN}_record_{entry.entry_id}_{timestamp}.jsonl.gz"
+        )
+        recorder = ResponseRecorder(call.hass, entry.runtime_data.client, path)
+        entry.async_on_unload(recorder.async_start(call.data[ATTR_DURATION]))
+        files[entry.entry_id] = path
+
+    return {"files": files}
+
+
+async def _async_replay(call: ServiceCall) -> None:
+    """Replay a recording through the targeted coordinators."""
+    path = call.hass.config.path(call.data[ATTR_FILE])
+    if not call.hass.config.is_allowed_path(path):
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="path_not_allowed",
+            translation_placeholders={"path": path},
+        )
+
+    for entry in _async_get_entries(call):
+        entry.async_create_background_task(
+            call.hass,
+            async_replay(
+                entry.runtime_data,
+                ReplaySource(call.hass, path),
+                call.data[ATTR_SPEED],
+            ),
+            f"{DOMAIN}_replay_{entry.entry_id}",
+        )
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Jullix services."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        _async_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RECORD,
+        _async_record,
+        schema=RECORD_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_REPLAY, _async_replay, schema=REPLAY_SCHEMA
+    )
@@ -0,0 +1,79 @@
+"""Latency objectives of a Jullix device, reported as a Repairs issue."""
+
+from __future__ import annotations
+
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import issue_registry as ir
+
+from .const import DEFAULT_SLO_LATENCY, DEFAULT_SLO_TIMEOUT_RATIO, DOMAIN, SLO_MIN_REQUESTS
+from .metrics import RequestWindow
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SloMonitor:
+    """Raise a Repairs issue while a device misses its latency objectives.
+
+    The objectives are checked on the rolling request window after every
+    poll. The issue is raised when the p95 latency or the timeout ratio
+    exceeds its threshold, and deleted once both are met again.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, title: str) -> None:
+        """Initialize the monitor with the default objectives."""
+        self._hass = hass
+        self._title = title
+        self.issue_id = f"degraded_device_{entry_id}"
+        self.latency: float = DEFAULT_SLO_LATENCY
+        self.timeout_ratio: float = DEFAULT_SLO_TIMEOUT_RATIO / 100
+        self.degraded = False
+
+    @callback
+    def async_check(self, window: RequestWindow) -> None:
+        """Check the objectives and raise or delete the issue on a change."""
+        if window.count < SLO_MIN_REQUESTS:
+            return
+        p95 = window.quantile(0.95)
+        timeout_ratio = window.timeout_ratio or 0.0
+        degraded = (p95 is not None and p95 > self.latency) or (
+            timeout_ratio > self.timeout_ratio
+        )
+        if degraded == self.degraded:
+            return
+        self.degraded = degraded
+
+        if not degraded:
+            _LOGGER.info("%s meets its latency objectives again", self._title)
+            ir.async_delete_issue(self._hass, DOMAIN, self.issue_id)
+            return
+
+        p95_text = "-" if p95 is None else f"{p95:.2f}"
+        _LOGGER.warning(
+            "%s misses its latency objectives, p95 %s s and %.0f%% timeouts",
+            self._title,
+            p95_text,
+            timeout_ratio * 100,
+        )
+        ir.async_create_issue(
+            self._hass,
+            DOMAIN,
+            self.issue_id,
+            is_fixable=False,
+            severity=ir.IssueSeverity.WARNING,
+            translation_key="degraded_device",
+            translation_placeholders={
+                "title": self._title,
+                "p95": p95_text,
+                "latency": f"{self.latency:g}",
+                "timeout_ratio": f"{timeout_ratio:.0%}",
+                "max_timeout_ratio": f"{self.timeout_ratio:.0%}",
+            },
+        )
+
+    @callback
+    def async_clear(self) -> None:
+        """Delete the issue, as the objectives are checked again after a reload."""
+        self.degraded = False
+        ir.async_delete_issue(self._hass, DOMAIN, self.issue_id)
@@ -0,0 +1,259 @@
+"""Accuracy and speed simulation of the battery energy integration.
+
+Synthetic battery power profiles with exact integrals are sampled on a
+virtual clock and fed through BatteryEnergySensor, with optional poll
+jitter, missed polls, restarts, biased power readings and quantized
+device battery counters. Run it with
+
+    python -m custom_components.jullix.tests.benchmarks.battery_energy --days 90
+"""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+import math
+import random
+import time
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import patch
+
+from homeassistant.util import dt as dt_util
+
+from ...anomaly import AnomalyDetector
+from ...const import BATTERY_ENERGY_SENSORS, DEVICE_INVERTER
+from ...devices import JullixDevices
+from ...sensor import BatteryEnergySensor
+
+START = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+@dataclass(frozen=True, slots=True)
+class ConstantProfile:
+    """Constant battery power in kW."""
+
+    power_kw: float
+
+    def power(self, seconds: float) -> float:
+        """Return the battery power at a time."""
+        return self.power_kw
+
+    def exact(self, seconds: float) -> tuple[float, float]:
+        """Return the exact charged and discharged energy in kWh."""
+        energy = abs(self.power_kw) * seconds / 3600
+        return (energy, 0.0) if self.power_kw < 0 else (0.0, energy)
+
+
+@dataclass(frozen=True, slots=True)
+class SineProfile:
+    """Battery power following a sine, charging during the first half period."""
+
+    amplitude_kw: float
+    period: float = 86400.0
+
+    def power(self, seconds: float) -> float:
+        """Return the battery power at a time."""
+        return -self.amplitude_kw * math.sin(2 * math.pi * seconds / self.period)
+
+    def exact(self, seconds: float) -> tuple[float, float]:
+        """Return the exact charged and discharged energy in kWh."""
+        periods, phase = divmod(seconds, self.period)
+        scale = self.amplitude_kw * self.period / (2 * math.pi) / 3600
+        cosine = math.cos(2 * math.pi * phase / self.period)
+        # Each half period charges or discharges 2 * scale
+        if phase < self.period / 2:
+            return (2 * periods + 1 - cosine) * scale, 2 * periods * scale
+        return (2 * periods + 2) * scale, (2 * periods + 1 + cosine) * scale
+
+
+@dataclass(frozen=True, slots=True)
+class SquareProfile:
+    """Battery charging and discharging at fixed power in alternating blocks."""
+
+    charge_kw: float
+    discharge_kw: float
+    period: float = 3600.0
+
+    def power(self, seconds: float) -> float:
+        """Return the battery power at a time."""
+        if seconds % self.period < self.period / 2:
+            return -self.charge_kw
+        return self.discharge_kw
+
+    def exact(self, seconds: float) -> tuple[float, float]:
+        """Return the exact charged and discharged energy in kWh."""
+        periods, phase = divmod(seconds, self.period)
+        half = self.period / 2
+        charging = periods * half + min(phase, half)
+        discharging = periods * half + max(phase - half, 0.0)
+        return self.charge_kw * charging / 3600, self.discharge_kw * discharging / 3600
+
+
+@dataclass(frozen=True, slots=True)
+class SimulationResult:
+    """Outcome of a simulation run."""
+
+    samples: int
+    charged: float
+    discharged: float
+    expected_charged: float
+    expected_discharged: float
+    runtime: float
+
+    @property
+    def charged_error(self) -> float:
+        """Return the relative error of the charged energy."""
+        return _relative_error(self.charged, self.expected_charged)
+
+    @property
+    def discharged_error(self) -> float:
+        """Return the relative error of the discharged energy."""
+        return _relative_error(self.discharged, self.expected_discharged)
+
+    @property
+    def seconds_per_million(self) -> float:
+        """Return the runtime per million samples in seconds."""
+        return self.runtime / self.samples * 1e6 if self.samples else 0.0
+
+
+def _relative_error(value: float, expected: float) -> float:
+    """Return the relative error, or the absolute error for an expected zero."""
+    return (value - expected) / expected if expected else value
+
+
+def _create_sensors(
+    coordinator: Any, totals: tuple[float, float] = (0.0, 0.0)
+) -> list[BatteryEnergySensor]:
+    """Create charged and discharged sensors, restoring their totals."""
+    sensors = []
+    for description, total in zip(BATTERY_ENERGY_SENSORS, totals, strict=True):
+        sensor = BatteryEnergySensor(coordinator, description)
+        sensor.async_write_ha_state = lambda: None  # type: ignore[method-assign]
+        sensor._total_energy = total  # noqa: SLF001
+        sensors.append(sensor)
+    return sensors
+
+
+def simulate(
+    profile: ConstantProfile | SineProfile | SquareProfile,
+    duration: float,
+    interval: float = 10.0,
+    jitter: float = 0.0,
+    miss_rate: float = 0.0,
+    restart_every: float | None = None,
+    power_bias: float = 1.0,
+    counter_resolution: float | None = None,
+    seed: int = 0,
+) -> SimulationResult:
+    """Feed a battery power profile through the battery energy sensors.
+
+    Args:
+        profile: Battery power profile with a known integral
+        duration: Simulated seconds
+        interval: Seconds between polls
+        jitter: Maximum deviation of a poll from its schedule in seconds
+        miss_rate: Probability that a poll fails
+        restart_every: Seconds between restarts, restoring the totals
+        power_bias: Factor between the reported and the true battery power
+        counter_resolution: Resolution of device battery counters in kWh, None
+            when the device reports no battery counters
+        seed: Seed of the jitter and missed poll generator
+
+    """
+    rng = random.Random(seed)
+    coordinator = SimpleNamespace(
+        data={"inverter": {"model": "Simulated", "running": True}},
+        config_entry=SimpleNamespace(entry_id="simulation"),
+        anomalies=AnomalyDetector(),
+        updated_devices=frozenset({DEVICE_INVERTER}),
+        replaying=False,
+        devices=JullixDevices("simulation"),
+        last_update_success=True,
+    )
+    sensors = _create_sensors(coordinator)
+    next_restart = restart_every
+
+    samples = 0
+    start = time.perf_counter()
+    polls = int(duration // interval)
+    now = START
+    # The sensors read the virtual clock
+    with patch.object(dt_util, "utcnow", lambda: now):
+        for poll in range(polls + 1):
+            seconds = poll * interval
+            if 0 < poll < polls:
+                # The first and last poll are exact so the integral covers the duration
+                if miss_rate and rng.random() < miss_rate:
+                    continue
+                if jitter:
+                    seconds += rng.uniform(-jitter, jitter)
+            if next_restart is not None and seconds >= next_restart and poll < polls:
+                next_restart += restart_every
+                sensors = _create_sensors(
+                    coordinator,
+                    tuple(sensor._total_energy for sensor in sensors),  # noqa: SLF001
+                )
+            device_data = {"battery_power": profile.power(seconds) * power_bias}
+            if counter_resolution:
+                charged, discharged = profile.exact(seconds)
+                device_data["battery_energy_charged"] = (
+                    charged // counter_resolution * counter_resolution
+                )
+                device_data["battery_energy_discharged"] = (
+                    discharged // counter_resolution * counter_resolution
+                )
+            coordinator.data = {"inverter": {"running": True, "data": device_data}}
+            now = START + timedelta(seconds=seconds)
+            for sensor in sensors:
+                sensor._handle_coordinator_update()  # noqa: SLF001
+            samples += 1
+    runtime = time.perf_counter() - start
+
+    expected_charged, expected_discharged = profile.exact(polls * interval)
+    return SimulationResult(
+        samples=samples,
+        charged=sensors[0]._total_energy,  # noqa: SLF001
+        discharged=sensors[1]._total_energy,  # noqa: SLF001
+        expected_charged=expected_charged,
+        expected_discharged=expected_discharged,
+        runtime=runtime,
+    )
+
+
+def main() -> None:
+    """Run the standard scenarios and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=float, default=90, help="simulated days")
+    args = parser.parse_args()
+    duration = args.days * 86400
+
+    scenarios = {
+        "constant": (ConstantProfile(-2.0), {}),
+        "sine": (SineProfile(3.0), {}),
+        "sine, 3 s jitter": (SineProfile(3.0), {"jitter": 3.0}),
+        "sine, 5 % missed": (SineProfile(3.0), {"miss_rate": 0.05}),
+        "sine, daily restart": (SineProfile(3.0), {"restart_every": 86400.0}),
+        "square": (SquareProfile(2.0, 1.5), {}),
+        "square, 3 s jitter": (SquareProfile(2.0, 1.5), {"jitter": 3.0}),
+        "sine, 3 % bias": (SineProfile(3.0), {"power_bias": 1.03}),
+        "sine, 3 % bias, counter": (
+            SineProfile(3.0),
+            {"power_bias": 1.03, "counter_resolution": 0.1},
+        ),
+    }
+    print(
+        f"{'scenario':<26} {'samples':>9} {'charged err':>12} "
+        f"{'discharged err':>15} {'s per 1M':>9}"
+    )
+    for name, (profile, options) in scenarios.items():
+        result = simulate(profile, duration, **options)
+        print(
+            f"{name:<26} {result.samples:>9} {result.charged_error:>12.3e} "
+            f"{result.discharged_error:>15.3e} {result.seconds_per_million:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
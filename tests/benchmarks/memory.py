@@ -0,0 +1,104 @@
+"""Memory held by coordinator data per config entry.
+
+Decodes device responses the way the API client does and measures the
+memory retained by the full payloads and by their compact form for a
+number of simulated config entries. Run it with
+
+    python -m custom_components.jullix.tests.benchmarks.memory --entries 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable
+from dataclasses import dataclass
+import json
+from pathlib import Path
+import tracemalloc
+from typing import Any
+
+from ...fields import compact_payload
+
+FIXTURES = Path(__file__).parents[1] / "fixtures"
+
+
+@dataclass(frozen=True, slots=True)
+class MemoryResult:
+    """Retained bytes per config entry."""
+
+    full: float
+    compact: float
+
+    @property
+    def saved(self) -> float:
+        """Return the fraction of memory saved by compacting."""
+        return 1 - self.compact / self.full if self.full else 0.0
+
+
+def load_bodies(extra_fields: int = 0) -> tuple[bytes, bytes]:
+    """Return DSMR and inverter response bodies from the test fixtures.
+
+    Args:
+        extra_fields: Numeric fields added to both responses, to model
+            firmware reporting more fields than the fixtures
+
+    """
+    dsmr = json.loads((FIXTURES / "dsmr_status.json").read_text())
+    inverter = json.loads((FIXTURES / "inverter_status.json").read_text())
+    for index in range(extra_fields):
+        dsmr[f"field_{index}"] = {"value": float(index), "title": f"Field {index}", "units": ""}
+        inverter["data"][f"field_{index}"] = float(index)
+    return json.dumps(dsmr).encode(), json.dumps(inverter).encode()
+
+
+def _retained(
+    bodies: tuple[bytes, bytes],
+    entries: int,
+    transform: Callable[[dict[str, Any]], dict[str, Any]],
+) -> float:
+    """Return the bytes retained per entry by transformed payloads."""
+    dsmr_body, inverter_body = bodies
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [
+        transform({"dsmr": json.loads(dsmr_body), "inverter": json.loads(inverter_body)})
+        for _ in range(entries)
+    ]
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del kept
+    return retained / entries
+
+
+def measure(entries: int = 1000, extra_fields: int = 0) -> MemoryResult:
+    """Measure the coordinator data retained per config entry.
+
+    Args:
+        entries: Simulated config entries, each holding one payload
+        extra_fields: Numeric fields added to both responses
+
+    """
+    bodies = load_bodies(extra_fields)
+    return MemoryResult(
+        full=_retained(bodies, entries, lambda data: data),
+        compact=_retained(bodies, entries, compact_payload),
+    )
+
+
+def main() -> None:
+    """Measure the fixture payloads and larger ones and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1000, help="simulated config entries")
+    args = parser.parse_args()
+
+    print(f"{'extra fields':>12} {'full B':>9} {'compact B':>10} {'saved':>7}")
+    for extra_fields in (0, 20, 100):
+        result = measure(args.entries, extra_fields)
+        print(
+            f"{extra_fields:>12} {result.full:>9.0f} {result.compact:>10.0f} "
+            f"{result.saved:>7.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Import and setup time of the integration.
+
+Import time is measured in fresh interpreters, after the Home Assistant
+modules every integration needs are loaded. Setup time covers creating the
+coordinator, the first refresh from the fixture responses and building the
+entities of both platforms for a number of config entries. Entities are not
+added to a running entity platform, so registry writes are excluded. Run it
+with
+
+    python -m custom_components.jullix.tests.benchmarks.startup
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from ... import JullixCoordinator, binary_sensor, sensor
+from ...const import API_DSMR_STATUS, API_INVERTER_STATUS, CONF_HOST
+from ...replay import JullixReplayClient, ReplaySample
+from .memory import load_bodies
+
+PACKAGE = __package__.rsplit(".", 2)[0]
+
+# Home Assistant modules loaded before the integration import is timed
+BASE_MODULES = (
+    "homeassistant.components.binary_sensor",
+    "homeassistant.components.sensor",
+    "homeassistant.helpers.update_coordinator",
+)
+
+_IMPORT_SCRIPT = """
+import importlib, time
+for module in {base!r}:
+    importlib.import_module(module)
+start = time.perf_counter()
+for module in {modules!r}:
+    importlib.import_module(module)
+print(time.perf_counter() - start)
+"""
+
+
+@dataclass(slots=True)
+class BenchmarkEntry:
+    """Config entry stand-in with the attributes used during setup."""
+
+    entry_id: str
+    data: dict[str, Any]
+    title: str = "Jullix"
+    options: dict[str, Any] = field(default_factory=dict)
+    runtime_data: JullixCoordinator | None = None
+    # Benchmarks drive updates themselves
+    pref_disable_polling: bool = True
+
+    def async_on_unload(self, func: Any) -> None:
+        """Ignore unload callbacks."""
+
+
+def measure_import(runs: int = 5) -> float:
+    """Return the median import time of the integration and its platforms."""
+    modules = (PACKAGE, f"{PACKAGE}.sensor", f"{PACKAGE}.binary_sensor")
+    script = _IMPORT_SCRIPT.format(base=BASE_MODULES, modules=modules)
+    return statistics.median(
+        float(
+            subprocess.run(
+                [sys.executable, "-c", script], check=True, capture_output=True, text=True
+            ).stdout
+        )
+        for _ in range(runs)
+    )
+
+
+async def async_measure_setup(hass: HomeAssistant, entries: int) -> tuple[float, int]:
+    """Set up a number of config entries.
+
+    Returns:
+        Wall time in seconds and the number of entities created
+
+    """
+    dsmr_body, inverter_body = load_bodies()
+    sample = ReplaySample(
+        time.time(),
+        {API_DSMR_STATUS: dsmr_body.decode(), API_INVERTER_STATUS: inverter_body.decode()},
+    )
+    entities: list[Any] = []
+
+    start = time.perf_counter()
+    for index in range(entries):
+        host = f"192.168.1.{index}"
+        entry = BenchmarkEntry(f"benchmark_{index}", {CONF_HOST: host})
+        client = JullixReplayClient(host)
+        client.sample = sample
+        coordinator = JullixCoordinator(hass, client, entry)  # type: ignore[arg-type]
+        await coordinator.async_refresh()
+        entry.runtime_data = coordinator
+        for platform in (sensor, binary_sensor):
+            await platform.async_setup_entry(hass, entry, entities.extend)  # type: ignore[arg-type]
+    return time.perf_counter() - start, len(entities)
+
+
+async def _async_main(counts: tuple[int, ...]) -> list[tuple[int, float, int]]:
+    """Measure setup time for each number of entries in a fresh instance."""
+    results = []
+    for count in counts:
+        with tempfile.TemporaryDirectory() as config_dir:
+            hass = HomeAssistant(config_dir)
+            seconds, entities = await async_measure_setup(hass, count)
+            await hass.async_stop(force=True)
+        results.append((count, seconds, entities))
+    return results
+
+
+def main() -> None:
+    """Measure import and setup time and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="interpreters to time imports in")
+    args = parser.parse_args()
+
+    print(f"import: {measure_import(args.runs) * 1000:.1f} ms")
+    print(f"{'entries':>7} {'setup ms':>9} {'ms/entry':>9} {'entities':>9}")
+    for count, seconds, entities in asyncio.run(_async_main((1, 10, 50))):
+        print(
+            f"{count:>7} {seconds * 1000:>9.1f} {seconds * 1000 / count:>9.2f} "
+            f"{entities:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Cost of writing entity states per coordinator update.
+
+Compares every entity writing its state on each update, as when each entity
+was a coordinator listener of its own, with the entity batch, which writes
+only the states that changed. The entities of both platforms are added to
+entity platforms of a bare Home Assistant instance and fed payloads in which
+power readings change on every update and counters every few. Run it with
+
+    python -m custom_components.jullix.tests.benchmarks.state_writes
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+import json
+import logging
+import tempfile
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity_registry as er, restore_state
+from homeassistant.helpers.entity_platform import EntityPlatform
+
+from ... import JullixCoordinator, binary_sensor, sensor
+from ...const import API_DSMR_STATUS, API_INVERTER_STATUS, CONF_HOST, DOMAIN
+from ...entity import JullixBatchedEntity
+from ...replay import JullixReplayClient, ReplaySample
+from .memory import load_bodies
+from .startup import BenchmarkEntry
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class WriteResult:
+    """Update cost per entity in seconds."""
+
+    entities: int
+    per_entity: float
+    batched: float
+    # Fraction of entity updates the batch wrote a state for
+    written: float
+
+    @property
+    def speedup(self) -> float:
+        """Return how many times cheaper batched updates are."""
+        return self.per_entity / self.batched if self.batched else float("inf")
+
+
+def payload(tick: int) -> dict[str, Any]:
+    """Return the fixture payload as it might read on an update.
+
+    Power, voltage and current change on every update, energy counters every
+    sixth update and the battery level every thirtieth.
+    """
+    dsmr_body, inverter_body = load_bodies()
+    dsmr, inverter = json.loads(dsmr_body), json.loads(inverter_body)
+    dsmr["power"]["value"] = round(0.8 + tick % 7 * 0.013, 3)
+    dsmr["energy-in"]["value"] = round(4380.46 + tick // 6 * 0.01, 2)
+    data = inverter["data"]
+    data.update(
+        voltage_l1=round(230 + tick % 5 * 0.3, 1),
+        current_l1=round(1.2 + tick % 3 * 0.05, 2),
+        power=round(0.2 + tick % 4 * 0.01, 2),
+        pv_power=round(0.1 + tick % 6 * 0.01, 2),
+        gridpower=round(0.9 + tick % 7 * 0.01, 2),
+        battery_power=round(-0.5 + tick % 5 * 0.1, 1),
+        energy_produced=round(6119.4 + tick // 6 * 0.1, 1),
+        battery_SOC=51 + tick // 30,
+    )
+    return {"dsmr": dsmr, "inverter": inverter}
+
+
+def _set_data(coordinator: JullixCoordinator, raw: dict[str, Any]) -> None:
+    """Process a payload like a refresh does, without notifying listeners."""
+    data = coordinator._compact_data(raw)  # noqa: SLF001
+    coordinator.data = data
+    coordinator._async_process_data(data)  # noqa: SLF001
+
+
+async def _async_setup(hass: HomeAssistant) -> tuple[JullixCoordinator, list[Any]]:
+    """Return a refreshed coordinator and its batched entities, added to hass."""
+    dsmr_body, inverter_body = load_bodies()
+    entry = BenchmarkEntry("benchmark", {CONF_HOST: "192.168.1.10"})
+    client = JullixReplayClient("192.168.1.10")
+    client.sample = ReplaySample(
+        time.time(),
+        {API_DSMR_STATUS: dsmr_body.decode(), API_INVERTER_STATUS: inverter_body.decode()},
+    )
+    coordinator = JullixCoordinator(hass, client, entry)  # type: ignore[arg-type]
+    await coordinator.async_refresh()
+    entry.runtime_data = coordinator
+
+    batched: list[Any] = []
+    for platform in (sensor, binary_sensor):
+        entities: list[Any] = []
+        await platform.async_setup_entry(hass, entry, entities.extend)  # type: ignore[arg-type]
+        entities = [entity for entity in entities if isinstance(entity, JullixBatchedEntity)]
+        entity_platform = EntityPlatform(
+            hass=hass,
+            logger=_LOGGER,
+            domain=platform.__name__.rsplit(".", 1)[1],
+            platform_name=DOMAIN,
+            platform=None,
+            scan_interval=timedelta(seconds=30),
+            entity_namespace=None,
+        )
+        await entity_platform.async_add_entities(entities)
+        # Entities disabled by default are not added
+        batched.extend(entity for entity in entities if entity.hass is not None)
+    return coordinator, batched
+
+
+async def async_measure(hass: HomeAssistant, updates: int = 200) -> WriteResult:
+    """Measure the entity part of coordinator updates, without and with the batch."""
+    coordinator, entities = await _async_setup(hass)
+    batch = coordinator.entity_batch
+
+    def _per_entity() -> None:
+        for entity in entities:
+            entity._handle_coordinator_update()  # noqa: SLF001
+            entity.async_write_ha_state()
+
+    seconds: dict[str, float] = {}
+    writes = 0
+    update: Callable[[], None]
+    for name, update in (("per_entity", _per_entity), ("batched", batch.async_update)):
+        writes = batch.writes
+        elapsed = 0.0
+        for tick in range(updates):
+            _set_data(coordinator, payload(tick))
+            start = time.perf_counter()
+            update()
+            elapsed += time.perf_counter() - start
+        seconds[name] = elapsed / updates / len(entities)
+
+    return WriteResult(
+        entities=len(entities),
+        per_entity=seconds["per_entity"],
+        batched=seconds["batched"],
+        written=(batch.writes - writes) / (updates * len(entities)),
+    )
+
+
+async def _async_main(updates: int) -> WriteResult:
+    """Measure in a fresh Home Assistant instance."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        await dr.async_load(hass)
+        await er.async_load(hass)
+        await restore_state.async_load(hass)
+        result = await async_measure(hass, updates)
+        await hass.async_stop(force=True)
+    return result
+
+
+def main() -> None:
+    """Measure state writes and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--updates", type=int, default=200, help="coordinator updates")
+    args = parser.parse_args()
+
+    result = asyncio.run(_async_main(args.updates))
+    print(f"entities: {result.entities}")
+    print(f"per entity: {result.per_entity * 1e6:.1f} us per entity and update")
+    print(
+        f"batched:    {result.batched * 1e6:.1f} us per entity and update, "
+        f"{result.written:.0%} of states written"
+    )
+    print(f"speedup:    {result.speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
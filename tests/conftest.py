@@ -13,6 +13,7 @@ import pytest
 sys.path.insert(0, str(Path(__file__).parents[3]))
 
 from custom_components.jullix.const import CONF_HOST, DOMAIN
+from custom_components.jullix.metrics import JullixMetrics
 from homeassistant.core import HomeAssistant
 from tests.common import MockConfigEntry, async_test_home_assistant
 
@@ -119,6 +120,7 @@ def mock_jullix_api(mock_dsmr_data: dict, mock_inverter_data: dict, mock_aiohttp
             }
         )
         api_config.test_connection = AsyncMock(return_value=True)
+        api_config.probe = AsyncMock(return_value=mock_dsmr_data["id"]["value"])
 
         # Mock for __init__
         api_init = mock_api_init.return_value
@@ -131,6 +133,8 @@ def mock_jullix_api(mock_dsmr_data: dict, mock_inverter_data: dict, mock_aiohttp
             }
         )
         api_init.test_connection = AsyncMock(return_value=True)
+        api_init.metrics = JullixMetrics()
+        api_init.recorder = None
 
         yield api_config
 
@@ -0,0 +1,119 @@
+"""Test the Jullix streaming anomaly detection."""
+
+from custom_components.jullix.anomaly import AnomalyDetector
+from custom_components.jullix.const import (
+    ANOMALY_MIN_SAMPLES,
+    ANOMALY_STUCK_DURATION,
+    DEVICE_INVERTER,
+    DEVICE_METER,
+)
+
+
+def _inverter(battery_power: float, grid_power: float = 0.0) -> dict:
+    """Return coordinator data with inverter values."""
+    return {
+        "inverter": {
+            "running": True,
+            "data": {"battery_power": battery_power, "gridpower": grid_power},
+        }
+    }
+
+
+def _process(detector: AnomalyDetector, now: float, data: dict) -> None:
+    """Process an update with new samples of both devices."""
+    detector.process(now, data, (DEVICE_METER, DEVICE_INVERTER))
+
+
+def _warm_up(detector: AnomalyDetector, samples: int = ANOMALY_MIN_SAMPLES) -> float:
+    """Feed alternating samples around 1 kW and return the next timestamp."""
+    for second in range(samples):
+        _process(detector, float(second), _inverter(1.0 + (second % 2) * 0.1))
+    return float(samples)
+
+
+def test_spike_detected_and_excluded():
+    """Test a single outlier is confirmed by the next sample and excluded."""
+    detector = AnomalyDetector()
+    now = _warm_up(detector)
+    assert not detector.is_flagged(DEVICE_INVERTER, "battery_power")
+
+    _process(detector, now, _inverter(25.0))
+    # Held back until the next sample shows whether it was a step change
+    assert not detector.is_flagged(DEVICE_INVERTER, "battery_power")
+
+    _process(detector, now + 1, _inverter(1.0))
+    assert detector.is_flagged(DEVICE_INVERTER, "battery_power")
+    assert detector.spike_keys(DEVICE_INVERTER) == ["battery_power"]
+    assert detector.spike_keys(DEVICE_METER) == []
+
+    # The following sample clears the flag, the spike did not move the mean
+    _process(detector, now + 2, _inverter(1.1))
+    assert not detector.is_flagged(DEVICE_INVERTER, "battery_power")
+    _process(detector, now + 3, _inverter(25.0))
+    _process(detector, now + 4, _inverter(1.0))
+    assert detector.is_flagged(DEVICE_INVERTER, "battery_power")
+
+
+def test_no_spike_before_warm_up():
+    """Test no spikes are reported before enough samples were seen."""
+    detector = AnomalyDetector()
+    now = _warm_up(detector, ANOMALY_MIN_SAMPLES - 1)
+
+    _process(detector, now, _inverter(25.0))
+    assert not detector.is_flagged(DEVICE_INVERTER, "battery_power")
+
+
+def test_step_change_not_flagged():
+    """Test a sustained level change is never flagged."""
+    detector = AnomalyDetector()
+    now = _warm_up(detector)
+
+    for offset in range(5):
+        _process(detector, now + offset, _inverter(3.0 + (offset % 2) * 0.1))
+        assert not detector.is_flagged(DEVICE_INVERTER, "battery_power")
+
+
+def test_repeated_samples_not_processed():
+    """Test values of a device without a new sample are not processed again."""
+    detector = AnomalyDetector()
+    now = _warm_up(detector)
+
+    _process(detector, now, _inverter(25.0))
+    # P1 telegrams repeat the inverter sample and must not confirm it as a step
+    for offset in range(1, 5):
+        detector.process(now + offset, _inverter(25.0), (DEVICE_METER,))
+    _process(detector, now + 5, _inverter(1.0))
+    assert detector.spike_keys(DEVICE_INVERTER) == ["battery_power"]
+
+
+def test_stuck_value():
+    """Test a non-zero power reading that never changes is stuck."""
+    detector = AnomalyDetector()
+    stuck_seconds = ANOMALY_STUCK_DURATION.total_seconds()
+
+    _process(detector, 0.0, _inverter(1.5))
+    _process(detector, stuck_seconds - 1, _inverter(1.5))
+    assert detector.stuck_keys(DEVICE_INVERTER) == []
+
+    _process(detector, stuck_seconds, _inverter(1.5))
+    assert detector.stuck_keys(DEVICE_INVERTER) == ["battery_power"]
+    assert detector.is_flagged(DEVICE_INVERTER, "battery_power")
+
+    _process(detector, stuck_seconds + 1, _inverter(1.4))
+    assert detector.stuck_keys(DEVICE_INVERTER) == []
+
+
+def test_zero_value_not_stuck():
+    """Test idle readings of zero are never reported as stuck."""
+    detector = AnomalyDetector()
+
+    _process(detector, 0.0, _inverter(0.0))
+    _process(detector, ANOMALY_STUCK_DURATION.total_seconds() * 2, _inverter(0.0))
+    assert detector.stuck_keys(DEVICE_INVERTER) == []
+
+
+def test_unknown_keys_ignored():
+    """Test keys without a measurement sensor are not tracked."""
+    detector = AnomalyDetector()
+    _process(detector, 0.0, {"inverter": {"running": True, "data": {"unknown": 1.0}}})
+    assert not detector.is_flagged(DEVICE_INVERTER, "unknown")
@@ -1,17 +1,30 @@
 """Tests for the Jullix API client."""
 
-from unittest.mock import AsyncMock, MagicMock, Mock, patch
+import asyncio
+import json
+from unittest.mock import ANY, AsyncMock, MagicMock, Mock, patch
 
 import aiohttp
 import pytest
 
 from custom_components.jullix.api import (
     JullixApiClient,
+    JullixApiError,
     JullixConnectionError,
     JullixTimeoutError,
 )
 
 
+def _timeout_session() -> MagicMock:
+    """Return a session whose requests time out."""
+    mock_response = MagicMock()
+    mock_response.__aenter__ = AsyncMock(side_effect=TimeoutError())
+    mock_response.__aexit__ = AsyncMock(return_value=None)
+    session = MagicMock()
+    session.get = MagicMock(return_value=mock_response)
+    return session
+
+
 def test_api_client_initialization():
     """Test API client can be initialized."""
     session = Mock()
@@ -40,7 +53,7 @@ async def test_api_get_all_data():
 async def test_api_get_dsmr_data_success():
     """Test successfully getting DSMR data."""
     mock_response = MagicMock()
-    mock_response.json = AsyncMock(return_value={"power": {"value": 1.0}})
+    mock_response.read = AsyncMock(return_value=b'{"power": {"value": 1.0}}')
     mock_response.raise_for_status = MagicMock()
     mock_response.__aenter__ = AsyncMock(return_value=mock_response)
     mock_response.__aexit__ = AsyncMock(return_value=None)
@@ -52,13 +65,13 @@ async def test_api_get_dsmr_data_success():
     result = await client.get_dsmr_data()
 
     assert result == {"power": {"value": 1.0}}
-    session.get.assert_called_once_with("http://192.168.4.167/api/dsmr/status")
+    session.get.assert_called_once_with("http://192.168.4.167/api/dsmr/status", timeout=ANY)
 
 
 async def test_api_get_inverter_data_success():
     """Test successfully getting inverter data."""
     mock_response = MagicMock()
-    mock_response.json = AsyncMock(return_value={"model": "TEST"})
+    mock_response.read = AsyncMock(return_value=b'{"model": "TEST"}')
     mock_response.raise_for_status = MagicMock()
     mock_response.__aenter__ = AsyncMock(return_value=mock_response)
     mock_response.__aexit__ = AsyncMock(return_value=None)
@@ -70,7 +83,9 @@ async def test_api_get_inverter_data_success():
     result = await client.get_inverter_data()
 
     assert result == {"model": "TEST"}
-    session.get.assert_called_once_with("http://192.168.4.167/api/inverter/status/A")
+    session.get.assert_called_once_with(
+        "http://192.168.4.167/api/inverter/status/A", timeout=ANY
+    )
 
 
 async def test_api_connection_error():
@@ -89,15 +104,10 @@ async def test_api_connection_error():
 
 async def test_api_timeout_error():
     """Test timeout error is raised properly."""
-    with patch("asyncio.timeout") as mock_timeout:
-        # Make asyncio.timeout raise TimeoutError when entering the context
-        mock_timeout.return_value.__aenter__ = AsyncMock(side_effect=TimeoutError())
+    client = JullixApiClient("192.168.4.167", _timeout_session())
 
-        session = MagicMock()
-        client = JullixApiClient("192.168.4.167", session)
-
-        with pytest.raises(JullixTimeoutError, match="Timeout connecting to"):
-            await client.get_dsmr_data()
+    with pytest.raises(JullixTimeoutError, match="Timeout connecting to"):
+        await client.get_dsmr_data()
 
 
 async def test_api_test_connection_success():
@@ -121,3 +131,282 @@ async def test_api_test_connection_failure():
 
     with pytest.raises(JullixConnectionError):
         await client.test_connection()
+
+
+async def test_api_concurrent_requests_coalesced():
+    """Test concurrent callers for the same endpoint share one request."""
+    release = asyncio.Event()
+
+    async def _read():
+        await release.wait()
+        return b'{"power": {"value": 1.0}}'
+
+    mock_response = MagicMock()
+    mock_response.read = _read
+    mock_response.raise_for_status = MagicMock()
+    mock_response.__aenter__ = AsyncMock(return_value=mock_response)
+    mock_response.__aexit__ = AsyncMock(return_value=None)
+
+    session = MagicMock()
+    session.get = MagicMock(return_value=mock_response)
+    client = JullixApiClient("192.168.4.167", session)
+
+    tasks = [asyncio.create_task(client.get_dsmr_data()) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert results == [{"power": {"value": 1.0}}] * 3
+    session.get.assert_called_once()
+
+    # Late callers within the maximum age are served the shared response
+    assert await client.get_dsmr_data() == {"power": {"value": 1.0}}
+    session.get.assert_called_once()
+
+    # Older responses are fetched again
+    with patch("custom_components.jullix.api.REQUEST_MAX_AGE", -1):
+        await client.get_dsmr_data()
+    assert session.get.call_count == 2
+
+
+async def test_api_coalesced_errors_not_cached():
+    """Test a failed shared request is raised to every caller and not reused."""
+    mock_response = MagicMock()
+    mock_response.__aenter__ = AsyncMock(side_effect=aiohttp.ClientError("Connection failed"))
+
+    session = MagicMock()
+    session.get = MagicMock(return_value=mock_response)
+    client = JullixApiClient("192.168.4.167", session)
+
+    results = await asyncio.gather(
+        client.get_dsmr_data(), client.get_dsmr_data(), return_exceptions=True
+    )
+    assert all(isinstance(result, JullixConnectionError) for result in results)
+    session.get.assert_called_once()
+
+    with pytest.raises(JullixConnectionError):
+        await client.get_dsmr_data()
+    assert session.get.call_count == 2
+
+
+async def test_api_request_metrics():
+    """Test request latency, payload size and error counters are recorded."""
+    body = b'{"power": {"value": 1.0}}'
+    mock_response = MagicMock()
+    mock_response.read = AsyncMock(return_value=body)
+    mock_response.raise_for_status = MagicMock()
+    mock_response.__aenter__ = AsyncMock(return_value=mock_response)
+    mock_response.__aexit__ = AsyncMock(return_value=None)
+
+    session = MagicMock()
+    session.get = MagicMock(return_value=mock_response)
+    client = JullixApiClient("192.168.4.167", session)
+
+    await client.get_dsmr_data()
+
+    metrics = client.metrics.endpoint("/api/dsmr/status")
+    assert metrics.requests == 1
+    assert metrics.latency.count == 1
+    assert metrics.response_bytes == len(body)
+
+    mock_response.raise_for_status = MagicMock(
+        side_effect=aiohttp.ClientResponseError(Mock(), (), status=500)
+    )
+    with (
+        patch("custom_components.jullix.api.REQUEST_MAX_AGE", -1),
+        pytest.raises(JullixConnectionError),
+    ):
+        await client.get_dsmr_data()
+
+    assert metrics.requests == 2
+    assert metrics.http_errors == 1
+    assert metrics.connection_errors == 0
+    assert client.metrics.total("http_errors") == 1
+
+
+async def test_api_timeout_metrics():
+    """Test timeouts are counted per endpoint."""
+    client = JullixApiClient("192.168.4.167", _timeout_session())
+
+    with pytest.raises(JullixTimeoutError):
+        await client.get_inverter_data()
+
+    assert client.metrics.endpoint("/api/inverter/status/A").timeouts == 1
+    assert client.metrics.window.timeout_ratio == 1.0
+
+
+async def test_api_configure_timeouts():
+    """Test connect and read timeouts are passed to each request."""
+    mock_response = MagicMock()
+    mock_response.read = AsyncMock(return_value=b"{}")
+    mock_response.raise_for_status = MagicMock()
+    mock_response.__aenter__ = AsyncMock(return_value=mock_response)
+    mock_response.__aexit__ = AsyncMock(return_value=None)
+    session = MagicMock()
+    session.get = MagicMock(return_value=mock_response)
+    client = JullixApiClient("192.168.4.167", session)
+
+    client.configure(connect_timeout=2, read_timeout=20)
+    await client.get_dsmr_data()
+
+    assert session.get.call_args.kwargs["timeout"] == aiohttp.ClientTimeout(
+        total=22, connect=2, sock_read=20
+    )
+
+
+async def test_api_configure_intervals():
+    """Test an endpoint is only fetched again once its interval has passed."""
+    mock_response = MagicMock()
+    mock_response.read = AsyncMock(return_value=b"{}")
+    mock_response.raise_for_status = MagicMock()
+    mock_response.__aenter__ = AsyncMock(return_value=mock_response)
+    mock_response.__aexit__ = AsyncMock(return_value=None)
+    session = MagicMock()
+    session.get = MagicMock(return_value=mock_response)
+    client = JullixApiClient("192.168.4.167", session)
+    client.configure({"/api/dsmr/status": 10, "/api/inverter/status/A": 60})
+
+    with patch("custom_components.jullix.api.time") as mock_time:
+        mock_time.perf_counter.return_value = 0.0
+        monotonic = mock_time.monotonic
+        monotonic.return_value = 1000.0
+        await client.get_all_data()
+        assert session.get.call_count == 2
+
+        # Polls slightly early or late fetch the meter but reuse the inverter response
+        for now in (1009.9, 1020.2, 1030.0, 1040.0, 1050.0):
+            session.get.reset_mock()
+            monotonic.return_value = now
+            await client.get_all_data()
+            session.get.assert_called_once_with(
+                "http://192.168.4.167/api/dsmr/status", timeout=ANY
+            )
+
+        session.get.reset_mock()
+        monotonic.return_value = 1059.8
+        await client.get_all_data()
+        assert session.get.call_count == 2
+
+
+async def test_api_configure_short_intervals():
+    """Test intervals below REQUEST_MAX_AGE are polled at their own cadence."""
+    mock_response = MagicMock()
+    mock_response.read = AsyncMock(return_value=b"{}")
+    mock_response.raise_for_status = MagicMock()
+    mock_response.__aenter__ = AsyncMock(return_value=mock_response)
+    mock_response.__aexit__ = AsyncMock(return_value=None)
+    session = MagicMock()
+    session.get = MagicMock(return_value=mock_response)
+    client = JullixApiClient("192.168.4.167", session)
+    client.configure({"/api/dsmr/status": 2, "/api/inverter/status/A": 2})
+
+    with patch("custom_components.jullix.api.time") as mock_time:
+        mock_time.perf_counter.return_value = 0.0
+        monotonic = mock_time.monotonic
+        monotonic.return_value = 1000.0
+        await client.get_all_data()
+        assert session.get.call_count == 2
+
+        # Polls up to a second early or late still fetch both endpoints
+        for now in (1001.1, 1003.9, 1005.0):
+            session.get.reset_mock()
+            monotonic.return_value = now
+            await client.get_all_data()
+            assert session.get.call_count == 2
+
+        # A second caller within the tolerance shares the response
+        session.get.reset_mock()
+        monotonic.return_value = 1005.5
+        await client.get_all_data()
+        session.get.assert_not_called()
+
+
+async def test_api_max_concurrent_requests():
+    """Test requests beyond the concurrency cap wait for a free slot."""
+    release = asyncio.Event()
+    in_flight = max_in_flight = 0
+
+    async def _enter(*args):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await release.wait()
+        in_flight -= 1
+        return mock_response
+
+    mock_response = MagicMock()
+    mock_response.read = AsyncMock(return_value=b"{}")
+    mock_response.raise_for_status = MagicMock()
+    mock_response.__aenter__ = _enter
+    mock_response.__aexit__ = AsyncMock(return_value=None)
+    session = MagicMock()
+    session.get = MagicMock(return_value=mock_response)
+    client = JullixApiClient("192.168.4.167", session)
+    client.configure(max_concurrent=1)
+
+    task = asyncio.create_task(client.get_all_data())
+    await asyncio.sleep(0.01)
+    assert session.get.call_count == 1
+    release.set()
+    await task
+
+    assert session.get.call_count == 2
+    assert max_in_flight == 1
+
+
+def _streaming_session(body: bytes) -> tuple[MagicMock, list[int]]:
+    """Return a session streaming a body, and the sizes of the chunks read."""
+    read: list[int] = []
+
+    async def _chunks(size: int):
+        for start in range(0, len(body), size):
+            chunk = body[start : start + size]
+            read.append(len(chunk))
+            yield chunk
+
+    mock_response = MagicMock()
+    mock_response.raise_for_status = MagicMock()
+    mock_response.content.iter_chunked = _chunks
+    mock_response.__aenter__ = AsyncMock(return_value=mock_response)
+    mock_response.__aexit__ = AsyncMock(return_value=None)
+    session = MagicMock()
+    session.get = MagicMock(return_value=mock_response)
+    return session, read
+
+
+async def test_api_probe_reads_only_start(mock_dsmr_data: dict):
+    """Test a probe stops reading once the meter ID is found."""
+    status = {"id": mock_dsmr_data["id"], "connected": True} | {
+        f"field_{index}": {"value": float(index), "title": f"Field {index}", "units": ""}
+        for index in range(100)
+    }
+    body = json.dumps(status).encode()
+    session, read = _streaming_session(body)
+    client = JullixApiClient("192.168.4.167", session)
+
+    assert await client.probe() == "1SAG3200415379"
+    session.get.assert_called_once_with("http://192.168.4.167/api/dsmr/status")
+    assert sum(read) < len(body) / 10
+    assert client.metrics.endpoint("/api/dsmr/status").requests == 0
+
+
+async def test_api_probe_meter_ids():
+    """Test meter IDs reported as items, bare values or not at all."""
+    for body, meter_id in (
+        (b'{"connected": true, "id": "METER1"}', "METER1"),
+        (b'{"connected": false, "id": {"value": "", "title": "Meter id"}}', None),
+        (b'{"power": {"value": 0.5}, "connected": false}', None),
+    ):
+        client = JullixApiClient("192.168.4.167", _streaming_session(body)[0])
+        assert await client.probe() == meter_id
+
+
+async def test_api_probe_errors():
+    """Test probes of other devices and unreachable hosts raise errors."""
+    client = JullixApiClient("192.168.4.167", _streaming_session(b"<html></html>")[0])
+    with pytest.raises(JullixApiError, match="No Jullix meter status"):
+        await client.probe()
+
+    client = JullixApiClient("192.168.4.167", _timeout_session())
+    with pytest.raises(JullixTimeoutError):
+        await client.probe()
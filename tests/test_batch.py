@@ -0,0 +1,79 @@
+"""Test the batched entity state writes."""
+
+from datetime import timedelta
+import logging
+from unittest.mock import AsyncMock, MagicMock
+
+from custom_components.jullix import JullixCoordinator
+from custom_components.jullix.const import DOMAIN
+from custom_components.jullix.metrics import JullixMetrics
+from custom_components.jullix.sensor import JullixSensor, _field_descriptions
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import EntityPlatform
+from tests.common import MockConfigEntry
+
+
+def _data(power: float, connected: bool = True) -> dict:
+    """Return a raw payload with a grid power reading."""
+    return {
+        "dsmr": {
+            "power": {"value": power, "title": "Power", "units": "kW"},
+            "energy-in": {"value": 10.0, "title": "Energy In", "units": "kWh"},
+            "id": {"value": "METER1", "title": "Meter id", "units": ""},
+            "connected": connected,
+        },
+        "inverter": {"model": "TEST", "desc": "Test", "running": True, "data": {}},
+    }
+
+
+async def test_only_changed_states_written(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test one listener updates all entities and skips unchanged states."""
+    mock_config_entry.add_to_hass(hass)
+    client = MagicMock()
+    client.metrics = JullixMetrics()
+    client.get_all_data = AsyncMock(return_value=_data(1.0))
+    coordinator = JullixCoordinator(hass, client, mock_config_entry)
+    remove_listener = coordinator.async_add_listener(MagicMock())
+    await coordinator.async_refresh()
+    remove_listener()
+
+    descriptions = {description.field: description for description in _field_descriptions(False)}
+    entities = [
+        JullixSensor(coordinator, descriptions[("meter", key)], "meter")
+        for key in ("power", "energy-in")
+    ]
+    platform = EntityPlatform(
+        hass=hass,
+        logger=logging.getLogger(__name__),
+        domain="sensor",
+        platform_name=DOMAIN,
+        platform=None,
+        scan_interval=timedelta(seconds=30),
+        entity_namespace=None,
+    )
+    await platform.async_add_entities(entities)
+    batch = coordinator.entity_batch
+    assert len(batch) == 2
+    assert len(coordinator._listeners) == 1  # noqa: SLF001
+    power_id = entities[0].entity_id
+    assert hass.states.get(power_id).state == "1.0"
+
+    await coordinator.async_refresh()
+    assert (batch.writes, batch.skipped) == (0, 2)
+
+    client.get_all_data.return_value = _data(1.5)
+    await coordinator.async_refresh()
+    assert (batch.writes, batch.skipped) == (1, 3)
+    assert hass.states.get(power_id).state == "1.5"
+
+    # A disconnected meter makes every meter entity unavailable
+    client.get_all_data.return_value = _data(1.5, connected=False)
+    await coordinator.async_refresh()
+    assert batch.writes == 3
+    assert hass.states.get(power_id).state == "unavailable"
+
+    await platform.async_reset()
+    assert len(batch) == 0
+    assert not coordinator._listeners  # noqa: SLF001
@@ -0,0 +1,89 @@
+"""Test the Jullix battery forecast."""
+
+import pytest
+
+from custom_components.jullix.battery_forecast import BatteryForecast
+
+
+def _data(soc: float | None, running: bool = True) -> dict:
+    """Return coordinator data with a battery state of charge."""
+    return {"inverter": {"running": running, "data": {"battery_SOC": soc}}}
+
+
+def test_no_estimate_without_history():
+    """Test no estimates are available before the slope is known."""
+    forecast = BatteryForecast(reserve=10)
+    assert forecast.rate is None
+    assert forecast.minutes_to_full is None
+    assert forecast.minutes_to_empty is None
+
+    forecast.update(0.0, _data(50))
+    assert forecast.level == 50
+    assert forecast.minutes_to_full is None
+
+
+def test_charging():
+    """Test the time to full while charging at a constant rate."""
+    forecast = BatteryForecast(reserve=10)
+    for minute in range(21):
+        forecast.update(minute * 60.0, _data(40 + minute * 0.5))
+
+    assert forecast.rate == pytest.approx(30)
+    assert forecast.level == pytest.approx(50)
+    assert forecast.minutes_to_full == pytest.approx(100)
+    assert forecast.minutes_to_empty is None
+
+
+def test_discharging_to_reserve():
+    """Test the time to reserve while discharging at a constant rate."""
+    forecast = BatteryForecast(reserve=20)
+    for minute in range(21):
+        forecast.update(minute * 60.0, _data(80 - minute))
+
+    assert forecast.rate == pytest.approx(-60)
+    assert forecast.minutes_to_empty == pytest.approx(40)
+    assert forecast.minutes_to_full is None
+
+
+def test_quantized_state_of_charge():
+    """Test the regression smooths the 1 % resolution of the state of charge."""
+    forecast = BatteryForecast(reserve=10)
+    # Charging 6 % per hour for 6 hours from 20 %, sampled every 10 seconds
+    # with whole percentages
+    for step in range(2160):
+        forecast.update(step * 10.0, _data(float(int(20 + step * 10 / 600))))
+
+    assert forecast.rate == pytest.approx(6, rel=0.1)
+    assert forecast.minutes_to_full == pytest.approx(440, rel=0.1)
+
+
+def test_idle_battery():
+    """Test a constant state of charge has no estimates."""
+    forecast = BatteryForecast(reserve=10)
+    for minute in range(30):
+        forecast.update(minute * 60.0, _data(75))
+
+    assert forecast.rate == pytest.approx(0)
+    assert forecast.minutes_to_full is None
+    assert forecast.minutes_to_empty is None
+
+
+def test_below_reserve():
+    """Test the time to reserve is zero once the reserve is reached."""
+    forecast = BatteryForecast(reserve=10)
+    for minute in range(10):
+        forecast.update(minute * 60.0, _data(12 - minute))
+
+    assert forecast.minutes_to_empty == 0
+
+
+def test_ignored_samples():
+    """Test samples of a stopped inverter or without a level are ignored."""
+    forecast = BatteryForecast(reserve=10)
+    forecast.update(0.0, _data(None))
+    forecast.update(60.0, _data(50, running=False))
+    assert forecast.level is None
+
+    forecast.update(120.0, _data(50))
+    forecast.update(120.0, _data(60))
+    assert forecast.level == 50
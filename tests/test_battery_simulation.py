@@ -0,0 +1,75 @@
+"""Test the battery energy integration against exact integrals."""
+
+import math
+
+import pytest
+
+from custom_components.jullix.tests.benchmarks.battery_energy import (
+    ConstantProfile,
+    SineProfile,
+    SquareProfile,
+    simulate,
+)
+
+DAY = 86400.0
+
+
+def test_constant_profile_exact():
+    """Test a constant charge is integrated exactly."""
+    result = simulate(ConstantProfile(-2.0), DAY)
+    assert result.samples == 8641
+    assert result.charged == pytest.approx(48.0)
+    assert result.discharged == 0.0
+
+
+def test_sine_profile():
+    """Test a smooth profile is integrated within the discretization error."""
+    result = simulate(SineProfile(3.0), 2 * DAY)
+    assert abs(result.charged_error) < 1e-3
+    assert abs(result.discharged_error) < 1e-3
+
+
+def test_jitter_and_missed_polls():
+    """Test jittered and missed polls stay close to the exact integral."""
+    result = simulate(SineProfile(3.0), 7 * DAY, jitter=3.0, miss_rate=0.05, seed=1)
+    assert abs(result.charged_error) < 5e-3
+    assert abs(result.discharged_error) < 5e-3
+
+
+def test_square_profile_switching():
+    """Test sign changes attribute at most one interval to the wrong direction."""
+    result = simulate(SquareProfile(2.0, 1.5), DAY)
+    # One 10 second sample per switch is integrated with the previous power
+    assert abs(result.charged_error) < 0.01
+    assert abs(result.discharged_error) < 0.01
+
+
+def test_restarts_lose_one_interval():
+    """Test restarts only lose the interval between the last and first poll."""
+    result = simulate(ConstantProfile(-2.0), 7 * DAY, restart_every=DAY)
+    lost = 6 * 2.0 * 10 / 3600
+    assert result.charged == pytest.approx(result.expected_charged - lost)
+
+
+def test_deterministic():
+    """Test runs with the same seed give identical results."""
+    first = simulate(SineProfile(3.0), DAY, jitter=3.0, miss_rate=0.1, seed=7)
+    second = simulate(SineProfile(3.0), DAY, jitter=3.0, miss_rate=0.1, seed=7)
+    assert first.charged == second.charged
+    assert first.discharged == second.discharged
+
+
+def test_partial_period_exact():
+    """Test the exact integrals hold within a period."""
+    assert SineProfile(3.0).exact(DAY / 2) == pytest.approx((3.0 * DAY / math.pi / 3600, 0.0))
+    assert SquareProfile(2.0, 1.5).exact(2700.0) == pytest.approx((1.0, 0.375))
+
+
+def test_power_bias_corrected_by_counter():
+    """Test a biased power reading is corrected with a battery counter."""
+    biased = simulate(SineProfile(3.0), 2 * DAY, power_bias=1.03)
+    assert biased.charged_error == pytest.approx(0.03, abs=1e-3)
+
+    result = simulate(SineProfile(3.0), 2 * DAY, power_bias=1.03, counter_resolution=0.1)
+    assert abs(result.charged_error) < 1e-3
+    assert abs(result.discharged_error) < 1e-3
@@ -7,6 +7,7 @@ from custom_components.jullix.binary_sensor import (
     JullixBinarySensorEntityDescription,
 )
 from custom_components.jullix.const import DOMAIN
+from custom_components.jullix.devices import JullixDevices
 from homeassistant.components.binary_sensor import BinarySensorDeviceClass
 
 
@@ -22,6 +23,8 @@ async def test_binary_sensor_on():
     }
     coordinator.config_entry = AsyncMock()
     coordinator.config_entry.entry_id = "test_entry"
+    coordinator.devices = JullixDevices("test_entry")
+    coordinator.devices.update(coordinator.data)
 
     description = JullixBinarySensorEntityDescription(
         key="tariff1",
@@ -49,6 +52,8 @@ async def test_binary_sensor_off():
     }
     coordinator.config_entry = AsyncMock()
     coordinator.config_entry.entry_id = "test_entry"
+    coordinator.devices = JullixDevices("test_entry")
+    coordinator.devices.update(coordinator.data)
 
     description = JullixBinarySensorEntityDescription(
         key="tariff1",
@@ -68,6 +73,8 @@ async def test_binary_sensor_no_data():
     coordinator.data = {}
     coordinator.config_entry = AsyncMock()
     coordinator.config_entry.entry_id = "test_entry"
+    coordinator.devices = JullixDevices("test_entry")
+    coordinator.devices.update(coordinator.data)
 
     description = JullixBinarySensorEntityDescription(
         key="tariff1",
@@ -88,6 +95,8 @@ async def test_binary_sensor_device_info():
     coordinator.data = {"dsmr": {"id": {"value": "123456"}, "connected": True}}
     coordinator.config_entry = AsyncMock()
     coordinator.config_entry.entry_id = "test_entry"
+    coordinator.devices = JullixDevices("test_entry")
+    coordinator.devices.update(coordinator.data)
 
     description = JullixBinarySensorEntityDescription(
         key="tariff1",
@@ -119,6 +128,8 @@ async def test_inverter_binary_sensor():
     }
     coordinator.config_entry = AsyncMock()
     coordinator.config_entry.entry_id = "test_entry"
+    coordinator.devices = JullixDevices("test_entry")
+    coordinator.devices.update(coordinator.data)
 
     description = JullixBinarySensorEntityDescription(
         key="grid-connected",
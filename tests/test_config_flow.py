@@ -1,12 +1,31 @@
 """Test the Jullix config flow."""
 
+from ipaddress import ip_address
 from unittest.mock import AsyncMock, patch
 
 from custom_components.jullix.api import JullixConnectionError
-from custom_components.jullix.const import CONF_HOST, DOMAIN
+from custom_components.jullix.const import (
+    CONF_BATTERY_RESERVE,
+    CONF_DSMR_SCAN_INTERVAL,
+    CONF_HOST,
+    CONF_PUSH,
+    CONF_READ_TIMEOUT,
+    DEFAULT_BATTERY_RESERVE,
+    DEFAULT_READ_TIMEOUT,
+    DOMAIN,
+)
+from custom_components.jullix.discovery import DiscoveredDevice
 from homeassistant import config_entries
+from homeassistant.const import CONF_WEBHOOK_ID
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.helpers.service_info.dhcp import DhcpServiceInfo
+from homeassistant.helpers.service_info.zeroconf import ZeroconfServiceInfo
+from tests.common import MockConfigEntry
+
+DHCP_INFO = DhcpServiceInfo(
+    ip="192.168.1.50", hostname="jullix-1234", macaddress="aabbccddeeff"
+)
 
 
 async def test_form(hass: HomeAssistant, mock_jullix_api: AsyncMock) -> None:
@@ -44,8 +63,7 @@ async def test_form_cannot_connect(hass: HomeAssistant) -> None:
         patch("custom_components.jullix.config_flow.JullixApiClient") as mock_api,
     ):
         instance = mock_api.return_value
-        instance.get_all_data = AsyncMock(side_effect=JullixConnectionError)
-        instance.test_connection = AsyncMock(side_effect=JullixConnectionError)
+        instance.probe = AsyncMock(side_effect=JullixConnectionError)
         result2 = await hass.config_entries.flow.async_configure(
             result["flow_id"],
             {CONF_HOST: "192.168.1.100"},
@@ -66,8 +84,7 @@ async def test_form_unexpected_exception(hass: HomeAssistant) -> None:
         patch("custom_components.jullix.config_flow.JullixApiClient") as mock_api,
     ):
         instance = mock_api.return_value
-        instance.get_all_data = AsyncMock(side_effect=Exception)
-        instance.test_connection = AsyncMock(side_effect=Exception)
+        instance.probe = AsyncMock(side_effect=Exception)
         result2 = await hass.config_entries.flow.async_configure(
             result["flow_id"],
             {CONF_HOST: "192.168.1.100"},
@@ -75,3 +92,173 @@ async def test_form_unexpected_exception(hass: HomeAssistant) -> None:
 
     assert result2["type"] is FlowResultType.FORM
     assert result2["errors"] == {"base": "unknown"}
+
+
+async def test_options_flow(
+    hass: HomeAssistant, mock_config_entry, mock_setup_entry: AsyncMock
+) -> None:
+    """Test enabling push mode through the options flow."""
+    mock_config_entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(mock_config_entry.entry_id)
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "init"
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_PUSH: True}
+    )
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert mock_config_entry.options[CONF_PUSH] is True
+    assert mock_config_entry.options[CONF_BATTERY_RESERVE] == DEFAULT_BATTERY_RESERVE
+    assert mock_config_entry.options[CONF_DSMR_SCAN_INTERVAL] == 10
+    assert mock_config_entry.options[CONF_READ_TIMEOUT] == DEFAULT_READ_TIMEOUT
+    webhook_id = mock_config_entry.options[CONF_WEBHOOK_ID]
+
+    # The webhook ID is kept when the options are saved again
+    result = await hass.config_entries.options.async_init(mock_config_entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_PUSH: False}
+    )
+    assert mock_config_entry.options[CONF_WEBHOOK_ID] == webhook_id
+
+
+async def test_options_flow_invalid_thresholds(
+    hass: HomeAssistant, mock_config_entry, mock_setup_entry: AsyncMock
+) -> None:
+    """Test invalid thresholds are rejected and valid ones are stored."""
+    mock_config_entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(mock_config_entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {"thresholds": [{"name": "missing_limit", "key": "meter.power"}]}
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"thresholds": "invalid_thresholds"}
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {"thresholds": [{"name": "pv", "key": "inverter.pv_power", "above": 0.05}]},
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert mock_config_entry.options["thresholds"] == [
+        {"name": "pv", "key": "inverter.pv_power", "above": 0.05, "hysteresis": 0.0}
+    ]
+
+
+async def test_form_scan(hass: HomeAssistant, mock_setup_entry: AsyncMock) -> None:
+    """Test an empty host searches the network and creates the picked device."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    devices = [
+        DiscoveredDevice("192.168.1.20", "1SAG3200415379"),
+        DiscoveredDevice("192.168.1.21", None),
+    ]
+    with (
+        patch("homeassistant.helpers.aiohttp_client.async_get_clientsession"),
+        patch("custom_components.jullix.config_flow.async_get_scan_networks"),
+        patch("custom_components.jullix.config_flow.async_scan", return_value=devices),
+    ):
+        result = await hass.config_entries.flow.async_configure(result["flow_id"], {})
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "scan"
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_HOST: "192.168.1.20"}
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["data"] == {CONF_HOST: "192.168.1.20"}
+    assert result["result"].unique_id == "1SAG3200415379"
+
+
+async def test_form_scan_nothing_found(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test configured devices are not offered again."""
+    mock_config_entry.add_to_hass(hass)
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    devices = [DiscoveredDevice("192.168.4.167", "1SAG3200415379")]
+    with (
+        patch("homeassistant.helpers.aiohttp_client.async_get_clientsession"),
+        patch("custom_components.jullix.config_flow.async_get_scan_networks"),
+        patch("custom_components.jullix.config_flow.async_scan", return_value=devices),
+    ):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {CONF_HOST: ""}
+        )
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "user"
+    assert result["errors"] == {"base": "no_devices_found"}
+
+
+async def test_dhcp_updates_moved_device(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test a configured device found at a new address gets its host updated."""
+    mock_config_entry.add_to_hass(hass)
+    with (
+        patch("homeassistant.helpers.aiohttp_client.async_get_clientsession"),
+        patch(
+            "custom_components.jullix.config_flow.async_probe",
+            return_value=DiscoveredDevice("192.168.1.50", "1SAG3200415379"),
+        ),
+        patch("custom_components.jullix.async_setup_entry", return_value=True),
+    ):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": config_entries.SOURCE_DHCP}, data=DHCP_INFO
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] is FlowResultType.ABORT
+    assert result["reason"] == "already_configured"
+    assert mock_config_entry.data[CONF_HOST] == "192.168.1.50"
+
+
+async def test_dhcp_other_device(hass: HomeAssistant) -> None:
+    """Test a host that is not a Jullix device is ignored."""
+    with (
+        patch("homeassistant.helpers.aiohttp_client.async_get_clientsession"),
+        patch("custom_components.jullix.config_flow.async_probe", return_value=None),
+    ):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": config_entries.SOURCE_DHCP}, data=DHCP_INFO
+        )
+
+    assert result["type"] is FlowResultType.ABORT
+    assert result["reason"] == "not_jullix_device"
+
+
+async def test_zeroconf_confirm(hass: HomeAssistant, mock_setup_entry: AsyncMock) -> None:
+    """Test a new device found by zeroconf is added after confirmation."""
+    info = ZeroconfServiceInfo(
+        ip_address=ip_address("192.168.1.60"),
+        ip_addresses=[ip_address("192.168.1.60")],
+        hostname="jullix-1234.local.",
+        name="jullix-1234._http._tcp.local.",
+        port=80,
+        properties={},
+        type="_http._tcp.local.",
+    )
+    with (
+        patch("homeassistant.helpers.aiohttp_client.async_get_clientsession"),
+        patch(
+            "custom_components.jullix.config_flow.async_probe",
+            return_value=DiscoveredDevice("192.168.1.60", "METER2"),
+        ),
+    ):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": config_entries.SOURCE_ZEROCONF}, data=info
+        )
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "discovery_confirm"
+
+    result = await hass.config_entries.flow.async_configure(result["flow_id"], {})
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["data"] == {CONF_HOST: "192.168.1.60"}
+    assert result["result"].unique_id == "METER2"
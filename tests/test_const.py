@@ -5,13 +5,15 @@ from custom_components.jullix.const import (
     DSMR_SENSORS,
     INVERTER_BINARY_SENSORS,
     INVERTER_SENSORS,
+    OPTIONAL_INVERTER_KEYS,
 )
 
 
 def test_sensor_descriptions():
     """Test that sensor descriptions are defined."""
     assert len(DSMR_SENSORS) == 6
-    assert len(INVERTER_SENSORS) == 11
+    # 11 fixed sensors, 2 more phases of voltage and current, 4 PV strings of 3
+    assert len(INVERTER_SENSORS) == 27
 
     # Check DSMR sensors have required attributes
     for desc in DSMR_SENSORS:
@@ -20,6 +22,15 @@ def test_sensor_descriptions():
         assert desc.translation_key is not None
 
 
+def test_inverter_families():
+    """Test phase and PV string sensors are generated."""
+    keys = {desc.key for desc in INVERTER_SENSORS}
+    assert {"voltage_l3", "current_l3", "pv4_power", "pv4_voltage"} <= keys
+    assert "voltage_l2" in OPTIONAL_INVERTER_KEYS
+    assert "voltage_l1" not in OPTIONAL_INVERTER_KEYS
+    assert "pv_power" not in OPTIONAL_INVERTER_KEYS
+
+
 def test_binary_sensor_descriptions():
     """Test that binary sensor descriptions are defined."""
     assert len(DSMR_BINARY_SENSORS) == 2
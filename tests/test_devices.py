@@ -0,0 +1,120 @@
+"""Test the Jullix device identities."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from custom_components.jullix import JullixCoordinator
+from custom_components.jullix.const import DOMAIN
+from custom_components.jullix.devices import JullixDevices
+from custom_components.jullix.metrics import JullixMetrics
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from tests.common import MockConfigEntry
+
+
+def _data(meter_id: str | None, model: str = "SOFARHYD4000EP") -> dict:
+    """Return coordinator data with a meter ID and inverter model."""
+    dsmr = {"connected": True} if meter_id is None else {"id": meter_id, "connected": True}
+    return {"dsmr": dsmr, "inverter": {"model": model, "desc": "Sofar", "data": {}}}
+
+
+def test_identities_shared_until_changed():
+    """Test device info is built once and only rebuilt on changes."""
+    devices = JullixDevices("entry")
+    assert devices.update(_data("METER1")) is False
+    meter, inverter = devices.meter, devices.inverter
+    assert meter["identifiers"] == {(DOMAIN, "meter_METER1")}
+    assert inverter["identifiers"] == {(DOMAIN, "inverter_entry")}
+    assert inverter["manufacturer"] == "Sofarhyd4000ep"
+    assert devices.unique_id("meter", "power") == "METER1_power"
+    assert devices.unique_id("inverter", "pv_power") == "entry_pv_power"
+
+    assert devices.update(_data("METER1")) is False
+    assert devices.device_info("meter") is meter
+    assert devices.device_info("inverter") is inverter
+
+    # A payload without meter ID keeps the known one
+    assert devices.update(_data(None)) is False
+    assert devices.meter is meter
+
+    assert devices.update(_data("METER1", model="SOFARHYD6000EP")) is True
+    assert devices.meter is meter
+    assert devices.inverter["model"] == "SOFARHYD6000EP"
+
+    assert devices.update(_data("METER2", model="SOFARHYD6000EP")) is True
+    assert devices.meter["identifiers"] == {(DOMAIN, "meter_METER2")}
+
+
+def test_unknown_meter_id_replaced():
+    """Test a meter that connects after startup replaces the unknown ID."""
+    devices = JullixDevices("entry")
+    devices.update(_data(None))
+    assert devices.unique_id("meter", "power") == "unknown_power"
+    assert devices.update(_data("METER1")) is True
+    assert devices.unique_id("meter", "power") == "METER1_power"
+
+
+async def test_registries_updated_for_new_meter(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test meter entities and the device move to a new meter ID in one pass."""
+    mock_config_entry.add_to_hass(hass)
+    device_registry = dr.async_get(hass)
+    entity_registry = er.async_get(hass)
+    entry_id = mock_config_entry.entry_id
+    meter_device = device_registry.async_get_or_create(
+        config_entry_id=entry_id, identifiers={(DOMAIN, "meter_METER1")}
+    )
+    inverter_device = device_registry.async_get_or_create(
+        config_entry_id=entry_id,
+        identifiers={(DOMAIN, f"inverter_{entry_id}")},
+        model="SOFARHYD4000EP",
+    )
+    power = entity_registry.async_get_or_create(
+        "sensor", DOMAIN, "METER1_power", config_entry=mock_config_entry
+    )
+    connected = entity_registry.async_get_or_create(
+        "binary_sensor", DOMAIN, "METER1_connected", config_entry=mock_config_entry
+    )
+    pv_power = entity_registry.async_get_or_create(
+        "sensor", DOMAIN, f"{entry_id}_pv_power", config_entry=mock_config_entry
+    )
+
+    devices = JullixDevices(entry_id)
+    devices.update(_data("METER1"))
+    assert devices.async_update_registries(hass) is False
+    assert entity_registry.async_get(power.entity_id).unique_id == "METER1_power"
+
+    devices.update(_data("METER2", model="SOFARHYD6000EP"))
+    assert devices.async_update_registries(hass) is True
+    assert entity_registry.async_get(power.entity_id).unique_id == "METER2_power"
+    assert entity_registry.async_get(connected.entity_id).unique_id == "METER2_connected"
+    assert entity_registry.async_get(pv_power.entity_id).unique_id == f"{entry_id}_pv_power"
+    assert device_registry.async_get(meter_device.id).identifiers == {
+        (DOMAIN, "meter_METER2")
+    }
+    assert device_registry.async_get(inverter_device.id).model == "SOFARHYD6000EP"
+
+    # Nothing is moved again until the meter changes
+    assert devices.async_update_registries(hass) is False
+
+
+async def test_coordinator_reloads_on_meter_change(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test a meter swap reloads the entry to recreate its entities."""
+    mock_config_entry.add_to_hass(hass)
+    client = MagicMock()
+    client.metrics = JullixMetrics()
+    client.get_all_data = AsyncMock(return_value=_data("METER1"))
+    coordinator = JullixCoordinator(hass, client, mock_config_entry)
+    coordinator.async_add_listener(MagicMock())
+
+    with patch.object(hass.config_entries, "async_schedule_reload") as mock_reload:
+        await coordinator.async_refresh()
+        await coordinator.async_refresh()
+        mock_reload.assert_not_called()
+
+        client.get_all_data.return_value = _data("METER2")
+        await coordinator.async_refresh()
+        mock_reload.assert_called_once_with(mock_config_entry.entry_id)
+    assert coordinator.devices.meter_id == "METER2"
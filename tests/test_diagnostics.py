@@ -0,0 +1,28 @@
+"""Test the Jullix diagnostics."""
+
+from unittest.mock import AsyncMock
+
+from custom_components.jullix.diagnostics import async_get_config_entry_diagnostics
+from homeassistant.components.diagnostics import REDACTED
+from homeassistant.core import HomeAssistant
+from tests.common import MockConfigEntry
+
+
+async def test_diagnostics(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_jullix_api: AsyncMock,
+    mock_aiohttp_session,
+) -> None:
+    """Test diagnostics redact the host and meter ID and include metrics."""
+    mock_config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, mock_config_entry)
+
+    assert diagnostics["entry"]["data"]["host"] == REDACTED
+    assert diagnostics["data"]["dsmr"]["id"] == REDACTED
+    assert diagnostics["data"]["dsmr"]["power"] == 0.878
+    assert "endpoints" in diagnostics["metrics"]
+    assert diagnostics["metrics"]["update_duration"]["count"] == 1
@@ -0,0 +1,125 @@
+"""Test the Jullix network discovery."""
+
+import asyncio
+from collections.abc import AsyncIterator
+from ipaddress import IPv4Network
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import aiohttp
+
+from custom_components.jullix.discovery import (
+    DiscoveredDevice,
+    async_get_scan_networks,
+    async_probe,
+    async_scan,
+)
+from homeassistant.core import HomeAssistant
+
+DSMR_BODY = b'{"power": {"value": 0.5}, "id": {"value": "1SAG3200415379"}, "connected": true}'
+
+
+async def _chunks(body: bytes, size: int) -> AsyncIterator[bytes]:
+    """Yield a response body in chunks."""
+    for start in range(0, len(body), size):
+        yield body[start : start + size]
+
+
+def mock_session(bodies: dict[str, bytes]) -> MagicMock:
+    """Return a session answering the DSMR status of some hosts.
+
+    Other hosts fail to connect. The highest number of requests in flight
+    is kept in the session's max_concurrent attribute.
+    """
+    session = MagicMock()
+    session.in_flight = 0
+    session.max_concurrent = 0
+
+    def _get(url: str) -> MagicMock:
+        host = url.removeprefix("http://").split("/", 1)[0]
+        response = MagicMock()
+        response.raise_for_status = MagicMock()
+        response.content.iter_chunked = lambda size: _chunks(bodies.get(host, b""), size)
+
+        async def _enter(*args):
+            session.in_flight += 1
+            session.max_concurrent = max(session.max_concurrent, session.in_flight)
+            await asyncio.sleep(0)
+            session.in_flight -= 1
+            if host not in bodies:
+                raise aiohttp.ClientConnectionError
+            return response
+
+        response.__aenter__ = _enter
+        response.__aexit__ = AsyncMock(return_value=None)
+        return response
+
+    session.get = MagicMock(side_effect=_get)
+    return session
+
+
+async def test_probe_jullix_device():
+    """Test a Jullix device is identified by its meter status."""
+    session = mock_session({"192.168.1.20": DSMR_BODY})
+    assert await async_probe(session, "192.168.1.20") == DiscoveredDevice(
+        "192.168.1.20", "1SAG3200415379"
+    )
+    session.get.assert_called_once_with("http://192.168.1.20/api/dsmr/status")
+
+
+async def test_probe_other_devices():
+    """Test hosts that do not answer or are not Jullix devices are skipped."""
+    session = mock_session(
+        {"192.168.1.2": b"<html></html>", "192.168.1.3": b'{"status": "ok"}'}
+    )
+    assert await async_probe(session, "192.168.1.1") is None
+    assert await async_probe(session, "192.168.1.2") is None
+    assert await async_probe(session, "192.168.1.3") is None
+
+
+async def test_probe_without_meter_id():
+    """Test a Jullix device without a connected meter has no meter ID."""
+    session = mock_session({"192.168.1.20": b'{"connected": false}'})
+    assert await async_probe(session, "192.168.1.20") == DiscoveredDevice("192.168.1.20", None)
+
+
+async def test_probe_timeout():
+    """Test a host that does not answer in time is skipped."""
+    session = MagicMock()
+    response = MagicMock()
+    response.__aenter__ = AsyncMock(side_effect=TimeoutError)
+    response.__aexit__ = AsyncMock(return_value=None)
+    session.get = MagicMock(return_value=response)
+    assert await async_probe(session, "192.168.1.20") is None
+
+
+async def test_scan_bounded_concurrency():
+    """Test a /24 is probed with bounded concurrency."""
+    session = mock_session({"192.168.1.20": DSMR_BODY, "192.168.1.200": DSMR_BODY})
+    with patch("custom_components.jullix.discovery.DISCOVERY_CONCURRENCY", 16):
+        devices = await async_scan(session, [IPv4Network("192.168.1.0/24")])
+
+    assert [device.host for device in devices] == ["192.168.1.20", "192.168.1.200"]
+    assert session.get.call_count == 254
+    assert session.max_concurrent == 16
+
+
+async def test_scan_networks(hass: HomeAssistant) -> None:
+    """Test local networks are limited to a /24 and loopback is skipped."""
+    adapters = [
+        {
+            "enabled": True,
+            "ipv4": [
+                {"address": "10.0.5.7", "network_prefix": 16},
+                {"address": "192.168.1.10", "network_prefix": 28},
+            ],
+        },
+        {"enabled": True, "ipv4": [{"address": "127.0.0.1", "network_prefix": 8}]},
+        {"enabled": False, "ipv4": [{"address": "172.16.0.2", "network_prefix": 24}]},
+    ]
+    with patch(
+        "custom_components.jullix.discovery.network.async_get_adapters",
+        return_value=adapters,
+    ):
+        networks = await async_get_scan_networks(hass)
+
+    assert networks == [IPv4Network("10.0.5.0/24"), IPv4Network("192.168.1.0/28")]
@@ -0,0 +1,99 @@
+"""Test the Jullix energy balance."""
+# ruff: noqa: SLF001
+
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.jullix.const import ENERGY_BALANCE_SAVE_DELAY
+from custom_components.jullix.energy_balance import EnergyBalance
+from homeassistant.core import HomeAssistant
+
+
+def _data(produced: float, consumed: float, imported: float, exported: float) -> dict:
+    """Return coordinator data with the four energy counters."""
+    return {
+        "dsmr": {
+            "energy-in": {"value": imported},
+            "energy-out": {"value": exported},
+        },
+        "inverter": {
+            "running": True,
+            "data": {"energy_produced": produced, "energy_consumed": consumed},
+        },
+    }
+
+
+async def test_ratios_from_deltas(hass: HomeAssistant) -> None:
+    """Test ratios are computed from counter increases only."""
+    balance = EnergyBalance(hass, "test_entry")
+    now = datetime(2024, 6, 1, 12, 0)
+
+    balance.async_process(now, _data(1000, 2000, 5000, 800))
+    assert balance.periods["today"].self_consumption is None
+    assert balance.periods["today"].self_sufficiency is None
+
+    # 10 kWh produced of which 4 exported, 8 consumed of which 2 imported
+    balance.async_process(now, _data(1010, 2008, 5002, 804))
+    today = balance.periods["today"]
+    assert today.self_consumption == pytest.approx(60)
+    assert today.self_sufficiency == pytest.approx(75)
+    assert balance.periods["lifetime"].produced == pytest.approx(10)
+
+
+async def test_period_rollover(hass: HomeAssistant) -> None:
+    """Test today and this month restart at local day and month boundaries."""
+    balance = EnergyBalance(hass, "test_entry")
+
+    balance.async_process(datetime(2024, 6, 30, 23, 0), _data(0, 0, 0, 0))
+    balance.async_process(datetime(2024, 6, 30, 23, 30), _data(4, 4, 1, 1))
+    balance.async_process(datetime(2024, 7, 1, 0, 30), _data(6, 6, 1, 1))
+
+    assert balance.periods["today"].produced == pytest.approx(2)
+    assert balance.periods["month"].produced == pytest.approx(2)
+    assert balance.periods["lifetime"].produced == pytest.approx(6)
+
+    balance.async_process(datetime(2024, 7, 2, 0, 30), _data(7, 7, 1, 1))
+    assert balance.periods["today"].produced == pytest.approx(1)
+    assert balance.periods["month"].produced == pytest.approx(3)
+
+
+async def test_missing_and_reset_counters(hass: HomeAssistant) -> None:
+    """Test missing readings are caught up and counter resets are skipped."""
+    balance = EnergyBalance(hass, "test_entry")
+    now = datetime(2024, 6, 1, 12, 0)
+
+    balance.async_process(now, _data(100, 100, 100, 100))
+    balance.async_process(now, {"inverter": {"running": False}})
+    balance.async_process(now, _data(105, 100, 100, 100))
+    assert balance.periods["today"].produced == pytest.approx(5)
+
+    balance.async_process(now, _data(1, 100, 100, 100))
+    balance.async_process(now, _data(3, 100, 100, 100))
+    assert balance.periods["today"].produced == pytest.approx(7)
+
+
+async def test_persistence(hass: HomeAssistant) -> None:
+    """Test totals and last readings are saved and restored."""
+    balance = EnergyBalance(hass, "test_entry")
+    now = datetime(2024, 6, 1, 12, 0)
+    with patch.object(balance._store, "async_delay_save") as mock_save:
+        balance.async_process(now, _data(100, 100, 100, 100))
+        mock_save.assert_not_called()
+        balance.async_process(now, _data(110, 105, 101, 103))
+    mock_save.assert_called_once()
+    data_to_save, delay = mock_save.call_args.args
+    assert delay == ENERGY_BALANCE_SAVE_DELAY
+    stored = data_to_save()
+    assert stored["periods"]["today"]["produced"] == 10
+
+    restored = EnergyBalance(hass, "test_entry")
+    with patch.object(restored._store, "async_load", return_value=stored):
+        await restored.async_load()
+    assert restored.periods["month"].exported == pytest.approx(3)
+
+    # Energy counted while stopped is added on the first update
+    with patch.object(restored._store, "async_delay_save"):
+        restored.async_process(now, _data(120, 105, 101, 103))
+    assert restored.periods["today"].produced == pytest.approx(20)
@@ -0,0 +1,141 @@
+"""Test the Jullix hourly statistics aggregator."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+from custom_components.jullix.external_statistics import HourlyStatisticsAggregator
+from homeassistant.core import HomeAssistant
+
+
+def _data(power: float, soc: float) -> dict:
+    """Return coordinator data with a grid power and battery level."""
+    return {
+        "dsmr": {"power": {"value": power}, "energy-in": {"value": 100.0}},
+        "inverter": {"data": {"battery_SOC": soc, "ready": True}},
+    }
+
+
+async def test_hourly_statistics_imported(hass: HomeAssistant) -> None:
+    """Test an hour of samples is imported when the next hour starts."""
+    hass.config.components.add("recorder")
+    aggregator = HourlyStatisticsAggregator(hass, "01ABCDEF", "Jullix (host)")
+    start = datetime(2026, 10, 19, 10, tzinfo=UTC)
+
+    with patch(
+        "custom_components.jullix.external_statistics.async_add_external_statistics"
+    ) as mock_add:
+        aggregator.async_add(start, _data(1.0, 50))
+        aggregator.async_add(start + timedelta(minutes=20), _data(3.0, 52))
+        aggregator.async_add(start + timedelta(minutes=40), _data(2.0, 54))
+        assert mock_add.call_count == 0
+
+        aggregator.async_add(start + timedelta(hours=1), _data(5.0, 55))
+
+    imported = {
+        call.args[1]["statistic_id"]: (call.args[1], call.args[2][0])
+        for call in mock_add.call_args_list
+    }
+    # Only measurement keys are aggregated, counters keep their sensor statistics
+    assert set(imported) == {
+        "jullix:01abcdef_meter_power",
+        "jullix:01abcdef_inverter_battery_soc",
+    }
+
+    metadata, statistics = imported["jullix:01abcdef_meter_power"]
+    assert metadata["source"] == "jullix"
+    assert metadata["unit_of_measurement"] == "kW"
+    assert metadata["name"] == "Jullix (host) Grid power"
+    assert statistics["start"] == start
+    # Each value is held for the maximum of 10 minutes
+    assert statistics["mean"] == 2.0
+    assert statistics["min"] == 1.0
+    assert statistics["max"] == 3.0
+
+
+async def test_statistics_skipped_without_recorder(hass: HomeAssistant) -> None:
+    """Test nothing is imported when the recorder is not loaded."""
+    aggregator = HourlyStatisticsAggregator(hass, "entry", "Jullix")
+    start = datetime(2026, 10, 19, 10, tzinfo=UTC)
+
+    with patch(
+        "custom_components.jullix.external_statistics.async_add_external_statistics"
+    ) as mock_add:
+        aggregator.async_add(start, _data(1.0, 50))
+        aggregator.async_add(start + timedelta(hours=1), _data(1.0, 50))
+
+    mock_add.assert_not_called()
+
+
+async def test_hourly_mean_weighted_by_time(hass: HomeAssistant) -> None:
+    """Test bursts of samples do not outweigh a value held for longer."""
+    hass.config.components.add("recorder")
+    aggregator = HourlyStatisticsAggregator(hass, "entry", "Jullix")
+    start = datetime(2026, 10, 19, 10, tzinfo=UTC)
+
+    with patch(
+        "custom_components.jullix.external_statistics.async_add_external_statistics"
+    ) as mock_add:
+        aggregator.async_add(start, _data(1.0, 50))
+        # A burst of P1 telegrams in the last minute of the hour
+        for second in range(60):
+            aggregator.async_add(
+                start + timedelta(minutes=59, seconds=second), _data(7.0, 50)
+            )
+        aggregator.async_add(start + timedelta(hours=1), _data(7.0, 50))
+
+    statistics = {
+        call.args[1]["statistic_id"]: call.args[2][0]
+        for call in mock_add.call_args_list
+    }["jullix:entry_meter_power"]
+    # 1.0 held for the maximum 10 minutes, 7.0 for the last minute
+    assert statistics["mean"] == (1.0 * 600 + 7.0 * 60) / 660
+    assert statistics["max"] == 7.0
+
+
+async def test_hold_carries_into_next_hour(hass: HomeAssistant) -> None:
+    """Test a value reported before the hour is held into the next hour."""
+    hass.config.components.add("recorder")
+    aggregator = HourlyStatisticsAggregator(hass, "entry", "Jullix")
+    start = datetime(2026, 10, 19, 10, 58, tzinfo=UTC)
+
+    with patch(
+        "custom_components.jullix.external_statistics.async_add_external_statistics"
+    ) as mock_add:
+        aggregator.async_add(start, _data(4.0, 50))
+        aggregator.async_add(start + timedelta(minutes=4), _data(1.0, 50))
+        aggregator.async_add(start + timedelta(hours=1, minutes=2), _data(1.0, 50))
+
+    means = [
+        call.args[2][0]["mean"]
+        for call in mock_add.call_args_list
+        if call.args[1]["statistic_id"] == "jullix:entry_meter_power"
+    ]
+    # 10:00-11:00 only saw 4.0, 11:00 held 4.0 for two minutes then 1.0 for 10
+    assert means == [4.0, (4.0 * 120 + 1.0 * 600) / 720]
+
+
+async def test_hour_in_progress_survives_reload(hass: HomeAssistant) -> None:
+    """Test the hour in progress is restored from storage."""
+    hass.config.components.add("recorder")
+    start = datetime(2026, 10, 19, 10, tzinfo=UTC)
+    aggregator = HourlyStatisticsAggregator(hass, "entry", "Jullix")
+    aggregator.async_add(start, _data(2.0, 50))
+    aggregator.async_add(start + timedelta(minutes=5), _data(4.0, 50))
+    await aggregator.async_save()
+
+    restored = HourlyStatisticsAggregator(hass, "entry", "Jullix")
+    await restored.async_load()
+    with patch(
+        "custom_components.jullix.external_statistics.async_add_external_statistics"
+    ) as mock_add:
+        restored.async_add(start + timedelta(minutes=10), _data(4.0, 50))
+        restored.async_add(start + timedelta(hours=1), _data(4.0, 50))
+
+    statistics = {
+        call.args[1]["statistic_id"]: call.args[2][0]
+        for call in mock_add.call_args_list
+    }["jullix:entry_meter_power"]
+    assert statistics["start"] == start
+    assert statistics["min"] == 2.0
+    # 2.0 for 5 minutes, then 4.0 held for 5 and 10 minutes
+    assert statistics["mean"] == (2.0 * 300 + 4.0 * 900) / 1200
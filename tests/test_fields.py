@@ -0,0 +1,118 @@
+"""Test the Jullix coordinator data accessors."""
+
+from custom_components.jullix.fields import (
+    SENSOR_FIELDS,
+    FieldTable,
+    compact_payload,
+    get_meter_id,
+    get_numeric_value,
+    iter_numeric_values,
+)
+
+DATA = {
+    "dsmr": {
+        "power": {"value": 0.878, "units": "kW"},
+        "id": {"value": "1SAG3200415379"},
+        "connected": True,
+    },
+    "inverter": {
+        "running": True,
+        "data": {"voltage_l1": 232.7, "voltage_l2": 231.9, "ready": True},
+    },
+}
+
+
+def test_field_table_extract():
+    """Test all fields are extracted into a flat list in table order."""
+    table = FieldTable(
+        (
+            ("inverter", "voltage_l2"),
+            ("meter", "power"),
+            ("inverter", "voltage_l3"),
+            ("meter", "id"),
+        )
+    )
+    assert table.fields == (
+        ("meter", "power"),
+        ("meter", "id"),
+        ("inverter", "voltage_l2"),
+        ("inverter", "voltage_l3"),
+    )
+    values = table.extract(DATA)
+    assert values == [0.878, "1SAG3200415379", 231.9, None]
+    assert values[table.index[("inverter", "voltage_l2")]] == 231.9
+    assert table.extract({}) == [None, None, None, None]
+
+
+def test_sensor_fields_cover_descriptions():
+    """Test the sensor field table covers phase families."""
+    values = SENSOR_FIELDS.extract(DATA)
+    assert values[SENSOR_FIELDS.index[("inverter", "voltage_l2")]] == 231.9
+    assert values[SENSOR_FIELDS.index[("meter", "power")]] == 0.878
+
+
+def test_numeric_accessors():
+    """Test numeric values are found and booleans and strings skipped."""
+    assert list(iter_numeric_values(DATA)) == [
+        ("meter", "power", 0.878),
+        ("inverter", "voltage_l1", 232.7),
+        ("inverter", "voltage_l2", 231.9),
+    ]
+    assert get_numeric_value(DATA, "meter", "power") == 0.878
+    assert get_numeric_value(DATA, "meter", "id") is None
+    assert get_numeric_value(DATA, "inverter", "ready") is None
+
+
+def test_compact_payload():
+    """Test compact data keeps read and numeric fields without wrappers."""
+    data = {
+        "dsmr": {
+            **DATA["dsmr"],
+            "tariff": {"value": "Yes", "title": "Tariff", "units": ""},
+            "hw_disabled": False,
+            "new_counter": {"value": 12, "title": "New", "units": "kWh"},
+        },
+        "inverter": {
+            "model": "SOFARHYD4000EP",
+            "desc": "Sofar HYD 4000-EP",
+            "firmware": "V1.2",
+            **DATA["inverter"],
+            "data": {**DATA["inverter"]["data"], "mode": "auto", "charging": False},
+        },
+    }
+    compact = compact_payload(data)
+    assert compact == {
+        "dsmr": {
+            "power": 0.878,
+            "id": "1SAG3200415379",
+            "connected": True,
+            "new_counter": 12,
+        },
+        "inverter": {
+            "model": "SOFARHYD4000EP",
+            "desc": "Sofar HYD 4000-EP",
+            "running": True,
+            "data": {
+                "voltage_l1": 232.7,
+                "voltage_l2": 231.9,
+                "ready": True,
+                "charging": False,
+            },
+        },
+    }
+    assert compact_payload(compact) == compact
+    assert SENSOR_FIELDS.extract(compact) == SENSOR_FIELDS.extract(data)
+    assert list(iter_numeric_values(compact)) == list(iter_numeric_values(data))
+
+
+def test_compact_payload_drops_unknown_keys():
+    """Test top level keys of pushed payloads, such as a timestamp, are dropped."""
+    compact = compact_payload({"dsmr": {}, "timestamp": "2024-06-01T12:00:00"})
+    assert compact == {"dsmr": {}, "inverter": {"data": {}}}
+
+
+def test_get_meter_id():
+    """Test the meter ID is read from raw and compact data."""
+    assert get_meter_id(DATA) == "1SAG3200415379"
+    assert get_meter_id(compact_payload(DATA)) == "1SAG3200415379"
+    assert get_meter_id({}) == "unknown"
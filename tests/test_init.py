@@ -1,8 +1,18 @@
 """Test the Jullix integration initialization."""
 
+from datetime import timedelta
 from unittest.mock import AsyncMock, patch
 
 from custom_components.jullix.api import JullixConnectionError
+from custom_components.jullix.const import (
+    API_DSMR_STATUS,
+    API_INVERTER_STATUS,
+    CONF_DSMR_SCAN_INTERVAL,
+    CONF_INVERTER_SCAN_INTERVAL,
+    CONF_LONG_TERM_STATISTICS,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_READ_TIMEOUT,
+)
 from homeassistant.config_entries import ConfigEntry, ConfigEntryState
 from homeassistant.core import HomeAssistant
 from tests.common import MockConfigEntry
@@ -62,3 +72,48 @@ async def test_unload_entry(
         await hass.async_block_till_done()
 
     assert mock_config_entry.state is ConfigEntryState.NOT_LOADED
+
+
+async def test_options_applied_without_reload(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_jullix_api: AsyncMock,
+    mock_aiohttp_session,
+) -> None:
+    """Test polling and request options are applied to the running entry."""
+    mock_config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = mock_config_entry.runtime_data
+    client = coordinator.client
+
+    with patch.object(hass.config_entries, "async_reload") as mock_reload:
+        hass.config_entries.async_update_entry(
+            mock_config_entry,
+            options={
+                CONF_DSMR_SCAN_INTERVAL: 5,
+                CONF_INVERTER_SCAN_INTERVAL: 60,
+                CONF_READ_TIMEOUT: 20.0,
+                CONF_MAX_CONCURRENT_REQUESTS: 1,
+            },
+        )
+        await hass.async_block_till_done()
+        mock_reload.assert_not_called()
+
+    assert mock_config_entry.runtime_data is coordinator
+    assert coordinator.update_interval == timedelta(seconds=5)
+    client.configure.assert_called_with(
+        {API_DSMR_STATUS: 5, API_INVERTER_STATUS: 60},
+        connect_timeout=5,
+        read_timeout=20.0,
+        max_concurrent=1,
+    )
+
+    # Other options set the entry up differently and still reload it
+    with patch.object(hass.config_entries, "async_reload") as mock_reload:
+        hass.config_entries.async_update_entry(
+            mock_config_entry,
+            options={**mock_config_entry.options, CONF_LONG_TERM_STATISTICS: True},
+        )
+        await hass.async_block_till_done()
+        mock_reload.assert_called_once_with(mock_config_entry.entry_id)
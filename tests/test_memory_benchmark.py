@@ -0,0 +1,17 @@
+"""Test the coordinator data memory benchmark."""
+
+from custom_components.jullix.tests.benchmarks.memory import load_bodies, measure
+
+
+def test_load_bodies_extra_fields():
+    """Test extra fields are added to both responses."""
+    dsmr_body, inverter_body = load_bodies(extra_fields=3)
+    assert b'"field_2"' in dsmr_body
+    assert b'"field_2"' in inverter_body
+
+
+def test_compact_data_retains_less():
+    """Test compact payloads retain well under half of the full payloads."""
+    result = measure(entries=50)
+    assert 0 < result.compact < result.full
+    assert result.saved > 0.5
@@ -0,0 +1,62 @@
+"""Test the Jullix metrics."""
+
+from custom_components.jullix.metrics import JullixMetrics, LatencyHistogram, RequestWindow
+
+
+def test_latency_histogram():
+    """Test durations are bucketed and summarised."""
+    histogram = LatencyHistogram()
+    assert histogram.mean is None
+    assert histogram.quantile(0.95) is None
+
+    for value in (0.01, 0.02, 0.2, 0.3, 20.0):
+        histogram.observe(value)
+
+    assert histogram.count == 5
+    assert histogram.last == 20.0
+    assert histogram.mean == 20.53 / 5
+    assert histogram.quantile(0.4) == 0.05
+    assert histogram.quantile(0.8) == 0.5
+    assert histogram.quantile(1.0) == float("inf")
+
+    buckets = histogram.as_dict()["buckets"]
+    assert buckets["0.05"] == 2
+    assert buckets["0.25"] == 1
+    assert buckets["+Inf"] == 1
+
+
+def test_metrics_as_dict():
+    """Test metrics are exported per endpoint."""
+    metrics = JullixMetrics()
+    metrics.endpoint("/api/dsmr/status").timeouts += 1
+    metrics.endpoint("/api/inverter/status/A").timeouts += 2
+
+    assert metrics.total("timeouts") == 3
+    data = metrics.as_dict()
+    assert data["endpoints"]["/api/dsmr/status"]["timeouts"] == 1
+    assert data["update_duration"]["count"] == 0
+
+
+def test_request_window():
+    """Test only the most recent requests count towards the window."""
+    window = RequestWindow(size=20)
+    assert window.quantile(0.95) is None
+    assert window.timeout_ratio is None
+
+    for index in range(1, 21):
+        window.observe(index / 10)
+    assert window.quantile(0.95) == 1.9
+    assert window.quantile(0.5) == 1.0
+
+    for _ in range(5):
+        window.observe_timeout()
+    assert window.count == 20
+    assert window.timeout_ratio == 0.25
+    # The fastest requests were evicted, timeouts do not count as latencies
+    assert window.quantile(0.95) == 2.0
+    assert window.quantile(0.0) == 0.6
+
+    for _ in range(20):
+        window.observe(0.1)
+    assert window.timeouts == 0
+    assert window.as_dict() == {"count": 20, "p95": 0.1, "timeout_ratio": 0.0}
@@ -0,0 +1,72 @@
+"""Test the Jullix OpenMetrics exposition."""
+
+from unittest.mock import MagicMock
+
+from custom_components.jullix.openmetrics import (
+    CONTENT_TYPE,
+    JullixOpenMetricsView,
+    OpenMetricsBuffer,
+    render,
+)
+from homeassistant.components.http import KEY_HASS
+from homeassistant.core import HomeAssistant
+from tests.common import MockConfigEntry
+
+
+def test_buffer_render(mock_dsmr_data: dict, mock_inverter_data: dict):
+    """Test numeric values are rendered as gauges and counters."""
+    buffer = OpenMetricsBuffer("entry1", "192.168.4.167")
+    buffer.update({"dsmr": mock_dsmr_data, "inverter": mock_inverter_data})
+    assert buffer.generation == 1
+
+    body = render([buffer]).decode()
+    labels = 'entry_id="entry1",host="192.168.4.167"'
+
+    assert "# TYPE jullix_meter_power gauge" in body
+    assert f"jullix_meter_power{{{labels}}} 0.878" in body
+    assert "# TYPE jullix_meter_energy_in counter" in body
+    assert f"jullix_meter_energy_in_total{{{labels}}} 4380.46" in body
+    assert f"jullix_inverter_battery_soc{{{labels}}} 51.0" in body
+    # Booleans and strings are not exposed
+    assert "ready" not in body
+    assert "tariff" not in body
+    assert body.endswith("# EOF\n")
+
+
+def test_render_groups_families():
+    """Test samples of several entries share one TYPE line per family."""
+    first = OpenMetricsBuffer("entry1", "host1")
+    second = OpenMetricsBuffer("entry2", "host2")
+    first.update({"dsmr": {"power": {"value": 1.0}}})
+    second.update({"dsmr": {"power": {"value": 2.0}}})
+
+    body = render([first, second]).decode()
+
+    assert body.count("# TYPE jullix_meter_power gauge") == 1
+    assert 'jullix_meter_power{entry_id="entry2",host="host2"} 2.0' in body
+
+
+async def test_view_caches_body(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test scrapes reuse the rendered body until data changes."""
+    buffer = OpenMetricsBuffer(mock_config_entry.entry_id, "192.168.4.167")
+    buffer.update({"dsmr": {"power": {"value": 1.0}}})
+    mock_config_entry.runtime_data = MagicMock(openmetrics=buffer)
+    hass.config_entries.async_loaded_entries = MagicMock(
+        return_value=[mock_config_entry]
+    )
+
+    request = MagicMock()
+    request.app = {KEY_HASS: hass}
+    view = JullixOpenMetricsView()
+
+    response = await view.get(request)
+    assert response.headers["Content-Type"] == CONTENT_TYPE
+    assert b"jullix_meter_power" in response.body
+    first_body = response.body
+
+    assert (await view.get(request)).body is first_body
+
+    buffer.update({"dsmr": {"power": {"value": 2.0}}})
+    assert b"} 2.0" in (await view.get(request)).body
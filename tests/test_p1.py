@@ -0,0 +1,133 @@
+"""Test the Jullix P1 telegram parser."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from custom_components.jullix import JullixCoordinator
+from custom_components.jullix.metrics import JullixMetrics
+from custom_components.jullix.p1 import P1StreamReader, P1TelegramParser, crc16
+from homeassistant.core import HomeAssistant
+from tests.common import MockConfigEntry
+
+TELEGRAM_BODY = (
+    b"/ISK5\\2M550T-1012\r\n"
+    b"\r\n"
+    b"1-3:0.2.8(50)\r\n"
+    b"0-0:96.1.1(3153414733323030343135333739)\r\n"
+    b"1-0:1.8.1(002190.230*kWh)\r\n"
+    b"1-0:1.8.2(002190.230*kWh)\r\n"
+    b"1-0:2.8.1(000100.010*kWh)\r\n"
+    b"1-0:2.8.2(000076.500*kWh)\r\n"
+    b"1-0:1.7.0(01.250*kW)\r\n"
+    b"1-0:2.7.0(00.372*kW)\r\n"
+    b"0-1:24.1.0(003)\r\n"
+    b"0-1:24.2.1(231017120000S)(01036.920*m3)\r\n"
+    b"0-2:24.1.0(007)\r\n"
+    b"0-2:24.2.1(231017120000S)(00012.345*m3)\r\n"
+    b"!"
+)
+
+
+def _telegram(body: bytes = TELEGRAM_BODY) -> bytes:
+    """Return a telegram with a valid CRC."""
+    return body + f"{crc16(body):04X}\r\n".encode()
+
+
+def test_crc16():
+    """Test the CRC16/ARC implementation."""
+    assert crc16(b"123456789") == 0xBB3D
+
+
+def test_parse_telegram():
+    """Test a complete telegram maps onto DSMR sensor keys."""
+    parser = P1TelegramParser()
+    (values,) = parser.feed(_telegram())
+
+    assert values["power"]["value"] == 1.25 - 0.372
+    assert values["energy-in"]["value"] == 4380.46
+    assert values["energy-out"]["value"] == 176.51
+    assert values["gas"]["value"] == 1036.92
+    assert values["water"]["value"] == 12.345
+    # The meter ID comes from the polled payload only
+    assert "id" not in values
+
+
+def test_parse_incremental():
+    """Test telegrams split across reads are parsed once complete."""
+    parser = P1TelegramParser()
+    data = b"garbage" + _telegram() + _telegram()
+
+    results = []
+    for offset in range(0, len(data), 7):
+        results.extend(parser.feed(data[offset : offset + 7]))
+
+    assert len(results) == 2
+    assert results[0] == results[1]
+
+
+def test_invalid_crc_discarded():
+    """Test telegrams with a wrong CRC are dropped."""
+    parser = P1TelegramParser()
+    assert parser.feed(TELEGRAM_BODY + b"0000\r\n") == []
+    assert parser.crc_errors == 1
+    assert len(parser.feed(_telegram())) == 1
+
+
+def test_telegram_without_crc():
+    """Test DSMR 2/3 telegrams without a CRC are accepted."""
+    parser = P1TelegramParser()
+    (values,) = parser.feed(TELEGRAM_BODY + b"\r\n")
+    assert values["gas"]["value"] == 1036.92
+
+
+async def test_stream_survives_callback_errors() -> None:
+    """Test an error in the telegram callback does not stop the stream."""
+    reader = MagicMock()
+    reader.read = AsyncMock(side_effect=[_telegram(), _telegram(), b""])
+    callback = MagicMock(side_effect=[ValueError("listener failed"), None])
+    stream = P1StreamReader("192.168.4.168", 2000, callback)
+
+    with patch(
+        "custom_components.jullix.p1.asyncio.open_connection",
+        AsyncMock(return_value=(reader, MagicMock())),
+    ):
+        await stream._read_stream()  # noqa: SLF001
+
+    assert callback.call_count == 2
+
+
+async def test_coordinator_overlays_p1_data(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test streamed meter values take precedence over polled values."""
+    client = MagicMock()
+    client.metrics = JullixMetrics()
+    client.get_all_data = AsyncMock(
+        return_value={
+            "dsmr": {"power": {"value": 0.5}, "connected": True},
+            "inverter": {},
+        }
+    )
+    coordinator = JullixCoordinator(hass, client, mock_config_entry)
+    listener = MagicMock()
+    coordinator.async_add_listener(listener)
+    await coordinator.async_refresh()
+    assert coordinator.updated_devices == {"meter", "inverter"}
+    listener.reset_mock()
+
+    with patch.object(coordinator.schema, "update") as mock_schema:
+        coordinator.async_set_p1_data({"power": {"value": 1.5}})
+    # Telegrams do not check the schema of the already compact data again
+    mock_schema.assert_not_called()
+    assert coordinator.data["dsmr"]["power"] == 1.5
+    assert coordinator.data["dsmr"]["connected"] is True
+    listener.assert_called_once()
+    # The telegram only carries a new meter sample
+    assert coordinator.updated_devices == {"meter"}
+
+    # A poll keeps the fresher streamed value
+    await coordinator.async_refresh()
+    assert coordinator.data["dsmr"]["power"] == 1.5
+    # The schema compares the key set of the polled payload, without P1 values
+    assert coordinator.schema._dsmr_keys == {"power", "connected"}  # noqa: SLF001
+    # Responses reused by the client are not new samples
+    assert coordinator.updated_devices == frozenset()
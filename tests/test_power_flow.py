@@ -0,0 +1,79 @@
+"""Test the Jullix power flow decomposition."""
+
+import pytest
+
+from custom_components.jullix.power_flow import PowerFlows, compute_power_flows
+
+
+def _data(
+    pv_power: float | None,
+    battery_power: float | None,
+    grid_power: float | None,
+    inverter_grid_power: float | None = None,
+) -> dict:
+    """Return coordinator data with power readings."""
+    dsmr = {} if grid_power is None else {"power": {"value": grid_power}}
+    return {
+        "dsmr": dsmr,
+        "inverter": {
+            "running": True,
+            "data": {
+                "pv_power": pv_power,
+                "battery_power": battery_power,
+                "gridpower": inverter_grid_power,
+            },
+        },
+    }
+
+
+def test_solar_surplus():
+    """Test surplus solar charges the battery and is exported."""
+    flows = compute_power_flows(_data(5.0, -2.0, -1.5))
+    assert flows == PowerFlows(
+        house_load=pytest.approx(1.5),
+        solar_to_home=pytest.approx(1.5),
+        solar_to_battery=pytest.approx(2.0),
+        solar_to_grid=pytest.approx(1.5),
+        battery_to_home=0.0,
+        battery_to_grid=0.0,
+        grid_to_home=0.0,
+        grid_to_battery=0.0,
+    )
+
+
+def test_evening_discharge_and_import():
+    """Test the battery and grid cover the house without solar."""
+    flows = compute_power_flows(_data(0.0, 1.0, 0.5))
+    assert flows.house_load == pytest.approx(1.5)
+    assert flows.battery_to_home == pytest.approx(1.0)
+    assert flows.grid_to_home == pytest.approx(0.5)
+    assert flows.solar_to_home == 0.0
+
+
+def test_grid_charging():
+    """Test charging from the grid at night."""
+    flows = compute_power_flows(_data(0.0, -3.0, 3.4))
+    assert flows.house_load == pytest.approx(0.4)
+    assert flows.grid_to_home == pytest.approx(0.4)
+    assert flows.grid_to_battery == pytest.approx(3.0)
+
+
+def test_battery_export():
+    """Test a discharging battery exporting to the grid."""
+    flows = compute_power_flows(_data(0.0, 2.0, -1.2))
+    assert flows.battery_to_home == pytest.approx(0.8)
+    assert flows.battery_to_grid == pytest.approx(1.2)
+
+
+def test_inverter_grid_fallback():
+    """Test the inverter grid reading is used without a meter reading."""
+    flows = compute_power_flows(_data(2.0, 0.0, None, inverter_grid_power=-0.5))
+    assert flows.house_load == pytest.approx(1.5)
+    assert flows.solar_to_grid == pytest.approx(0.5)
+
+
+def test_missing_readings():
+    """Test no flows are computed without solar or grid power."""
+    assert compute_power_flows(_data(None, 0.0, 1.0)) is None
+    assert compute_power_flows(_data(1.0, 0.0, None)) is None
+    assert compute_power_flows({"inverter": {"running": False}}) is None
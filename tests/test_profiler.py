@@ -0,0 +1,127 @@
+"""Test the Jullix coordinator profiler."""
+
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+from custom_components.jullix.api import JullixApiError
+from custom_components.jullix.const import DOMAIN
+from custom_components.jullix.profiler import CycleProfiler, listener_name
+from custom_components.jullix.services import async_setup_services
+from homeassistant.core import HomeAssistant
+from tests.common import MockConfigEntry
+
+
+def test_listener_name():
+    """Test listeners are named after their entity."""
+    class _Owner:
+        entity_id = "sensor.jullix_grid_power"
+
+        def update(self) -> None:
+            """Update."""
+
+    assert listener_name(_Owner().update) == "sensor.jullix_grid_power (_Owner)"
+    assert listener_name(test_listener_name) == "test_listener_name"
+
+
+def test_cycle_profiler_report(tmp_path: Path):
+    """Test the report contains phase and listener timings."""
+    profiler = CycleProfiler(2, str(tmp_path / "profile.txt"))
+
+    for _ in range(2):
+        with profiler.phase("update_data"):
+            sum(range(1000))
+        profiler.record_listener("sensor.jullix_grid_power (JullixSensor)", 0.001)
+        done = profiler.finish_cycle()
+
+    assert done
+    profiler.write_report()
+    report = (tmp_path / "profile.txt").read_text()
+    assert "2 update cycles" in report
+    assert "update_data" in report
+    assert "sensor.jullix_grid_power (JullixSensor)" in report
+
+
+async def test_profile_service(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_jullix_api: AsyncMock,
+    mock_aiohttp_session,
+    tmp_path: Path,
+) -> None:
+    """Test the profile service writes a report after the requested cycles."""
+    mock_config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    async_setup_services(hass)
+
+    with patch.object(
+        hass.config, "path", side_effect=lambda *path: str(tmp_path.joinpath(*path))
+    ):
+        response = await hass.services.async_call(
+            DOMAIN, "profile", {"cycles": 1}, blocking=True, return_response=True
+        )
+    path = Path(response["files"][mock_config_entry.entry_id])
+    coordinator = mock_config_entry.runtime_data
+    assert coordinator.profiler is not None
+
+    class _Entity:
+        entity_id = "sensor.jullix_grid_power"
+
+        def handle_update(self) -> None:
+            """Handle a coordinator update."""
+
+    coordinator.async_add_listener(_Entity().handle_update)
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert coordinator.profiler is None
+    report = path.read_text()
+    assert "fetch_data" in report
+    assert "compact_data" in report
+    assert "listeners" in report
+    assert "sensor.jullix_grid_power (_Entity)" in report
+
+
+def test_cycle_profiler_phase_without_cprofile(tmp_path: Path):
+    """Test phases that await are timed without enabling cProfile."""
+    profiler = CycleProfiler(1, str(tmp_path / "profile.txt"))
+
+    with profiler.phase("fetch_data", profile=False):
+        # A second profiler can only be enabled when the phase does not profile
+        other = CycleProfiler(1, str(tmp_path / "other.txt"))
+        with other.phase("compact_data"):
+            pass
+    profiler.finish_cycle()
+
+    assert "fetch_data" in profiler.report()
+    assert other._profile is not None
+
+
+async def test_profile_counts_completed_refreshes(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_jullix_api: AsyncMock,
+    mock_aiohttp_session,
+    tmp_path: Path,
+) -> None:
+    """Test P1 telegrams and failed refreshes do not complete a cycle."""
+    mock_config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = mock_config_entry.runtime_data
+    profiler = CycleProfiler(1, str(tmp_path / "profile.txt"))
+    coordinator.profiler = profiler
+
+    coordinator.async_set_p1_data({"power": 100.0})
+    assert profiler.completed == 0
+
+    coordinator.client.get_all_data.side_effect = JullixApiError("boom")
+    await coordinator.async_refresh()
+    assert profiler.completed == 0
+
+    coordinator.client.get_all_data.side_effect = None
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert profiler.completed == 1
+    assert coordinator.profiler is None
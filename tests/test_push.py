@@ -0,0 +1,80 @@
+"""Test the Jullix push webhook."""
+
+from http import HTTPStatus
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from custom_components.jullix import JullixCoordinator
+from custom_components.jullix.const import (
+    CONF_PUSH,
+    DEFAULT_SCAN_INTERVAL,
+    PUSH_WATCHDOG_INTERVAL,
+)
+from custom_components.jullix.metrics import JullixMetrics
+from custom_components.jullix.push import async_setup_push, is_valid_payload
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant
+from tests.common import MockConfigEntry
+
+
+def test_is_valid_payload():
+    """Test payload shape validation."""
+    assert is_valid_payload({"dsmr": {}, "inverter": {}})
+    assert not is_valid_payload({"dsmr": {}})
+    assert not is_valid_payload({"dsmr": [], "inverter": {}})
+    assert is_valid_payload({"dsmr": {}, "inverter": {"data": {}}})
+    assert not is_valid_payload({"dsmr": {}, "inverter": {"data": None}})
+    assert not is_valid_payload([])
+
+
+async def test_push_data_slows_polling(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test pushed data updates the coordinator and slows polling."""
+    client = MagicMock()
+    client.metrics = JullixMetrics()
+    client.get_all_data = AsyncMock(return_value={"dsmr": {}, "inverter": {}})
+    coordinator = JullixCoordinator(hass, client, mock_config_entry)
+    assert coordinator.update_interval == DEFAULT_SCAN_INTERVAL
+
+    payload = {"dsmr": {"power": {"value": 1.0}}, "inverter": {}}
+    coordinator.async_push_data(payload)
+
+    assert coordinator.data == {"dsmr": {"power": 1.0}, "inverter": {"data": {}}}
+    assert coordinator.update_interval == PUSH_WATCHDOG_INTERVAL
+
+    # A watchdog poll means pushes stopped, so normal polling resumes
+    await coordinator.async_refresh()
+    assert coordinator.update_interval == DEFAULT_SCAN_INTERVAL
+    client.get_all_data.assert_awaited_once()
+
+
+async def test_webhook_handler(hass: HomeAssistant) -> None:
+    """Test the webhook handler feeds valid payloads to the coordinator."""
+    entry = MockConfigEntry(
+        domain="jullix",
+        options={CONF_PUSH: True, CONF_WEBHOOK_ID: "test_webhook"},
+    )
+    coordinator = MagicMock()
+
+    with patch(
+        "custom_components.jullix.push.webhook.async_register"
+    ) as mock_register:
+        async_setup_push(hass, entry, coordinator)
+
+    handler = mock_register.call_args.args[4]
+    assert mock_register.call_args.args[3] == "test_webhook"
+
+    payload = {"dsmr": {}, "inverter": {}}
+    request = MagicMock()
+    request.json = AsyncMock(return_value=payload)
+    assert await handler(hass, "test_webhook", request) is None
+    coordinator.async_push_data.assert_called_once_with(payload)
+
+    request.json = AsyncMock(return_value={"dsmr": {}})
+    response = await handler(hass, "test_webhook", request)
+    assert response.status == HTTPStatus.BAD_REQUEST
+
+    request.json = AsyncMock(side_effect=ValueError)
+    response = await handler(hass, "test_webhook", request)
+    assert response.status == HTTPStatus.BAD_REQUEST
+    assert coordinator.async_push_data.call_count == 1
@@ -0,0 +1,79 @@
+"""Test the Jullix counter reconciliation."""
+
+import pytest
+
+from custom_components.jullix.reconcile import CounterReconciler
+
+
+def test_first_reading_sets_baseline():
+    """Test the first counter reading only sets the baseline."""
+    reconciler = CounterReconciler()
+    assert not reconciler.active
+    assert reconciler.integrate(0.5) == 0.5
+    assert reconciler.reconcile(100.0) == 0.0
+    assert reconciler.active
+    assert reconciler.corrections == 0.0
+
+
+def test_positive_correction_bounded():
+    """Test missing energy is added, bounded by the counter difference."""
+    reconciler = CounterReconciler()
+    reconciler.reconcile(100.0)
+    reconciler.integrate(0.95)
+    assert reconciler.reconcile(101.0) == pytest.approx(0.05)
+
+    # Only 10 % of the difference is corrected
+    reconciler.integrate(0.5)
+    assert reconciler.reconcile(102.0) == pytest.approx(0.1)
+    assert reconciler.corrections == pytest.approx(0.15)
+
+
+def test_negative_correction_deferred():
+    """Test excess energy is taken from later increments, never subtracted."""
+    reconciler = CounterReconciler()
+    reconciler.reconcile(100.0)
+    reconciler.integrate(1.05)
+    assert reconciler.reconcile(101.0) == 0.0
+    assert reconciler.corrections == pytest.approx(-0.05)
+
+    assert reconciler.integrate(0.02) == 0.0
+    assert reconciler.integrate(0.04) == pytest.approx(0.01)
+    assert reconciler.integrate(0.04) == pytest.approx(0.04)
+
+
+def test_unchanged_counter_keeps_integrating():
+    """Test increments accumulate while the counter does not change."""
+    reconciler = CounterReconciler()
+    reconciler.reconcile(100.0)
+    for _ in range(10):
+        reconciler.integrate(0.1)
+        assert reconciler.reconcile(100.0) == 0.0
+    assert reconciler.reconcile(101.0) == pytest.approx(0.0)
+
+
+def test_counter_reset_rebaselines():
+    """Test a counter that goes backwards starts a new baseline."""
+    reconciler = CounterReconciler()
+    reconciler.reconcile(100.0)
+    reconciler.integrate(0.5)
+    assert reconciler.reconcile(0.0) == 0.0
+    reconciler.integrate(1.0)
+    assert reconciler.reconcile(1.0) == pytest.approx(0.0)
+    assert reconciler.corrections == 0.0
+
+
+def test_implausible_counter_delta_rejected():
+    """Test counter changes far above the integrated energy are not corrected."""
+    reconciler = CounterReconciler()
+    # Counter reported in Wh
+    reconciler.reconcile(100000.0)
+    reconciler.integrate(0.1)
+    assert reconciler.reconcile(100100.0) == 0.0
+    reconciler.integrate(0.1)
+    assert reconciler.reconcile(100200.0) == 0.0
+    assert reconciler.corrections == 0.0
+    assert reconciler.rejected == 2
+
+    # Without integrated energy the counter is not trusted either
+    assert reconciler.reconcile(100300.0) == 0.0
+    assert reconciler.rejected == 3
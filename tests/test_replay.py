@@ -0,0 +1,248 @@
+"""Test recording and replaying Jullix responses."""
+# ruff: noqa: SLF001
+
+from datetime import UTC, datetime
+import gzip
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from custom_components.jullix import JullixCoordinator
+from custom_components.jullix.api import JullixApiClient, JullixApiError
+from custom_components.jullix.const import API_DSMR_STATUS, API_INVERTER_STATUS, DOMAIN
+from custom_components.jullix.metrics import JullixMetrics
+from custom_components.jullix.replay import (
+    JullixReplayClient,
+    ReplaySource,
+    ResponseRecorder,
+    async_replay,
+)
+from custom_components.jullix.services import async_setup_services
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ServiceValidationError
+from tests.common import MockConfigEntry
+
+DSMR_BODY = '{"power": {"value": %s}, "connected": true}'
+INVERTER_BODY = '{"running": true, "data": {"battery_power": %s}}'
+
+
+def _write_recording(path: Path, records: list[tuple[float, str, str]]) -> None:
+    """Write a recording with one gzip member per record."""
+    for record_time, endpoint, body in records:
+        with gzip.open(path, "ab") as record_file:
+            line = {"time": record_time, "endpoint": endpoint, "body": body}
+            record_file.write(json.dumps(line).encode() + b"\n")
+
+
+async def test_recorder_appends_compressed_lines(
+    hass: HomeAssistant, tmp_path: Path
+) -> None:
+    """Test recorded responses are appended across flushes."""
+    path = tmp_path / "record.jsonl.gz"
+    client = JullixApiClient("192.168.4.167", MagicMock())
+    recorder = ResponseRecorder(hass, client, str(path))
+
+    recorder.record(API_DSMR_STATUS, b'{"power": 1}')
+    await recorder._async_flush()
+    recorder.record(API_INVERTER_STATUS, b'{"running": true}')
+    await recorder._async_flush()
+
+    with gzip.open(path, "rt") as record_file:
+        lines = [json.loads(line) for line in record_file]
+    assert [line["endpoint"] for line in lines] == [API_DSMR_STATUS, API_INVERTER_STATUS]
+    assert lines[0]["body"] == '{"power": 1}'
+
+
+async def test_recorder_start_stop(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test the client feeds the recorder until it is stopped."""
+    mock_response = MagicMock()
+    mock_response.read = AsyncMock(return_value=b'{"power": {"value": 1.0}}')
+    mock_response.raise_for_status = MagicMock()
+    mock_response.__aenter__ = AsyncMock(return_value=mock_response)
+    mock_response.__aexit__ = AsyncMock(return_value=None)
+    session = MagicMock()
+    session.get = MagicMock(return_value=mock_response)
+    client = JullixApiClient("192.168.4.167", session)
+
+    path = tmp_path / "record.jsonl.gz"
+    recorder = ResponseRecorder(hass, client, str(path))
+    stop = recorder.async_start(60)
+    assert client.recorder is recorder
+    await client.get_dsmr_data()
+
+    stop()
+    await hass.async_block_till_done()
+    assert client.recorder is None
+    with gzip.open(path, "rt") as record_file:
+        (line,) = [json.loads(line) for line in record_file]
+    assert line["body"] == '{"power": {"value": 1.0}}'
+
+
+async def test_replay_source_groups_samples(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test responses are grouped per poll and missing ones carried forward."""
+    path = tmp_path / "record.jsonl.gz"
+    _write_recording(
+        path,
+        [
+            (100.0, API_DSMR_STATUS, DSMR_BODY % 1),
+            (100.1, API_INVERTER_STATUS, INVERTER_BODY % 2),
+            (110.0, API_DSMR_STATUS, DSMR_BODY % 3),
+            (120.0, API_DSMR_STATUS, DSMR_BODY % 4),
+            (120.1, API_INVERTER_STATUS, INVERTER_BODY % 5),
+        ],
+    )
+
+    samples = [sample async for sample in ReplaySource(hass, str(path)).async_samples()]
+
+    assert [sample.time for sample in samples] == [100.1, 110.0, 120.1]
+    assert samples[1].bodies == {
+        API_DSMR_STATUS: DSMR_BODY % 3,
+        API_INVERTER_STATUS: INVERTER_BODY % 2,
+    }
+
+
+async def test_replay_through_coordinator(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry, tmp_path: Path
+) -> None:
+    """Test replayed samples refresh the coordinator with their recorded time."""
+    path = tmp_path / "record.jsonl.gz"
+    _write_recording(
+        path,
+        [
+            (1717243200.0 + step * 10, endpoint, body % step)
+            for step in range(100)
+            for endpoint, body in (
+                (API_DSMR_STATUS, DSMR_BODY),
+                (API_INVERTER_STATUS, INVERTER_BODY),
+            )
+        ],
+    )
+    client = MagicMock()
+    client.host = "192.168.4.167"
+    client.metrics = JullixMetrics()
+    client.get_all_data = AsyncMock(
+        return_value={"dsmr": {"power": {"value": 0.5}}, "inverter": {}}
+    )
+    coordinator = JullixCoordinator(hass, client, mock_config_entry)
+    update_interval = coordinator.update_interval
+    received = []
+    replay_times = []
+
+    @callback
+    def _listener() -> None:
+        received.append(coordinator.data)
+        replay_times.append(coordinator.replay_time)
+        if coordinator.replaying:
+            # Live input arriving during the replay is ignored
+            coordinator.async_push_data({"dsmr": {"power": {"value": -1}}})
+            coordinator.async_set_p1_data({"power": -1})
+            assert coordinator.update_interval is None
+
+    remove_listener = coordinator.async_add_listener(_listener)
+
+    with (
+        patch.object(coordinator.anomalies, "process") as mock_anomalies,
+        patch.object(coordinator.battery_forecast, "update") as mock_forecast,
+        patch.object(coordinator.energy_balance, "async_process") as mock_balance,
+        patch.object(coordinator.thresholds, "async_process") as mock_thresholds,
+    ):
+        samples = await async_replay(coordinator, ReplaySource(hass, str(path)), 0)
+
+    assert samples == 100
+    assert len(received) == 101
+    assert received[-2]["dsmr"]["power"] == 99
+    assert "timestamp" not in received[-2]
+    assert replay_times[-2] == datetime(2024, 6, 1, 12, 16, 30, tzinfo=UTC)
+    assert replay_times[-1] is None
+    # Live state, stored totals and events only see live data
+    assert mock_anomalies.call_count == 1
+    assert mock_forecast.call_count == 1
+    assert mock_balance.call_count == 1
+    assert mock_thresholds.call_count == 1
+
+    # Polling resumes against the device afterwards
+    remove_listener()
+    assert coordinator.client is client
+    assert not coordinator.replaying
+    assert coordinator.update_interval == update_interval
+    assert coordinator.data["dsmr"]["power"] == 0.5
+    client.get_all_data.assert_awaited_once()
+
+
+async def test_replay_from_another_meter(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry, tmp_path: Path
+) -> None:
+    """Test a recording of another meter leaves devices and fields unchanged."""
+    path = tmp_path / "record.jsonl.gz"
+    _write_recording(
+        path,
+        [
+            (
+                1717243200.0,
+                API_DSMR_STATUS,
+                '{"id": {"value": "OTHER"}, "power": {"value": 1}, "frequency": 50.0}',
+            ),
+            (1717243200.1, API_INVERTER_STATUS, '{"running": true, "data": {"mode2": 1}}'),
+        ],
+    )
+    client = MagicMock()
+    client.host = "192.168.4.167"
+    client.metrics = JullixMetrics()
+    client.get_all_data = AsyncMock(
+        return_value={"dsmr": {"id": {"value": "LIVE"}}, "inverter": {}}
+    )
+    mock_config_entry.add_to_hass(hass)
+    coordinator = JullixCoordinator(hass, client, mock_config_entry)
+    await coordinator.async_refresh()
+    assert coordinator.devices.meter_id == "LIVE"
+
+    with patch.object(hass.config_entries, "async_schedule_reload") as mock_reload:
+        assert await async_replay(coordinator, ReplaySource(hass, str(path)), 0) == 1
+
+    mock_reload.assert_not_called()
+    assert coordinator.devices.meter_id == "LIVE"
+    assert coordinator.schema.fields == {}
+
+
+async def test_replay_client_without_sample() -> None:
+    """Test the replay client raises an API error before the first sample."""
+    with pytest.raises(JullixApiError):
+        await JullixReplayClient("192.168.4.167").get_all_data()
+
+
+async def test_record_service(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_jullix_api: AsyncMock,
+    mock_aiohttp_session,
+    tmp_path: Path,
+) -> None:
+    """Test the record service attaches a recorder to the client."""
+    mock_config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    async_setup_services(hass)
+
+    with patch.object(
+        hass.config, "path", side_effect=lambda *path: str(tmp_path.joinpath(*path))
+    ):
+        response = await hass.services.async_call(
+            DOMAIN, "record", {"duration": 60}, blocking=True, return_response=True
+        )
+
+    path = response["files"][mock_config_entry.entry_id]
+    assert path.endswith(".jsonl.gz")
+    recorder = mock_config_entry.runtime_data.client.recorder
+    assert recorder.path == path
+
+    # A second recording is refused while the first one runs
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN, "record", {"duration": 60}, blocking=True, return_response=True
+        )
+
+    recorder.async_stop()
+    await hass.async_block_till_done()
+    assert mock_config_entry.runtime_data.client.recorder is None
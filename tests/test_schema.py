@@ -0,0 +1,128 @@
+"""Test the Jullix payload schema inference."""
+
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+from custom_components.jullix import JullixCoordinator
+from custom_components.jullix.metrics import JullixMetrics
+from custom_components.jullix.schema import PayloadSchema, infer_field
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+from homeassistant.const import UnitOfEnergy
+from homeassistant.core import HomeAssistant
+from tests.common import MockConfigEntry
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _fixture_data() -> dict:
+    """Return coordinator data built from the fixtures."""
+    return {
+        "dsmr": json.loads((FIXTURES / "dsmr_status.json").read_text()),
+        "inverter": json.loads((FIXTURES / "inverter_status.json").read_text()),
+    }
+
+
+def test_infer_from_dsmr_units():
+    """Test DSMR items use their title and units."""
+    field = infer_field(
+        "meter", "energy-in-l2", {"value": 1.0, "title": "Energy In L2", "units": "kWh"}
+    )
+    assert field.name == "Energy In L2"
+    assert field.unit == "kWh"
+    assert field.device_class == SensorDeviceClass.ENERGY
+    assert field.state_class == SensorStateClass.TOTAL_INCREASING
+
+
+def test_infer_from_key_name():
+    """Test inverter keys without units are inferred from their name."""
+    field = infer_field("inverter", "voltage_l2")
+    assert field.name == "Voltage l2"
+    assert field.unit == "V"
+    assert field.device_class == SensorDeviceClass.VOLTAGE
+    assert field.state_class == SensorStateClass.MEASUREMENT
+
+    assert infer_field("inverter", "pv2_energy").state_class == (
+        SensorStateClass.TOTAL_INCREASING
+    )
+    assert infer_field("inverter", "bms_SOC").device_class == SensorDeviceClass.BATTERY
+
+    unknown = infer_field("inverter", "mode")
+    assert unknown.unit is None
+    assert unknown.device_class is None
+    assert unknown.state_class == SensorStateClass.MEASUREMENT
+
+
+def test_unknown_fields_discovered_once():
+    """Test only undescribed numeric fields are reported, once."""
+    schema = PayloadSchema()
+    data = _fixture_data()
+
+    new_fields = schema.update(data)
+    assert [(field.device, field.key) for field in new_fields] == [
+        ("inverter", "controlpower")
+    ]
+    assert schema.update(data) == []
+
+    # A new key changes the key set and is discovered
+    data["inverter"]["data"]["frequency"] = 50.0
+    (field,) = schema.update(data)
+    assert field.key == "frequency"
+    assert set(schema.fields) == {
+        ("inverter", "controlpower"),
+        ("inverter", "frequency"),
+    }
+
+    # Described fields are not discovered, optional ones are collected
+    assert schema.optional_keys == set()
+    data["inverter"]["data"]["voltage_l2"] = 231.0
+    assert schema.update(data) == []
+    assert schema.optional_keys == {"voltage_l2"}
+
+    # Optional keys stay collected when the inverter stops reporting them
+    del data["inverter"]["data"]["voltage_l2"]
+    schema.update(data)
+    assert schema.optional_keys == {"voltage_l2"}
+
+
+def test_battery_counters_not_discovered():
+    """Test counters read by the battery energy sensors are not discovered."""
+    schema = PayloadSchema()
+    data = _fixture_data()
+    schema.update(data)
+
+    data["inverter"]["data"]["battery_charged"] = 12.5
+    data["inverter"]["data"]["energy_discharged"] = 10.1
+    assert schema.update(data) == []
+
+
+def test_unchanged_key_set_skips_validation():
+    """Test payloads with a known key set are not walked again."""
+    schema = PayloadSchema()
+    data = _fixture_data()
+    schema.update(data)
+
+    # New values under the same keys are not inferred again
+    data["inverter"]["data"]["mode"] = "grid"
+    schema.update(data)
+    data["inverter"]["data"]["mode"] = 3
+    assert schema.update(data) == []
+
+
+async def test_coordinator_infers_before_compacting(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test discovered meter fields keep the units dropped from compact data."""
+    data = _fixture_data()
+    data["dsmr"]["energy-gas"] = {"value": 3.2, "title": "Energy gas", "units": "kWh"}
+    client = MagicMock()
+    client.metrics = JullixMetrics()
+    client.get_all_data = AsyncMock(return_value=data)
+    coordinator = JullixCoordinator(hass, client, mock_config_entry)
+    coordinator.async_add_listener(MagicMock())
+    await coordinator.async_refresh()
+
+    assert coordinator.data["dsmr"]["energy-gas"] == 3.2
+    field = coordinator.schema.fields[("meter", "energy-gas")]
+    assert field.name == "Energy gas"
+    assert field.unit == UnitOfEnergy.KILO_WATT_HOUR
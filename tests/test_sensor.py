@@ -1,16 +1,44 @@
 """Test the Jullix sensor platform."""
 # ruff: noqa: SLF001
 
-from datetime import timedelta
-from unittest.mock import AsyncMock, patch
-
-from custom_components.jullix.const import BATTERY_ENERGY_SENSORS, DOMAIN
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from custom_components.jullix import JullixCoordinator
+from custom_components.jullix.anomaly import AnomalyDetector
+from custom_components.jullix.batch import EntityBatch
+from custom_components.jullix.battery_forecast import BatteryForecast
+from custom_components.jullix.const import (
+    BATTERY_ENERGY_SENSORS,
+    BATTERY_FORECAST_SENSORS,
+    DIAGNOSTIC_SENSORS,
+    DOMAIN,
+)
+from custom_components.jullix.devices import JullixDevices
+from custom_components.jullix.fields import SENSOR_FIELDS
+from custom_components.jullix.metrics import JullixMetrics
+from custom_components.jullix.schema import infer_field
 from custom_components.jullix.sensor import (
+    METRIC_ATTRIBUTES_FNS,
+    METRIC_VALUE_FNS,
+    FORECAST_VALUE_FNS,
     BatteryEnergySensor,
+    JullixBatteryForecastSensor,
+    JullixForecastSensorEntityDescription,
+    JullixMetricSensor,
+    JullixMetricSensorEntityDescription,
     JullixSensor,
     JullixSensorEntityDescription,
+    _discovered_description,
+    _field_descriptions,
+    async_setup_entry,
 )
+from homeassistant.components.sensor import SensorStateClass
 from homeassistant.const import UnitOfEnergy
+from homeassistant.core import HomeAssistant
+from tests.common import MockConfigEntry
 
 
 async def test_sensor_entity_properties():
@@ -33,6 +61,8 @@ async def test_sensor_entity_properties():
     }
     coordinator.config_entry = AsyncMock()
     coordinator.config_entry.entry_id = "test_entry"
+    coordinator.devices = JullixDevices("test_entry")
+    coordinator.devices.update(coordinator.data)
 
     # Create a sensor description
     description = JullixSensorEntityDescription(
@@ -57,6 +87,7 @@ async def test_sensor_entity_no_data():
     """Test sensor entity when data is missing."""
     coordinator = AsyncMock()
     coordinator.data = {}
+    coordinator.devices = JullixDevices("test_entry")
 
     description = JullixSensorEntityDescription(
         key="energy-in",
@@ -77,6 +108,8 @@ async def test_sensor_device_info():
     coordinator.data = {"dsmr": {"id": {"value": "123456"}, "connected": True}}
     coordinator.config_entry = AsyncMock()
     coordinator.config_entry.entry_id = "test_entry"
+    coordinator.devices = JullixDevices("test_entry")
+    coordinator.devices.update(coordinator.data)
 
     description = JullixSensorEntityDescription(
         key="power",
@@ -109,6 +142,8 @@ async def test_inverter_sensor():
     }
     coordinator.config_entry = AsyncMock()
     coordinator.config_entry.entry_id = "test_entry"
+    coordinator.devices = JullixDevices("test_entry")
+    coordinator.devices.update(coordinator.data)
 
     description = JullixSensorEntityDescription(
         key="pv-power",
@@ -143,6 +178,8 @@ async def test_battery_energy_sensor_initialization():
     }
     coordinator.config_entry = AsyncMock()
     coordinator.config_entry.entry_id = "test_entry"
+    coordinator.devices = JullixDevices("test_entry")
+    coordinator.devices.update(coordinator.data)
 
     # Test charged sensor
     charged_desc = BATTERY_ENERGY_SENSORS[0]
@@ -160,6 +197,7 @@ async def test_battery_energy_sensor_charging():
     coordinator = AsyncMock()
     coordinator.config_entry = AsyncMock()
     coordinator.config_entry.entry_id = "test_entry"
+    coordinator.devices = JullixDevices("test_entry")
     coordinator.data = {
         "inverter": {
             "model": "TestInverter",
@@ -169,6 +207,9 @@ async def test_battery_energy_sensor_charging():
     }
 
     charged_desc = BATTERY_ENERGY_SENSORS[0]
+    coordinator.anomalies = AnomalyDetector()
+    coordinator.updated_devices = frozenset({"inverter"})
+    coordinator.replaying = False
     sensor = BatteryEnergySensor(coordinator, charged_desc)
 
     # Mock async_write_ha_state to avoid hass requirement
@@ -198,6 +239,7 @@ async def test_battery_energy_sensor_discharging():
     coordinator = AsyncMock()
     coordinator.config_entry = AsyncMock()
     coordinator.config_entry.entry_id = "test_entry"
+    coordinator.devices = JullixDevices("test_entry")
     coordinator.data = {
         "inverter": {
             "model": "TestInverter",
@@ -207,6 +249,9 @@ async def test_battery_energy_sensor_discharging():
     }
 
     discharged_desc = BATTERY_ENERGY_SENSORS[1]
+    coordinator.anomalies = AnomalyDetector()
+    coordinator.updated_devices = frozenset({"inverter"})
+    coordinator.replaying = False
     sensor = BatteryEnergySensor(coordinator, discharged_desc)
 
     # Mock async_write_ha_state to avoid hass requirement
@@ -236,6 +281,7 @@ async def test_battery_energy_sensor_no_accumulation_wrong_direction():
     coordinator = AsyncMock()
     coordinator.config_entry = AsyncMock()
     coordinator.config_entry.entry_id = "test_entry"
+    coordinator.devices = JullixDevices("test_entry")
     coordinator.data = {
         "inverter": {
             "model": "TestInverter",
@@ -246,6 +292,9 @@ async def test_battery_energy_sensor_no_accumulation_wrong_direction():
 
     # Test charged sensor with positive power (should not accumulate)
     charged_desc = BATTERY_ENERGY_SENSORS[0]
+    coordinator.anomalies = AnomalyDetector()
+    coordinator.updated_devices = frozenset({"inverter"})
+    coordinator.replaying = False
     sensor = BatteryEnergySensor(coordinator, charged_desc)
 
     # Mock async_write_ha_state to avoid hass requirement
@@ -268,11 +317,176 @@ async def test_battery_energy_sensor_no_accumulation_wrong_direction():
         assert sensor.native_value == 0.0
 
 
+async def test_battery_energy_sensor_skips_flagged_samples():
+    """Test the interval ending at a spike is not integrated."""
+    coordinator = AsyncMock()
+    coordinator.config_entry = AsyncMock()
+    coordinator.config_entry.entry_id = "test_entry"
+    coordinator.devices = JullixDevices("test_entry")
+    coordinator.anomalies = AnomalyDetector()
+    coordinator.updated_devices = frozenset({"inverter"})
+    coordinator.replaying = False
+    start = datetime(2024, 6, 1, 12, 0, tzinfo=UTC)
+
+    sensor = BatteryEnergySensor(coordinator, BATTERY_ENERGY_SENSORS[0])
+
+    def _update(minutes: int, power: float) -> None:
+        coordinator.data = {
+            "inverter": {"data": {"battery_power": power}, "running": True}
+        }
+        mock_now.return_value = start + timedelta(minutes=minutes)
+        sensor._handle_coordinator_update()
+
+    with (
+        patch.object(sensor, "async_write_ha_state"),
+        patch("custom_components.jullix.sensor.dt_util.utcnow") as mock_now,
+    ):
+        _update(0, -2.0)
+        _update(30, -50.0)
+        # The spike is confirmed with the next sample, dropping its interval
+        with patch.object(
+            coordinator.anomalies, "is_flagged", return_value=True
+        ) as mock_flagged:
+            _update(60, -2.0)
+        mock_flagged.assert_called_once_with("inverter", "battery_power")
+        assert sensor._last_power == -2.0
+        assert sensor._last_update_time == start + timedelta(minutes=60)
+        assert sensor.native_value == 1.0
+
+        _update(90, -2.0)
+        assert sensor.native_value == 2.0
+
+
+async def test_battery_energy_sensor_drops_stuck_period():
+    """Test a stuck period that later recovers is not integrated."""
+    coordinator = AsyncMock()
+    coordinator.config_entry = AsyncMock()
+    coordinator.config_entry.entry_id = "test_entry"
+    coordinator.devices = JullixDevices("test_entry")
+    coordinator.anomalies = AnomalyDetector()
+    coordinator.updated_devices = frozenset({"inverter"})
+    coordinator.replaying = False
+    start = datetime(2024, 6, 1, 12, 0, tzinfo=UTC)
+
+    sensor = BatteryEnergySensor(coordinator, BATTERY_ENERGY_SENSORS[0])
+
+    with (
+        patch.object(sensor, "async_write_ha_state"),
+        patch("custom_components.jullix.sensor.dt_util.utcnow") as mock_now,
+    ):
+        for minutes, power in (
+            (0, -1.0), (15, -2.0), (30, -2.0), (45, -2.0), (60, -1.0), (72, -1.0)
+        ):
+            mock_now.return_value = start + timedelta(minutes=minutes)
+            coordinator.data = {
+                "inverter": {"data": {"battery_power": power}, "running": True}
+            }
+            coordinator.anomalies.process(
+                mock_now.return_value.timestamp(),
+                coordinator.data,
+                coordinator.updated_devices,
+            )
+            sensor._handle_coordinator_update()
+
+    # -2.0 is stuck from 30, so 15-60 is dropped: 0.25 for 0-15 and 0.2 for 60-72
+    assert sensor.native_value == 0.45
+
+
+async def test_battery_energy_sensor_ignores_repeated_samples():
+    """Test updates without a new inverter sample are not integrated twice."""
+    coordinator = AsyncMock()
+    coordinator.config_entry = AsyncMock()
+    coordinator.config_entry.entry_id = "test_entry"
+    coordinator.devices = JullixDevices("test_entry")
+    coordinator.anomalies = AnomalyDetector()
+    coordinator.updated_devices = frozenset({"inverter"})
+    coordinator.replaying = False
+    coordinator.data = {"inverter": {"data": {"battery_power": -2.0}, "running": True}}
+    start = datetime(2024, 6, 1, 12, 0, tzinfo=UTC)
+
+    sensor = BatteryEnergySensor(coordinator, BATTERY_ENERGY_SENSORS[0])
+
+    with (
+        patch.object(sensor, "async_write_ha_state"),
+        patch("custom_components.jullix.sensor.dt_util.utcnow") as mock_now,
+    ):
+        mock_now.return_value = start
+        sensor._handle_coordinator_update()
+
+        # A P1 telegram repeats the inverter sample
+        coordinator.updated_devices = frozenset({"meter"})
+        mock_now.return_value = start + timedelta(minutes=30)
+        sensor._handle_coordinator_update()
+        assert sensor._last_update_time == start
+
+        coordinator.updated_devices = frozenset({"inverter"})
+        mock_now.return_value = start + timedelta(hours=1)
+        sensor._handle_coordinator_update()
+
+    assert sensor.native_value == 2.0
+
+
+async def test_battery_energy_sensor_frozen_during_replay():
+    """Test replays write no state and time jumps are not integrated."""
+    coordinator = AsyncMock()
+    coordinator.config_entry = AsyncMock()
+    coordinator.config_entry.entry_id = "test_entry"
+    coordinator.devices = JullixDevices("test_entry")
+    coordinator.anomalies = AnomalyDetector()
+    coordinator.updated_devices = frozenset({"inverter"})
+    coordinator.replaying = False
+    coordinator.last_update_success = True
+    coordinator.profiler = None
+    coordinator.async_add_listener = MagicMock()
+    coordinator.data = {"inverter": {"data": {"battery_power": -2.0}, "running": True}}
+    start = datetime(2024, 6, 2, 12, 0, tzinfo=UTC)
+
+    sensor = BatteryEnergySensor(coordinator, BATTERY_ENERGY_SENSORS[0])
+    batch = EntityBatch(coordinator)
+    batch.async_add(sensor)
+
+    def _update(minutes: int, power: float = -2.0) -> None:
+        coordinator.data = {
+            "inverter": {"data": {"battery_power": power}, "running": True}
+        }
+        mock_now.return_value = start + timedelta(minutes=minutes)
+        batch.async_update()
+
+    with (
+        patch.object(sensor, "async_write_ha_state") as mock_write,
+        patch("custom_components.jullix.sensor.dt_util.utcnow") as mock_now,
+    ):
+        _update(0)
+        _update(30)
+        assert sensor.native_value == 1.0
+        writes = mock_write.call_count
+
+        # Replayed samples are not integrated and write no state
+        coordinator.replaying = True
+        _update(40, -50.0)
+        _update(50, -50.0)
+        assert mock_write.call_count == writes
+        assert sensor.native_value == 1.0
+
+        # Live data continues from the first live sample, without the replay gap
+        coordinator.replaying = False
+        _update(180)
+        assert sensor.native_value == 1.0
+        _update(210)
+        assert sensor.native_value == 2.0
+
+        # Steps back in time and gaps over an hour are not integrated
+        _update(180)
+        _update(300)
+        assert sensor.native_value == 2.0
+
+
 async def test_battery_energy_sensor_unavailable():
     """Test battery energy sensor unavailability."""
     coordinator = AsyncMock()
     coordinator.config_entry = AsyncMock()
     coordinator.config_entry.entry_id = "test_entry"
+    coordinator.devices = JullixDevices("test_entry")
     coordinator.last_update_success = True
     coordinator.data = {
         "inverter": {
@@ -301,6 +515,7 @@ async def test_battery_energy_sensor_state_restoration():
     coordinator = AsyncMock()
     coordinator.config_entry = AsyncMock()
     coordinator.config_entry.entry_id = "test_entry"
+    coordinator.devices = JullixDevices("test_entry")
     coordinator.data = {
         "inverter": {
             "model": "TestInverter",
@@ -322,3 +537,179 @@ async def test_battery_energy_sensor_state_restoration():
     # Should restore the previous total
     assert sensor._total_energy == 15.5
     assert sensor.native_value == 15.5
+
+
+async def test_metric_sensor():
+    """Test diagnostic metric sensor reports client metrics."""
+    coordinator = AsyncMock()
+    coordinator.config_entry = AsyncMock()
+    coordinator.config_entry.entry_id = "test_entry"
+    coordinator.devices = JullixDevices("test_entry")
+    coordinator.data = {"inverter": {"model": "TestInverter", "running": False}}
+    coordinator.client.metrics = JullixMetrics()
+    coordinator.client.metrics.endpoint("/api/dsmr/status").latency.observe(0.12)
+    coordinator.client.metrics.endpoint("/api/dsmr/status").timeouts += 2
+
+    descriptions = {
+        desc.key: JullixMetricSensorEntityDescription(
+            key=desc.key,
+            value_fn=METRIC_VALUE_FNS[desc.key],
+            attributes_fn=METRIC_ATTRIBUTES_FNS.get(desc.key),
+        )
+        for desc in DIAGNOSTIC_SENSORS
+    }
+
+    latency = JullixMetricSensor(coordinator, descriptions["dsmr_request_latency"])
+    assert latency.unique_id == "test_entry_dsmr_request_latency"
+    assert latency.native_value == 120
+    assert latency.extra_state_attributes["count"] == 1
+    # Metrics stay available while the inverter is not running
+    assert latency.available is True
+
+    timeouts = JullixMetricSensor(coordinator, descriptions["request_timeouts"])
+    assert timeouts.native_value == 2
+    assert timeouts.extra_state_attributes is None
+
+
+async def test_battery_forecast_sensor():
+    """Test the battery time to full sensor."""
+    coordinator = AsyncMock()
+    coordinator.config_entry = AsyncMock()
+    coordinator.config_entry.entry_id = "test_entry"
+    coordinator.devices = JullixDevices("test_entry")
+    coordinator.last_update_success = True
+    coordinator.battery_forecast = BatteryForecast(reserve=10)
+    coordinator.data = {"inverter": {"model": "TestInverter", "running": True}}
+
+    desc = BATTERY_FORECAST_SENSORS[0]
+    sensor = JullixBatteryForecastSensor(
+        coordinator,
+        JullixForecastSensorEntityDescription(
+            key=desc.key,
+            translation_key=desc.translation_key,
+            device_class=desc.device_class,
+            native_unit_of_measurement=desc.native_unit_of_measurement,
+            value_fn=FORECAST_VALUE_FNS[desc.key],
+        ),
+    )
+
+    assert sensor.unique_id == "test_entry_battery_time_to_full"
+    assert sensor.native_value is None
+    assert sensor.available is True
+
+    # Charging 1 % per minute from 50 %
+    for minute in range(11):
+        coordinator.battery_forecast.update(
+            minute * 60.0,
+            {"inverter": {"running": True, "data": {"battery_SOC": 50 + minute}}},
+        )
+
+    assert sensor.native_value == pytest.approx(40, abs=0.01)
+    assert sensor.extra_state_attributes == {"rate": 60.0, "reserve": 10}
+
+
+async def test_discovered_sensor():
+    """Test sensors for discovered fields are disabled and read their value."""
+    coordinator = AsyncMock()
+    coordinator.config_entry = AsyncMock()
+    coordinator.config_entry.entry_id = "test_entry"
+    coordinator.devices = JullixDevices("test_entry")
+    coordinator.data = {
+        "inverter": {"model": "TestInverter", "running": True, "data": {"frequency": 50.02}}
+    }
+
+    description = _discovered_description(infer_field("inverter", "frequency"))
+    sensor = JullixSensor(coordinator, description, "inverter")
+
+    assert description.entity_registry_enabled_default is False
+    assert sensor.unique_id == "test_entry_field_frequency"
+    assert sensor.native_value == 50.02
+    assert sensor.native_unit_of_measurement == "Hz"
+
+    # A field named like a derived sensor does not reuse its unique ID
+    counter = JullixSensor(
+        coordinator,
+        _discovered_description(infer_field("inverter", "battery_energy_charged")),
+        "inverter",
+    )
+    energy_sensor = BatteryEnergySensor(coordinator, BATTERY_ENERGY_SENSORS[0])
+    assert counter.unique_id != energy_sensor.unique_id
+
+
+async def test_sensor_reads_field_table():
+    """Test sensors with a field read the coordinator's field table."""
+    coordinator = AsyncMock()
+    coordinator.config_entry = AsyncMock()
+    coordinator.config_entry.entry_id = "test_entry"
+    coordinator.devices = JullixDevices("test_entry")
+    data = {"inverter": {"model": "TestInverter", "running": True, "data": {"pv2_power": 1.2}}}
+    coordinator.data = data
+    coordinator.values = SENSOR_FIELDS.extract(data)
+
+    sensor = JullixSensor(
+        coordinator,
+        JullixSensorEntityDescription(key="pv2_power", field=("inverter", "pv2_power")),
+        "inverter",
+    )
+    assert sensor.native_value == 1.2
+
+
+def test_field_descriptions_shared():
+    """Test field descriptions are built once per statistics mode."""
+    descriptions = _field_descriptions(False)
+    assert _field_descriptions(False) is descriptions
+    assert {description.field for description in descriptions} == set(SENSOR_FIELDS.fields)
+
+    power = {description.key: description for description in descriptions}["power"]
+    assert power.state_class == SensorStateClass.MEASUREMENT
+    lts_power = {
+        description.key: description for description in _field_descriptions(True)
+    }["power"]
+    assert lts_power.state_class is None
+
+
+async def test_optional_sensors_created_when_reported(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_dsmr_data: dict,
+    mock_inverter_data: dict,
+) -> None:
+    """Test phase sensors are added when an inverter reports them after setup."""
+    mock_config_entry.add_to_hass(hass)
+    client = MagicMock()
+    client.metrics = JullixMetrics()
+    client.get_all_data = AsyncMock(
+        return_value={"dsmr": mock_dsmr_data, "inverter": mock_inverter_data}
+    )
+    coordinator = JullixCoordinator(hass, client, mock_config_entry)
+    coordinator.async_add_listener(MagicMock())
+    await coordinator.async_refresh()
+    mock_config_entry.runtime_data = coordinator
+
+    add_entities = MagicMock()
+    await async_setup_entry(hass, mock_config_entry, add_entities)
+    keys = {entity.entity_description.key for entity in add_entities.call_args.args[0]}
+    assert "voltage_l1" in keys
+    assert "voltage_l2" not in keys
+    add_entities.reset_mock()
+
+    # The inverter starts reporting a second phase after setup
+    inverter_data = {
+        **mock_inverter_data,
+        "data": {**mock_inverter_data["data"], "voltage_l2": 231.9},
+    }
+    client.get_all_data.return_value = {"dsmr": mock_dsmr_data, "inverter": inverter_data}
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    (sensor,) = add_entities.call_args.args[0]
+    assert sensor.unique_id == f"{mock_config_entry.entry_id}_voltage_l2"
+    assert sensor.native_value == 231.9
+
+    # It is added only once when the key disappears and comes back
+    add_entities.reset_mock()
+    client.get_all_data.return_value = {"dsmr": mock_dsmr_data, "inverter": mock_inverter_data}
+    await coordinator.async_refresh()
+    client.get_all_data.return_value = {"dsmr": mock_dsmr_data, "inverter": inverter_data}
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    add_entities.assert_not_called()
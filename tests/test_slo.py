@@ -0,0 +1,56 @@
+"""Test the Jullix latency objectives."""
+
+from custom_components.jullix.const import DOMAIN, SLO_MIN_REQUESTS
+from custom_components.jullix.metrics import RequestWindow
+from custom_components.jullix.slo import SloMonitor
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import issue_registry as ir
+
+
+async def test_issue_raised_and_cleared(hass: HomeAssistant) -> None:
+    """Test a slow device raises a Repairs issue until it recovers."""
+    issue_registry = ir.async_get(hass)
+    monitor = SloMonitor(hass, "entry", "Jullix (192.168.4.167)")
+    window = RequestWindow()
+
+    # Too few requests to judge the device
+    for _ in range(SLO_MIN_REQUESTS - 1):
+        window.observe(3.0)
+    monitor.async_check(window)
+    assert issue_registry.async_get_issue(DOMAIN, monitor.issue_id) is None
+
+    window.observe(3.0)
+    monitor.async_check(window)
+    issue = issue_registry.async_get_issue(DOMAIN, monitor.issue_id)
+    assert issue is not None
+    assert issue.translation_key == "degraded_device"
+    assert issue.translation_placeholders["p95"] == "3.00"
+
+    for _ in range(window.size):
+        window.observe(0.2)
+    monitor.async_check(window)
+    assert issue_registry.async_get_issue(DOMAIN, monitor.issue_id) is None
+    assert not monitor.degraded
+
+
+async def test_timeout_ratio(hass: HomeAssistant) -> None:
+    """Test timeouts beyond the objective raise the issue on their own."""
+    issue_registry = ir.async_get(hass)
+    monitor = SloMonitor(hass, "entry", "Jullix")
+    monitor.timeout_ratio = 0.1
+    window = RequestWindow()
+    for _ in range(18):
+        window.observe(0.2)
+    window.observe_timeout()
+    window.observe_timeout()
+    monitor.async_check(window)
+    assert not monitor.degraded
+
+    window.observe_timeout()
+    monitor.async_check(window)
+    assert monitor.degraded
+    issue = issue_registry.async_get_issue(DOMAIN, monitor.issue_id)
+    assert issue.translation_placeholders["timeout_ratio"] == "14%"
+
+    monitor.async_clear()
+    assert issue_registry.async_get_issue(DOMAIN, monitor.issue_id) is None
@@ -0,0 +1,14 @@
+"""Test the integration setup benchmark."""
+
+from custom_components.jullix.tests.benchmarks.startup import async_measure_setup
+from homeassistant.core import HomeAssistant
+
+
+async def test_setup_entries(hass: HomeAssistant) -> None:
+    """Test every entry gets the same entities from the fixture responses."""
+    seconds, entities = await async_measure_setup(hass, 1)
+    assert seconds > 0
+    assert entities > 0
+
+    _, entities_for_three = await async_measure_setup(hass, 3)
+    assert entities_for_three == 3 * entities
@@ -0,0 +1,21 @@
+"""Test the state write benchmark."""
+
+from custom_components.jullix.tests.benchmarks.state_writes import async_measure, payload
+from homeassistant.core import HomeAssistant
+
+
+def test_payload_changes():
+    """Test power readings change on every update and counters every few."""
+    first, second = payload(0), payload(1)
+    assert first["dsmr"]["power"] != second["dsmr"]["power"]
+    assert first["dsmr"]["energy-in"] == second["dsmr"]["energy-in"]
+    assert payload(6)["dsmr"]["energy-in"] != first["dsmr"]["energy-in"]
+
+
+async def test_batched_writes_fewer_states(hass: HomeAssistant) -> None:
+    """Test the batch only writes the states that changed."""
+    result = await async_measure(hass, updates=12)
+    assert result.entities > 0
+    assert 0 < result.written < 1
+    assert result.per_entity > 0
+    assert result.batched > 0
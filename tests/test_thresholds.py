@@ -0,0 +1,85 @@
+"""Test the Jullix threshold crossing events."""
+
+import pytest
+import voluptuous as vol
+
+from custom_components.jullix.const import EVENT_THRESHOLD
+from custom_components.jullix.thresholds import THRESHOLDS_SCHEMA, ThresholdEngine
+from homeassistant.core import Event, HomeAssistant, callback
+
+
+def _data(power: float, soc: float) -> dict:
+    """Return coordinator data with a grid power and battery level."""
+    return {
+        "dsmr": {"power": {"value": power}},
+        "inverter": {"data": {"battery_SOC": soc}},
+    }
+
+
+def test_thresholds_schema():
+    """Test threshold configuration validation."""
+    (threshold,) = THRESHOLDS_SCHEMA(
+        [{"name": "battery_low", "key": "inverter.battery_SOC", "below": 20}]
+    )
+    assert threshold["hysteresis"] == 0.0
+
+    for invalid in (
+        {"name": "no_limit", "key": "meter.power"},
+        {"name": "both", "key": "meter.power", "above": 1, "below": 0},
+        {"name": "bad_device", "key": "grid.power", "above": 1},
+        {"name": "negative", "key": "meter.power", "above": 1, "hysteresis": -1},
+    ):
+        with pytest.raises(vol.Invalid):
+            THRESHOLDS_SCHEMA([invalid])
+
+
+async def test_threshold_events(hass: HomeAssistant) -> None:
+    """Test events fire on crossings only, honouring hysteresis."""
+    events: list[Event] = []
+
+    @callback
+    def _capture(event: Event) -> None:
+        events.append(event)
+
+    hass.bus.async_listen(EVENT_THRESHOLD, _capture)
+
+    engine = ThresholdEngine(
+        hass,
+        "entry1",
+        THRESHOLDS_SCHEMA(
+            [
+                {"name": "exporting", "key": "meter.power", "below": -2, "hysteresis": 0.5},
+                {"name": "battery_low", "key": "inverter.battery_SOC", "below": 20},
+            ]
+        ),
+    )
+
+    # The first sample only establishes the state
+    engine.async_process(_data(-3.0, 50))
+    await hass.async_block_till_done()
+    assert events == []
+
+    # Within the hysteresis band the threshold stays active
+    engine.async_process(_data(-1.7, 50))
+    await hass.async_block_till_done()
+    assert events == []
+
+    engine.async_process(_data(-1.0, 19))
+    await hass.async_block_till_done()
+    assert [(event.data["name"], event.data["active"]) for event in events] == [
+        ("exporting", False),
+        ("battery_low", True),
+    ]
+    assert events[0].data["key"] == "meter.power"
+    assert events[0].data["value"] == -1.0
+    assert events[0].data["config_entry_id"] == "entry1"
+
+    # Repeated values beyond the limit do not fire again
+    engine.async_process(_data(-1.0, 18))
+    await hass.async_block_till_done()
+    assert len(events) == 2
+
+    engine.async_process(_data(-2.5, 18))
+    await hass.async_block_till_done()
+    assert events[-1].data["name"] == "exporting"
+    assert events[-1].data["active"] is True
@@ -0,0 +1,134 @@
+"""Threshold crossing events for Jullix Energy Management."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import logging
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, callback
+import homeassistant.helpers.config_validation as cv
+
+from .const import DEVICE_INVERTER, DEVICE_METER, EVENT_THRESHOLD
+from .fields import get_numeric_value
+
+_LOGGER = logging.getLogger(__name__)
+
+CONF_ABOVE = "above"
+CONF_BELOW = "below"
+CONF_HYSTERESIS = "hysteresis"
+CONF_KEY = "key"
+CONF_NAME = "name"
+
+
+def _valid_key(value: Any) -> str:
+    """Validate a '<device>.<key>' reference such as 'inverter.battery_SOC'."""
+    value = cv.string(value)
+    device, _, key = value.partition(".")
+    if device not in (DEVICE_METER, DEVICE_INVERTER) or not key:
+        raise vol.Invalid(
+            f"Key must be '{DEVICE_METER}.<key>' or '{DEVICE_INVERTER}.<key>'"
+        )
+    return value
+
+
+THRESHOLD_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(CONF_NAME): cv.string,
+            vol.Required(CONF_KEY): _valid_key,
+            vol.Exclusive(CONF_ABOVE, "limit"): vol.Coerce(float),
+            vol.Exclusive(CONF_BELOW, "limit"): vol.Coerce(float),
+            vol.Optional(CONF_HYSTERESIS, default=0.0): vol.All(
+                vol.Coerce(float), vol.Range(min=0)
+            ),
+        }
+    ),
+    cv.has_at_least_one_key(CONF_ABOVE, CONF_BELOW),
+)
+
+THRESHOLDS_SCHEMA = vol.All(cv.ensure_list, [THRESHOLD_SCHEMA])
+
+
+@dataclass(slots=True)
+class Threshold:
+    """A threshold on a single value, with hysteresis."""
+
+    name: str
+    device: str
+    key: str
+    limit: float
+    above: bool
+    hysteresis: float
+    active: bool | None = None
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> Threshold:
+        """Create a threshold from validated configuration."""
+        device, _, key = config[CONF_KEY].partition(".")
+        above = CONF_ABOVE in config
+        return cls(
+            name=config[CONF_NAME],
+            device=device,
+            key=key,
+            limit=config[CONF_ABOVE] if above else config[CONF_BELOW],
+            above=above,
+            hysteresis=config[CONF_HYSTERESIS],
+        )
+
+    def update(self, value: float) -> bool:
+        """Update the state with a new value and return True on a crossing."""
+        if self.above:
+            active = (
+                value > self.limit - self.hysteresis
+                if self.active
+                else value > self.limit
+            )
+        else:
+            active = (
+                value < self.limit + self.hysteresis
+                if self.active
+                else value < self.limit
+            )
+
+        previous, self.active = self.active, active
+        # The first value only establishes the state, it is not a crossing
+        return previous is not None and previous != active
+
+
+class ThresholdEngine:
+    """Evaluate configured thresholds and fire events on crossings only."""
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, config: list[dict[str, Any]]
+    ) -> None:
+        """Initialize the engine."""
+        self.hass = hass
+        self._entry_id = entry_id
+        self.thresholds = [Threshold.from_config(item) for item in config]
+
+    @callback
+    def async_process(self, data: dict[str, Any]) -> None:
+        """Evaluate all thresholds against new coordinator data."""
+        for threshold in self.thresholds:
+            value = get_numeric_value(data, threshold.device, threshold.key)
+            if value is None or not threshold.update(value):
+                continue
+            _LOGGER.debug(
+                "Threshold %s %s at %s",
+                threshold.name,
+                "activated" if threshold.active else "cleared",
+                value,
+            )
+            self.hass.bus.async_fire(
+                EVENT_THRESHOLD,
+                {
+                    "config_entry_id": self._entry_id,
+                    "name": threshold.name,
+                    "key": f"{threshold.device}.{threshold.key}",
+                    "value": value,
+                    "active": threshold.active,
+                },
+            )